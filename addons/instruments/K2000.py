@@ -63,51 +63,92 @@ class K2000(SCPIInstrumentTemplate):
         self.write(":SYST:BEEP")
 
     def init_properties(self) -> None:
+        # query/command let read_properties/write_properties batch all of them
         self.properties_list: List[property_info] = [
             property_info(
                 "Range DC",
                 float,
                 lambda: self.range_dc,
                 lambda x: setattr(self, "range_dc", x),
+                query=":SENS:VOLT:DC:RANG?",
+                command=self._range_dc_command,
             ),
             property_info(
                 "Resolution DC",
                 int,
                 lambda: self.resolution_dc,
                 lambda x: setattr(self, "resolution_dc", x),
+                query=":SENS:VOLT:DC:DIG?",
+                command=lambda x: f":SENS:VOLT:DC:DIG {int(x)}",
             ),
             property_info(
                 "Range AC",
                 float,
                 lambda: self.range_ac,
                 lambda x: setattr(self, "range_ac", x),
+                query=":SENS:VOLT:AC:RANG?",
+                command=lambda x: f":SENS:VOLT:AC:RANG {float(x)}",
             ),
             property_info(
                 "Resolution AC",
                 int,
                 lambda: self.resolution_ac,
                 lambda x: setattr(self, "resolution_ac", x),
+                query=":SENS:VOLT:AC:DIG?",
+                command=lambda x: f":SENS:VOLT:AC:DIG {int(x)}",
             ),
             property_info(
                 "Auto Range",
                 bool,
                 lambda: self.autorange,
                 lambda x: setattr(self, "autorange", x),
+                query=":SENS:VOLT:DC:RANGE:AUTO?",
+                command=lambda x: f":SENS:VOLT:DC:RANGE:AUTO {self._on_off(x)}",
             ),
             property_info(
                 "NPLC",
                 float,
                 lambda: self.nplc,
                 lambda x: setattr(self, "nplc", x),
+                query=":SENS:VOLT:DC:NPLC?",
+                command=self._nplc_command,
             ),
             property_info(
                 "Autozero",
                 bool,
                 lambda: self.autozero,
                 lambda x: setattr(self, "autozero", x),
+                query=":SYST:AZER:STAT?",
+                command=lambda x: f":SYST:AZER:STAT {self._on_off(x)}",
             ),
         ]
 
+    @staticmethod
+    def _on_off(value) -> str:
+        return "ON" if helper_methods.val_to_bool(value) else "OFF"
+
+    @staticmethod
+    def _range_dc_command(value: float) -> str:
+        """SCPI command for range_dc (value < 0 -> auto range)."""
+        if value is None:
+            raise ValueError("range_dc requires a numeric value or negative for auto range")
+        try:
+            v = float(value)
+        except Exception:
+            raise ValueError("range_dc requires a numeric value")
+        if v < 0:
+            return ":SENS:VOLT:DC:RANG:AUTO ON"
+        return f":SENS:VOLT:DC:RANG {v}"
+
+    NPLC_FUNCTIONS = ["VOLT:DC", "VOLT:AC", "CURR:DC", "CURR:AC", "RES", "FRES"]
+
+    @classmethod
+    def _nplc_command(cls, value: float) -> str:
+        """Compound SCPI command applying NPLC to all relevant sensing functions."""
+        if value <= 0:
+            raise ValueError("NPLC must be positive")
+        return ";".join(f":SENS:{func}:NPLC {value}" for func in cls.NPLC_FUNCTIONS)
+
     @property
     def autorange(self):
         """
@@ -122,8 +163,7 @@ class K2000(SCPIInstrumentTemplate):
         Sets the auto range for DC voltage measurement.
         Accepts boolean or string equivalents ('ON'/'OFF','1'/'0','true'/'false').
         """
-        state = "ON" if helper_methods.val_to_bool(value) else "OFF"
-        self.write(f":SENS:VOLT:DC:RANGE:AUTO {state}")
+        self.write(f":SENS:VOLT:DC:RANGE:AUTO {self._on_off(value)}")
 
     @property
     def range_dc(self):
@@ -138,18 +178,7 @@ class K2000(SCPIInstrumentTemplate):
         Configures the range for DC measurement.
         If value < 0 the instrument is set to auto range.
         """
-        if value is None:
-            raise ValueError("range_dc requires a numeric value or negative for auto range")
-        try:
-            v = float(value)
-        except Exception:
-            raise ValueError("range_dc requires a numeric value")
-
-        if v < 0:
-            # Auto range
-            self.write(":SENS:VOLT:DC:RANG:AUTO ON")
-        else:
-            self.write(f":SENS:VOLT:DC:RANG {v}")
+        self.write(self._range_dc_command(value))
 
     @property
     def resolution_dc(self):
@@ -210,24 +239,21 @@ class K2000(SCPIInstrumentTemplate):
     def nplc(self, value: float) -> None:
         """Set NPLC for all relevant sensing functions.
 
-        Applies to VOLT:DC, VOLT:AC, CURR:DC, CURR:AC, RES, FRES.
+        Applies to VOLT:DC, VOLT:AC, CURR:DC, CURR:AC, RES, FRES in one
+        compound command; if it is rejected, each function is written on its
+        own and the ones that fail are skipped.
         """
-        if value <= 0:
-            raise ValueError("NPLC must be positive")
-        functions = [
-            "VOLT:DC",
-            "VOLT:AC",
-            "CURR:DC",
-            "CURR:AC",
-            "RES",
-            "FRES",
-        ]
-        for func in functions:
-            try:
-                self.write(f":SENS:{func}:NPLC {value}")
-            except Exception:
-                # Some functions may not be available depending on mode/options
-                continue
+        command = self._nplc_command(value)
+        try:
+            self.write(command)
+        except Exception:
+            self.cls()
+            for func in self.NPLC_FUNCTIONS:
+                try:
+                    self.write(f":SENS:{func}:NPLC {value}")
+                except Exception:
+                    # Some functions may not be available depending on mode/options
+                    continue
 
     # --- Global digital filter configuration ---
     @property
@@ -314,8 +340,7 @@ class K2000(SCPIInstrumentTemplate):
 
         True -> ON, False -> OFF.
         """
-        state = "ON" if helper_methods.val_to_bool(value) else "OFF"
-        self.write(f":SYST:AZER:STAT {state}")
+        self.write(f":SYST:AZER:STAT {self._on_off(value)}")
 
     def read_measurement(self) -> List[float]:
         """Trigger a reading using current configuration and return parsed values."""
@@ -1,6 +1,9 @@
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+import logging
 from easy_scpi import Instrument
-from instruments import SCPI_Info
+from instruments import SCPI_Info, property_info
+
+logger = logging.getLogger(__name__)
 # Assuming these exist in your codebase
 # from your_lib import Instrument, SCPI_Info, property_info
 
@@ -22,6 +25,10 @@ class SCPIInstrumentTemplate(Instrument):
         Clears status (*CLS).
     check_error() -> Optional[str]:
         Queries the error queue (SYST:ERR?) and returns the top error or None.
+    read_properties() -> Dict[str, Any]:
+        Reads every entry of properties_list in one compound query.
+    write_properties(values) -> None:
+        Applies several properties in one compound write.
     """
 
     def __init__(self, scpi_info: SCPI_Info, **kwargs) -> None:
@@ -36,6 +43,8 @@ class SCPIInstrumentTemplate(Instrument):
             encoding=kwargs.get("encoding", "ascii"),
         )
         self.properties_list = []  # fill if needed
+        # Last values read/written by read_properties/write_properties, keyed by alias
+        self.properties_snapshot: Dict[str, Any] = {}
 
     # -------- Core SCPI helpers --------
     def opc(self) -> bool:
@@ -74,3 +83,65 @@ class SCPIInstrumentTemplate(Instrument):
             return None
         return s
 
+    # -------- Batched properties --------
+    def read_properties(self) -> Dict[str, Any]:
+        """
+        Read every property of properties_list, keyed by alias.
+
+        Properties declaring a SCPI query are read in a single compound query
+        (queries joined with ";", one response field each); the others, or all
+        of them if the compound response cannot be split, through their getters.
+        The result is also kept in properties_snapshot.
+        """
+        properties: List[property_info] = list(getattr(self, "properties_list", []))
+        batched = [prop for prop in properties if prop.query]
+        values: Dict[str, Any] = {}
+        if batched:
+            try:
+                fields = str(self.query(";".join(prop.query for prop in batched))).strip().split(";")
+                if len(fields) != len(batched):
+                    raise ValueError(f"expected {len(batched)} fields, got {len(fields)}")
+                values = {prop.alias: prop.parse_response(field) for prop, field in zip(batched, fields)}
+            except Exception as e:
+                logger.warning(f"Batched property read failed, reading one by one: {e}")
+                self.cls()  # Drop the error left by the compound query
+                values = {}
+        snapshot = {
+            prop.alias: values[prop.alias] if prop.alias in values else prop.associated_getter()
+            for prop in properties
+        }
+        self.properties_snapshot = snapshot
+        return dict(snapshot)
+
+    def write_properties(self, values: Dict[str, Any]) -> None:
+        """
+        Apply several properties (alias -> value) in one compound write.
+
+        Commands of the properties declaring one are joined with ";" and sent
+        together, after being all built (so a rejected value sends nothing);
+        the other properties go through their setters, as do the batched ones
+        if the compound write fails. Unknown aliases raise KeyError.
+        properties_snapshot is updated with the written values.
+        """
+        properties = {prop.alias: prop for prop in getattr(self, "properties_list", [])}
+        commands: List[str] = []
+        batched: List[Tuple[property_info, Any]] = []
+        unbatched: List[Tuple[property_info, Any]] = []
+        for alias, value in values.items():
+            prop = properties[alias]
+            if prop.command is None:
+                unbatched.append((prop, value))
+            else:
+                commands.append(prop.command(value))
+                batched.append((prop, value))
+        for prop, value in unbatched:
+            prop.associated_setter(value)
+        if commands:
+            try:
+                self.write(";".join(commands))
+            except Exception as e:
+                logger.warning(f"Batched property write failed, writing one by one: {e}")
+                self.cls()  # Drop the error left by the compound write
+                for prop, value in batched:
+                    prop.associated_setter(value)
+        self.properties_snapshot.update(values)
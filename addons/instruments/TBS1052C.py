@@ -7,6 +7,7 @@ from .SCPIInstrumentTemplate import SCPIInstrumentTemplate
 import time  # added for inter-command delays
 from threading import RLock
 import re  # added for WFMOutpre parsing
+import numpy as np
 
 class TBS1052C(SCPIInstrumentTemplate):
     """
@@ -369,19 +370,17 @@ class TBS1052C(SCPIInstrumentTemplate):
         """
         return list(data) if hasattr(data, '__iter__') else [data]
 
-    def get_waveform(self,
-                     start: int = 1,
-                     stop: int = 1000,
-                     source: str = "CH1",
-                     width_bytes: int = 1,
-                     binary: bool = True,
-                     center_wavfrm = False,) -> Tuple[List[float], List[float], dict]:
+    def get_waveform_codes(self,
+                           start: int = 1,
+                           stop: int = 1000,
+                           source: str = "CH1",
+                           width_bytes: int = 1,
+                           binary: bool = True,) -> Tuple[np.ndarray, dict]:
         """
-        Download a waveform and return (time_s, volts, preamble_dict).
-        - source: CH1|CH2|MATH|REF1|REF2
-        - start/stop: 1-based inclusive indices (defaults to full record)
-        - width_bytes: 1 or 2 (this series' 16-bit mode pads LSB=0 per manual)
-        - binary: use definite-length block for speed
+        Download a waveform as raw sample codes and return (codes, preamble_dict).
+        - codes: 1-D uint8 array (1 byte per point, as sent by the scope), int64 in ASCII mode
+        - convert with codes_to_volts(codes, pre) / time_axis(len(codes), pre, start)
+        Keeping codes plus the preamble scale is ~8x smaller than float volts.
         """
         # Make sure we have a stable, recent acquisition for current setup
         # Caller can also single() + opc_wait() if desired.
@@ -392,38 +391,51 @@ class TBS1052C(SCPIInstrumentTemplate):
         if self.ENABLE_DELAYS:
             time.sleep(0.02)
         pre = self._read_preamble()
-        # Parsing from preamble dict
-        xzero = pre["XZEro"]
-        xincr = pre["XINcr"]
         n_expected = int(pre["NR_Pt"])
         if self.ENABLE_DELAYS:
             time.sleep(0.01)
         # Fetch curve
         if binary:
-            codes = self.query_binary_values("CURVe?", datatype='B')
-            codes = list(codes)  # Convert to list
+            codes = np.asarray(self.query_binary_values("CURVe?", datatype='B', container=np.array), dtype=np.uint8)
         else:
             asc = self.query("CURVe?")
-            codes = self._parse_curve_ascii(asc)
+            codes = np.asarray(self._parse_curve_ascii(asc), dtype=np.int64)
 
         # Guard against partial transfers
         if n_expected and len(codes) != n_expected:
             # Some firmwares may include trailing LF or short transfers; just clamp
             codes = codes[:n_expected]
+        return codes, pre
 
-        # Build time axis
-        t_first = xzero + (start - 1) * xincr
-        time_s  = [t_first + i*xincr for i in range(len(codes))]
-
-
-        # Convert sample codes to volts: V = (code - YOFf) * YMUlt + yzer
-        yoff = pre["YOFf"]
-        ymul = pre["YMUlt"]
-        yzer = pre["YZEro"]
+    @staticmethod
+    def codes_to_volts(codes: Any, pre: dict) -> np.ndarray:
+        """Convert sample codes to volts: V = (code - YOFf) * YMUlt + YZEro (vectorised)."""
+        return (np.asarray(codes, dtype=np.float64) - pre["YOFf"]) * pre["YMUlt"] + pre["YZEro"]
 
-        volts = [(c - yoff) * ymul + yzer for c in codes]
+    @staticmethod
+    def time_axis(points: int, pre: dict, start: int = 1) -> np.ndarray:
+        """Time of each point in seconds for a record read from 1-based index start."""
+        t_first = pre["XZEro"] + (start - 1) * pre["XINcr"]
+        return t_first + np.arange(points) * pre["XINcr"]
 
-        return time_s, volts, pre
+    def get_waveform(self,
+                     start: int = 1,
+                     stop: int = 1000,
+                     source: str = "CH1",
+                     width_bytes: int = 1,
+                     binary: bool = True,
+                     center_wavfrm = False,) -> Tuple[List[float], List[float], dict]:
+        """
+        Download a waveform and return (time_s, volts, preamble_dict).
+        - source: CH1|CH2|MATH|REF1|REF2
+        - start/stop: 1-based inclusive indices (defaults to full record)
+        - width_bytes: 1 or 2 (this series' 16-bit mode pads LSB=0 per manual)
+        - binary: use definite-length block for speed
+        """
+        codes, pre = self.get_waveform_codes(start, stop, source, width_bytes, binary)
+        time_s = self.time_axis(len(codes), pre, start)
+        volts = self.codes_to_volts(codes, pre)
+        return time_s.tolist(), volts.tolist(), pre
 
     # ---------------- Convenience combos ----------------
     def setup_simple_edge(self, ch: int = 1, vdiv: float = 0.5, time_div: float = 1e-3,
@@ -1,11 +1,12 @@
 from typing import Any, Optional, List, cast
 import time
 import logging
-from tasks import Task, Tasks, ChartData, ChartData_Config
+from tasks import Task, Tasks, ChartData, ChartData_Config, ArrayColumn
 from instruments import Instrument_Entry
 from addons.instruments import RelayMatrix, SM2401
 from connections import Connections
 from tasks.helper import str_to_bool
+from .records import LABEL_RECORD, FRES_RECORD
 
 def meas_r_cube(task_obj: Task) -> None:
     # --------------INIT PHASE---------------- ##
@@ -38,7 +39,8 @@ def meas_r_cube(task_obj: Task) -> None:
             custom_type="scatter",
             refresh_all=False,  # incremental updates only
         ),
-        math_formula_y=lambda v: float(v[2]),  # identity conversion for resistance values
+        math_formula_y=lambda v: float(v["R"]),
+        vector_formula_y=lambda block: block["R"],
     )
     scatter_chart.x_series.meta.unit = "Sample label"
     scatter_chart.y_series.meta.unit = "ohm"
@@ -61,10 +63,14 @@ def meas_r_cube(task_obj: Task) -> None:
         "V-": "B",
     }
     vertices: int = 8
-    # Initialize raw buffers: labels in x, numeric resistance values in y
-    scatter_chart.x_series.raw = []
-    scatter_chart.y_series.raw = []
+    # Initialize raw buffers: label records in x, measurement records in y
+    scatter_chart.x_series.raw = ArrayColumn(dtype=LABEL_RECORD)
+    scatter_chart.y_series.raw = ArrayColumn(dtype=FRES_RECORD)
     meas_idx = 0
+    # Resume from the last checkpoint when started through Tasks().resume_task
+    resume_idx = int(task_obj.resume_cursor.get("meas_idx", 0))
+    # Rows journaled after the cursor was captured are measured again, drop them
+    task_obj.restore_chart(scatter_chart, samples=resume_idx)
     try:
         sm.output_on()
         for Ip_vertex in range(1, vertices + 1):
@@ -77,6 +83,9 @@ def meas_r_cube(task_obj: Task) -> None:
                         if exit_flag.is_set():
                             logger.info("Exit flag set, terminating R cube measurement task.")
                             break
+                        if meas_idx < resume_idx:
+                            meas_idx += 1  # already measured before the interruption
+                            continue
                         relay_matrix_1.switch_commute_reset_all()
                         relay_matrix_2.switch_commute_reset_all()
                         relay_matrix_1.opc()
@@ -94,6 +103,7 @@ def meas_r_cube(task_obj: Task) -> None:
                         scatter_chart.x_series.raw.append(labelling_str)
                         scatter_chart.y_series.raw.append([voltage, current, resistance,meas_idx])
                         meas_idx += 1
+                        task_obj.checkpoint["meas_idx"] = meas_idx
     except Exception as e:
         logger.error(f"Error in R cube measurement task: {e}")
     finally:
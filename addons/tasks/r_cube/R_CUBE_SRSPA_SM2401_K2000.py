@@ -1,11 +1,12 @@
 from typing import Optional, cast
 import time
 import logging
-from tasks import Task, Tasks, ChartData, ChartData_Config
+from tasks import Task, Tasks, ChartData, ChartData_Config, ArrayColumn
 from instruments import Instrument_Entry
 from addons.instruments import RelayMatrix, SM2401, K2000
 from connections import Connections
 from tasks.helper import str_to_bool
+from .records import LABEL_RECORD, DELTA_RECORD
 
 """R Cube Measurement (SM2401 source + K2000 volt meter)
 
@@ -42,7 +43,8 @@ def meas_r_cube_source_k2000(task_obj: Task) -> None:
             custom_type="scatter",
             refresh_all=False,
         ),
-        math_formula_y=lambda v: float(v[2]),  # resistance stored at index 2
+        math_formula_y=lambda v: float(v["R"]),
+        vector_formula_y=lambda block: block["R"],
     )
     resistance_chart.x_series.meta.unit = "Label"
     resistance_chart.x_series.meta.label = "Configuration"
@@ -70,9 +72,13 @@ def meas_r_cube_source_k2000(task_obj: Task) -> None:
 
     mapping = {"I+": mapping_iplus, "I-": mapping_iminus, "V+": mapping_vplus, "V-": mapping_vminus}
 
-    resistance_chart.x_series.raw = []
-    resistance_chart.y_series.raw = []
+    resistance_chart.x_series.raw = ArrayColumn(dtype=LABEL_RECORD)
+    resistance_chart.y_series.raw = ArrayColumn(dtype=DELTA_RECORD)
     meas_idx = 0
+    # Resume from the last checkpoint when started through Tasks().resume_task
+    resume_idx = int(task_obj.resume_cursor.get("meas_idx", 0))
+    # Rows journaled after the cursor was captured are measured again, drop them
+    task_obj.restore_chart(resistance_chart, samples=resume_idx)
 
     def route(path_label: str, node: int) -> None:
         switch_commute_aggregator(rm1, rm2, mapping[path_label], node)
@@ -108,6 +114,9 @@ def meas_r_cube_source_k2000(task_obj: Task) -> None:
                             if exit_flag.is_set():
                                 logger.info("Exit flag set; terminating task.")
                                 return
+                            if meas_idx < resume_idx:
+                                meas_idx += 1  # already measured before the interruption
+                                continue
                             rm1.switch_commute_reset_all(); rm2.switch_commute_reset_all()
                             rm1.opc(); rm2.opc()
                             route("I+", i_pos); route("I-", i_neg); route("V+", v_pos); route("V-", v_neg)
@@ -138,6 +147,7 @@ def meas_r_cube_source_k2000(task_obj: Task) -> None:
                             resistance_chart.x_series.raw.append(label)
                             resistance_chart.y_series.raw.append([v_plus, v_minus,R,current, meas_idx])
                             meas_idx += 1
+                            task_obj.checkpoint["meas_idx"] = meas_idx
     except Exception as e:
         logger.error(f"Error in SM2401+K2000 R cube task: {e}")
     finally:
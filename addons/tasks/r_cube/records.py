@@ -0,0 +1,15 @@
+from tasks import record_dtype
+
+# Record layouts of the R-cube raw series (one record per measurement).
+# Fields are plotted/exported by name, e.g. chart.field("R").
+
+# x raw: measurement label
+LABEL_RECORD = record_dtype([("index", "U16"), ("pins", "U64"), ("relays", "U64")])
+
+# y raw: delta/voltmeter measurement (K6221 or SM2401 source + K2000)
+DELTA_RECORD = record_dtype(
+    [("v_plus", "f8"), ("v_minus", "f8"), ("R", "f8"), ("current", "f8"), ("meas_idx", "i8")]
+)
+
+# y raw: SM2401 4-wire resistance reading
+FRES_RECORD = record_dtype([("voltage", "f8"), ("current", "f8"), ("R", "f8"), ("meas_idx", "i8")])
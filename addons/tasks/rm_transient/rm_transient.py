@@ -1,15 +1,40 @@
 import logging
 import time
-from typing import Optional, List, cast
+from functools import partial
+from typing import Callable, Optional, List, cast
+import numpy as np
 
 from tasks import Task, Tasks, ChartData, ChartData_Config
 from connections import Connections
 from instruments import Instrument_Entry
 from addons.instruments import TBS1052C, RelayMatrix
-from .rm_transient_uts import calculate_rise_time, calculate_fall_time
+from .rm_transient_uts import (
+    calculate_rise_time_codes,
+    calculate_fall_time_codes,
+    calculate_rise_times_codes,
+    calculate_fall_times_codes,
+    waveform_scale,
+)
 
 logger = logging.getLogger(__name__)
 
+
+def append_waveform(chart: ChartData, codes: np.ndarray, pre: dict, formula: Callable, vector_formula: Callable) -> None:
+    """
+    Appends the raw codes of one waveform to the chart.
+    The first waveform stores the preamble scale in the y meta attrs and binds the
+    formulas to it; the scale cannot change afterwards since every row shares it.
+    """
+    scale = waveform_scale(pre)
+    attrs = chart.y_series.meta.attrs
+    if not attrs:
+        attrs.update(scale)
+        chart.math_formula_y = partial(formula, scale=scale)
+        chart.vector_formula_y = partial(vector_formula, scale=scale)
+    elif attrs != scale:
+        raise ValueError(f"Scope scale changed during the run ({attrs} -> {scale}).")
+    chart.y_series.raw.append(codes)
+
 def rm_transient(task_obj: Task) -> None:
     
     # Init section -----
@@ -39,8 +64,10 @@ def rm_transient(task_obj: Task) -> None:
             pop_raw=False,
             custom_type="histogram",
             sample_points_y=waveform_count,
+            offload_formula=True,
+            stream_to_disk=True,
+            codec="auto",
         ),
-        math_formula_y=calculate_rise_time,
     )
     transient_fall_chart: ChartData = ChartData(
         name="Transienti in discesa",
@@ -48,15 +75,18 @@ def rm_transient(task_obj: Task) -> None:
             pop_raw=False,
             custom_type="histogram",
             sample_points_y=waveform_count,
+            offload_formula=True,
+            stream_to_disk=True,
+            codec="auto",
         ),
-        math_formula_y=calculate_fall_time,
     )
     data.append(transient_rise_chart)
     data.append(transient_fall_chart)
 
     # Add Labels
-    transient_rise_chart.y_series.meta.description = "Raw values are 2D arrays which represent the waveform data. The rise time (processed) is calculated from these waveforms."
-    transient_fall_chart.y_series.meta.description = "Raw values are 2D arrays which represent the waveform data. The fall time (processed) is calculated from these waveforms."
+    # Raw rows are 8-bit scope codes, the preamble scale to convert them is saved in meta.attrs
+    transient_rise_chart.y_series.meta.description = "Raw values are the scope codes of each waveform (V = (code - YOFf) * YMUlt + YZEro, t = XZEro + i * XINcr, see meta attrs). The rise time (processed) is calculated from these waveforms."
+    transient_fall_chart.y_series.meta.description = "Raw values are the scope codes of each waveform (V = (code - YOFf) * YMUlt + YZEro, t = XZEro + i * XINcr, see meta attrs). The fall time (processed) is calculated from these waveforms."
     transient_rise_chart.y_series.meta.label = "Voltage Rise Time (s)"
     transient_fall_chart.y_series.meta.label = "Voltage Fall Time (s)"
     transient_fall_chart.y_series.meta.unit = "s"
@@ -102,7 +132,7 @@ def rm_transient(task_obj: Task) -> None:
             relay_matrix.switch_commute_exclusive(gnd_combination)  # Switch relay to GND combination
             relay_matrix.opc()  # Wait for relay scope.set_channel_position(1,-2)matrix operation to complete
             scope.opc()
-            t_fall, V_fall, _ = scope.get_waveform(center_wavfrm=True, stop=data_points)  # Acquire fall waveform
+            fall_codes, fall_pre = scope.get_waveform_codes(stop=data_points)  # Acquire fall waveform
             scope.stop()  # Stop the scope
 
             # Set up for rise transient measurement (GND combination to 5V)
@@ -114,14 +144,11 @@ def rm_transient(task_obj: Task) -> None:
             relay_matrix.opc()  # Wait for relay matrix operation to complete
             #scope.wait_acquire_complete()
             scope.opc()
-            t_rise, V_rise, _ = scope.get_waveform(center_wavfrm=True, stop = data_points)  # Acquire rise waveform
-
-            # Save waveform data
-            fall_data_wavfrm = [t_fall, V_fall]  # Save fall waveform data
-            rise_data_wavfrm = [t_rise, V_rise]  # Save rise waveform data
-            # Add to raw, data processor will parse
-            transient_fall_chart.y_series.raw.append(fall_data_wavfrm)
-            transient_rise_chart.y_series.raw.append(rise_data_wavfrm)
+            rise_codes, rise_pre = scope.get_waveform_codes(stop=data_points)  # Acquire rise waveform
+
+            # Add raw codes to raw, data processor will parse
+            append_waveform(transient_fall_chart, fall_codes, fall_pre, calculate_fall_time_codes, calculate_fall_times_codes)
+            append_waveform(transient_rise_chart, rise_codes, rise_pre, calculate_rise_time_codes, calculate_rise_times_codes)
 
             # Stop the scope after processing
             scope.stop()
@@ -1,5 +1,6 @@
 import numpy as np
 import logging
+from addons.instruments.TBS1052C import TBS1052C
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +12,7 @@ def calculate_rise_time(transient):
     # Implement rise time calculation logic here
     # For example, find time from 10% to 90% of max voltage
     t, V = transient
-    if not t or not V:
+    if len(t) == 0 or len(V) == 0:
         return 0.0
     # Placeholder: return a dummy value
     hi_thresh = 4.5
@@ -24,11 +25,111 @@ def calculate_fall_time(transient) -> float:
     transient is expected to be [t, V] where t is time array, V is voltage array.
     """
     t, V = transient
-    if not t or not V:
+    if len(t) == 0 or len(V) == 0:
         return 0.0
     lo_thresh = 0.5
     res: float = transient_value_extractor(transient, lo_thresh)
     return res
+def calculate_rise_times(transients: np.ndarray) -> np.ndarray:
+    """
+    Vectorised rise time over a block of transients.
+    transients is expected to have shape (n, 2, points): n waveforms of [t, V].
+    """
+    hi_thresh = 4.5
+    return transient_values_extractor(transients, hi_thresh)
+
+def calculate_fall_times(transients: np.ndarray) -> np.ndarray:
+    """
+    Vectorised fall time over a block of transients.
+    transients is expected to have shape (n, 2, points): n waveforms of [t, V].
+    """
+    lo_thresh = 0.5
+    return transient_values_extractor(transients, lo_thresh)
+
+# Preamble entries needed to turn raw scope codes back into [t, V]
+SCALE_KEYS = ("XZEro", "XINcr", "YOFf", "YMUlt", "YZEro")
+
+def waveform_scale(pre: dict) -> dict:
+    """
+    Numeric (JSON serialisable) subset of the scope preamble used by the *_codes formulas.
+    """
+    return {key: float(pre[key]) for key in SCALE_KEYS}
+
+def codes_to_transients(codes, scale: dict) -> np.ndarray:
+    """
+    Converts raw waveform codes, shape (n, points), into transients of shape (n, 2, points).
+    Records are assumed to be read from the first point (start=1).
+    """
+    V = TBS1052C.codes_to_volts(np.atleast_2d(codes), scale)
+    t = TBS1052C.time_axis(V.shape[1], scale)
+    return np.stack([np.broadcast_to(t, V.shape), V], axis=1)
+
+def calculate_rise_time_codes(codes, scale: dict) -> float:
+    """
+    Rise time of a single waveform stored as raw codes (see codes_to_transients).
+    """
+    t, V = codes_to_transients(codes, scale)[0]
+    return calculate_rise_time([t.tolist(), V.tolist()])
+
+def calculate_fall_time_codes(codes, scale: dict) -> float:
+    """
+    Fall time of a single waveform stored as raw codes (see codes_to_transients).
+    """
+    t, V = codes_to_transients(codes, scale)[0]
+    return calculate_fall_time([t.tolist(), V.tolist()])
+
+def calculate_rise_times_codes(codes: np.ndarray, scale: dict) -> np.ndarray:
+    """
+    Vectorised rise time over a block of raw code waveforms, shape (n, points).
+    """
+    return calculate_rise_times(codes_to_transients(codes, scale))
+
+def calculate_fall_times_codes(codes: np.ndarray, scale: dict) -> np.ndarray:
+    """
+    Vectorised fall time over a block of raw code waveforms, shape (n, points).
+    """
+    return calculate_fall_times(codes_to_transients(codes, scale))
+
+def transient_values_extractor(transients: np.ndarray, value: float) -> np.ndarray:
+        """
+        Vectorised counterpart of transient_value_extractor.
+        Finds the threshold crossing of every waveform in the block at once and
+        linearly interpolates the crossing time. Waveforms without a valid
+        crossing yield NaN, empty waveforms yield 0.0.
+        """
+        transients = np.asarray(transients, dtype=float)
+        n = transients.shape[0]
+        if n == 0:
+            return np.empty(0)
+        t = transients[:, 0, :]
+        V = transients[:, 1, :]
+        points = V.shape[1]
+        if points == 0:
+            return np.zeros(n)
+        rows = np.arange(n)
+        above = V >= value
+        has_above = above.any(axis=1)
+        falling = V[:, 0] > value
+        # Rise: every sample before the first above-threshold one is below it
+        first_above = np.argmax(above, axis=1)
+        rise_ok = ~falling & has_above & (first_above > 0)
+        # Fall: every sample after the last above-threshold one is below it
+        last_above = points - 1 - np.argmax(above[:, ::-1], axis=1)
+        fall_ok = falling & has_above & (last_above < points - 1)
+        i1 = np.where(falling, last_above, first_above - 1).clip(0, points - 1)
+        i2 = (i1 + 1).clip(0, points - 1)
+        V1 = V[rows, i1]
+        V2 = V[rows, i2]
+        t1 = t[rows, i1]
+        t2 = t[rows, i2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lin_fit_res = np.where(V2 == V1, t1, t1 + (value - V1) * (t2 - t1) / (V2 - V1))
+        ok = rise_ok | fall_ok
+        missing = int(n - np.count_nonzero(ok))
+        if missing:
+            logger.warning("%d of %d transients have no crossing of threshold %.3f.", missing, n, value)
+        return np.where(ok, lin_fit_res, np.nan)
+
 def transient_value_extractor(transient, value:float) -> float:
         """
         Extracts the voltage value from the transient data.
@@ -28,6 +28,7 @@ def test_task_function(task_obj: Task) -> None:
             sample_points_x=1000,
             sample_points_y=1000,
             custom_type="scatter",
+            columnar=True,
         ),
     )
     scatter_chart.x_series.meta.unit = "s"
@@ -44,6 +45,7 @@ def test_task_function(task_obj: Task) -> None:
             sample_points_x=1000,
             sample_points_y=1000,
             custom_type="line",
+            columnar=True,
         ),
     )
     line_chart.x_series.meta.unit = "s"
@@ -60,6 +62,7 @@ def test_task_function(task_obj: Task) -> None:
             sample_points_x=1000,
             sample_points_y=1000,
             custom_type="histogram",
+            columnar=True,
         ),
     )
     histogram_chart.y_series.meta.unit = "counts"
@@ -76,6 +79,7 @@ def test_task_function(task_obj: Task) -> None:
             sample_points_x=1000,
             sample_points_y=1000,
             custom_type="formula",
+            columnar=True,
         ),
         math_formula_x=lambda t: t,
         math_formula_y=lambda t: 10 * math.exp(-0.1 * t) * math.sin(t),
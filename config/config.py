@@ -17,6 +17,23 @@ default_config = {
     "default_timeout": 0.5,
     "init_properties_types": ["NV34420", "K2000", "RaspberrySIM"],
     "log_level": "INFO",
+    "processor_workers": 0,
+    "processor_chunk_size": 64,
+    "chart_file_format": "json",
+    "stream_tail_samples": 1024,
+    "chart_json_indent": None,
+    "chart_codec": "none",
+    "chart_viewport_px": 1200,
+    "chart_decimation": "minmax",
+    "chart_histogram_bins": "auto",
+    "chart_webgl_threshold": 2000,
+    "log_view_records": 2000,
+    "chart_cache_entries": 16,
+    "chart_page_size": 500,
+    "live_server_port": 8765,
+    "live_server_host": "127.0.0.1",
+    "live_server_interval": 0.5,
+    "live_server_backlog": 10000,
 }
 # In init_properties_types one shall add class names of instruments that are
 # meant to display properties on the webapp
@@ -97,6 +114,24 @@ class Config:
             - default_timeout (float): Default timeout value in seconds.
             - instruments_extensions (List[Any]): List of instrument extensions.
             - init_properties_types (List[str]): List of instrument class names to display properties.
+            - processor_workers (int): Worker processes for offloaded chart formulas (0 disables the pool).
+            - processor_chunk_size (int): Raw samples shipped to a worker per chunk.
+            - chart_file_format (str): Format of saved chart files, "json" or "npz" (binary).
+            - stream_tail_samples (int): Samples kept in memory per series of a stream_to_disk chart.
+            - chart_json_indent (Optional[int]): Indent of saved JSON chart files (None = compact; series stay inline).
+            - chart_codec (str): Default series codec of binary chart files ("none" keeps them memory-mappable, "auto" compresses by dtype).
+            - chart_catalogue_path (str): SQLite index of saved chart files (defaults to data_charts_path/catalogue.sqlite3).
+            - chart_viewport_px (int): Chart width in pixels used for decimation (about two points drawn per pixel).
+            - chart_decimation (str): Downsampling of long line/scatter charts, "minmax" (keeps peaks) or "lttb".
+            - chart_histogram_bins (Any): NumPy bins rule (or count) of long histograms binned server side.
+            - chart_webgl_threshold (int): Points above which scatter/line charts use WebGL traces (0 disables the switch).
+            - log_view_records (int): Most recent log records kept by the logs page.
+            - chart_cache_entries (int): Chart files kept parsed by the charts page (figures: four times as many).
+            - chart_page_size (int): Chart files listed per page in the charts page selector.
+            - live_server_port (int): Port of the server-sent events live dashboard (0 disables it).
+            - live_server_host (str): Interface the live dashboard listens on (127.0.0.1 keeps it local, 0.0.0.0 exposes it on the network).
+            - live_server_interval (float): Seconds between two pushes of new samples.
+            - live_server_backlog (int): Most recent samples per chart sent to a client on connect.
         """
         if default is None:
             default = default_config.get(key, None)
@@ -7,7 +7,7 @@ import logging
 from threading import Thread, Lock
 import time
 import json
-from typing import List, Optional, Any, Tuple, Dict
+from typing import Callable, List, Optional, Any, Tuple, Dict
 from dataclasses import asdict
 from serial.tools.list_ports import comports
 from instruments import Instrument_Entry, SCPI_Info
@@ -91,13 +91,27 @@ class Connections:
                 for instr in self.instruments_list
             )
 
-    def verify_instruments(self) -> None:
+    def verify_instruments(
+        self,
+        progress: Optional[Callable[[float, str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> None:
         """
         Verifies the connected instruments based on the configured communication mode.
+
+        Args:
+            progress (Callable[[float, str], None]): Called with (fraction done, message) before each instrument.
+            cancel (threading.Event): When set, the remaining instruments are kept unverified.
         """
         with self._instrument_lock:
             valid_instruments = []
-            for instr in self.instruments_list:
+            total = len(self.instruments_list)
+            for i, instr in enumerate(self.instruments_list):
+                if cancel is not None and cancel.is_set():
+                    valid_instruments.extend(self.instruments_list[i:])
+                    break
+                if progress is not None:
+                    progress(i / max(total, 1), f"Verifying {instr.data.alias or instr.data.idn}")
                 try:
                     _ = instr.scpi_instrument.id  # Attempt to retrieve ID
                     valid_instruments.append(instr)  # Instrument is valid
@@ -113,6 +127,8 @@ class Connections:
         curAliasesList: Optional[List[str]] = None,
         clear_list: bool = True,
         visa_dll_path: str = Config().get("custom_backend", ""),
+        progress: Optional[Callable[[float, str], None]] = None,
+        cancel: Optional[threading.Event] = None,
     ) -> None:
         """
         Fetches all instruments based on the provided list of aliases, including USB instruments.
@@ -121,18 +137,29 @@ class Connections:
             curAliasesList (List[str]): A list of instrument aliases to fetch.
             clear_list (bool): Whether to clear the current instruments list before fetching.
             visa_dll_path (str): Path to the VISA DLL for the resource manager.
+            progress (Callable[[float, str], None]): Called with (fraction done, message) as the scan advances.
+            cancel (threading.Event): When set, the scan stops after the current USB resource
+                (or before the COM scan); instruments found so far are kept.
         """
         curAliasesList = curAliasesList or self._config.get("instr_aliases")
+        report = progress or (lambda fraction, message: None)
         with self._instrument_lock:
             if clear_list:
+                report(0.0, "Disconnecting instruments")
                 self._clear_instruments()
 
             logger.debug(f"Fetching instruments based on aliases: {curAliasesList}")
             curLockedPorts = self._get_locked_ports()
             available_ports = self._get_available_ports(curLockedPorts)
-            self._fetch_usb_instruments(curLockedPorts, visa_dll_path)
+            report(0.1, "Scanning USB instruments")
+            self._fetch_usb_instruments(curLockedPorts, visa_dll_path, cancel)
+            if cancel is not None and cancel.is_set():
+                logger.info("Instrument scan cancelled.")
+                return
 
+            report(0.5, f"Detecting baud rates on {len(available_ports)} COM port(s)")
             com_idn_baud = self._fetch_com_instruments(available_ports)
+            report(0.9, "Adding COM instruments")
             self._process_com_instruments(com_idn_baud)
 
     def _clear_instruments(self) -> None:
@@ -189,7 +216,7 @@ class Connections:
         return com_idn_baud
 
     def _fetch_usb_instruments(
-        self, locked_ports: List[str], visa_dll_path: str
+        self, locked_ports: List[str], visa_dll_path: str, cancel: Optional[threading.Event] = None
     ) -> None:
         """Fetches instruments connected via USB using the VISA resource manager."""
         available_rms = ["@ivi", "@py"]
@@ -212,6 +239,8 @@ class Connections:
                     if x not in locked_ports
                     and "ASRL" not in x
                 ):
+                    if cancel is not None and cancel.is_set():
+                        return
                     self._process_usb_instrument(usb_instr, backend)
             except Exception as e:
                 logger.error(f"Failed to initialize USB resource manager for backend {backend}: {e}")
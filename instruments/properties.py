@@ -1,5 +1,6 @@
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
+from easy_scpi import helper_methods
 
 
 @dataclass
@@ -8,3 +9,19 @@ class property_info:
     typecheck: type
     associated_getter: Callable
     associated_setter: Callable
+    # Optional SCPI form of the property, used by read_properties/write_properties
+    # to batch every property of a driver into one compound transaction.
+    query: Optional[str] = None  # e.g. ":SENS:VOLT:DC:NPLC?"
+    command: Optional[Callable[[Any], str]] = None  # value -> SCPI command(s), ";"-joined
+    parse: Optional[Callable[[str], Any]] = None  # response field -> value (default: typecheck)
+
+    def parse_response(self, field: str) -> Any:
+        """Convert the field of a (compound) query response answering self.query."""
+        field = field.strip()
+        if self.parse is not None:
+            return self.parse(field)
+        if self.typecheck == bool:
+            return helper_methods.val_to_bool(field)
+        if self.typecheck == int:
+            return int(float(field))
+        return self.typecheck(field)
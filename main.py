@@ -5,8 +5,9 @@ import streamlit.web.bootstrap
 import logging
 from config import Config
 from connections.utilities import detect_baud_rate
-from tasks import Tasks
+from tasks import Tasks, clean_stream_store
 from connections import Connections
+from webapp.live_server import LiveServer
 from wasic_test import use_as_library
 # Import for forcing initialization of tasks
 from addons.tasks import *
@@ -35,6 +36,8 @@ def init_wasic():
     root_logger.addHandler(stream_handler)
 
     logging.info("Starting WASIC...")
+    # Chunk stores of streamed charts are deleted once saved; anything left is from a crashed run
+    clean_stream_store()
 
     script_path = os.path.abspath("streamlit_app.py")
     return script_path
@@ -42,6 +45,8 @@ def init_wasic():
 
 def main():
     script_path=init_wasic()
+    # Push-based live dashboard next to Streamlit (live_server_port, 0 disables it)
+    LiveServer().start()
     # Begin override code --------- WASIC as library mode -----
     #tasks = Tasks()
     #tasks.run_task("R Cube Measurement")
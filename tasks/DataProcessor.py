@@ -1,16 +1,33 @@
 from .task import Task, Tasks
-from typing import List, Callable
+from .structures import evaluate_vector_formula
+from .journal import ChartJournal
+from .catalogue import ChartCatalogue
+from .snapshot import SnapshotPublisher
+from typing import List, Callable, Any, Dict
 from threading import Event, Thread
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 import time
 from typing import Optional
+import numpy as np
 import logging
 import copy
+import pickle
 import datetime
 import os
 from config import Config
 logger = logging.getLogger(__name__)
 sleep_time:float = Config().get("processor_sleep", 2.0)
 
+
+def _apply_formula_chunk(formula: Callable[[Any], Any], chunk: List[Any], vectorised: bool) -> List[Any]:
+    """Worker-side evaluation of a formula over a chunk of raw samples."""
+    if vectorised:
+        return evaluate_vector_formula(formula, chunk)
+    return [formula(value) for value in chunk]
+
+
 class DataProcessor:
     def __init__(self,cur_task:Task) -> None:
         self.cur_task = cur_task
@@ -19,6 +36,9 @@ class DataProcessor:
         self.watchdog_thread = Thread(target=self.__watchdog)
         self.last_backup_time = datetime.datetime.now()
         self.datetime = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self._local_formulas: set = set()  # formulas that could not be shipped to workers
+        self.journals: Dict[int, ChartJournal] = {}  # id(chart) -> backup journal
     def start(self) -> Thread:
         """Starts the data processor thread."""
         if not self.watchdog_thread.is_alive():
@@ -53,15 +73,19 @@ class DataProcessor:
                         exit_flag.set()
 
                     # Apply formulas using the already-set local variables
-                    if chart_data.math_formula_y is not None:
-                        self.apply_formula(y, y_raw, chart_data.math_formula_y, chart_data.config.pop_raw,chart_data.config.refresh_all)
-
-                    if chart_data.math_formula_x is not None:
-                        self.apply_formula(x, x_raw, chart_data.math_formula_x, chart_data.config.pop_raw,chart_data.config.refresh_all)
+                    offload = chart_data.config.offload_formula
+                    self.process_series(y, y_raw, chart_data.math_formula_y, chart_data.vector_formula_y, chart_data.config.pop_raw, chart_data.config.refresh_all, offload)
+                    self.process_series(x, x_raw, chart_data.math_formula_x, chart_data.vector_formula_x, chart_data.config.pop_raw, chart_data.config.refresh_all, offload)
+                    chart_data.update_pyramids()
+                    # Immutable view for the UI sessions and the live server
+                    SnapshotPublisher().publish(chart_data)
             except Exception as e:
                 logger.error(f"Error in data processing: {e}")
                 continue
             if last_iteration:
+                self.shutdown_executor()
+                self.compact_journals()
+                SnapshotPublisher().discard(data)
                 #self.cur_task.stop()
                 Tasks().stop_task()
                 break
@@ -75,6 +99,106 @@ class DataProcessor:
 
 
 
+    def process_series(
+        self,
+        target: List[float],
+        raw: List[Any],
+        formula: Optional[Callable[[Any], Any]],
+        vector_formula: Optional[Callable[[np.ndarray], Any]],
+        pop: bool,
+        refresh_all: bool = False,
+        offload: bool = False,
+    ) -> None:
+        """Updates a processed series, preferring the vectorised formula when one is set.
+
+        If the vectorised formula fails (e.g. ragged raw samples that cannot be stacked)
+        and a per-sample formula is available, the per-sample path is used instead.
+        With offload set and a process pool configured, the selected formula runs in
+        worker processes instead of this thread.
+        """
+        if offload:
+            selected = vector_formula if vector_formula is not None else formula
+            if selected is not None and selected not in self._local_formulas and self.get_executor() is not None:
+                try:
+                    pickle.dumps(selected)
+                except (pickle.PicklingError, AttributeError, TypeError) as e:
+                    # A lambda/closure that cannot be shipped to workers; keep it in-thread from now on
+                    self._local_formulas.add(selected)
+                    logger.warning(f"Formula cannot be offloaded, evaluating in the processor thread: {e}")
+                else:
+                    try:
+                        self.apply_offloaded_formula(target, raw, selected, vector_formula is not None, pop, refresh_all)
+                        return
+                    except BrokenProcessPool as e:
+                        # A worker died: drop the pool, a new one is started on the next tick
+                        logger.error(f"Formula worker pool crashed: {e}")
+                        self.shutdown_executor()
+                        raise
+                    except Exception as e:
+                        logger.error(f"Offloaded formula failed: {e}")
+                        raise
+        if vector_formula is not None:
+            try:
+                self.apply_vector_formula(target, raw, vector_formula, pop, refresh_all)
+                return
+            except Exception as e:
+                if formula is None:
+                    raise
+                logger.warning(f"Vectorised formula failed, falling back to per-sample formula: {e}")
+        if formula is not None:
+            self.apply_formula(target, raw, formula, pop, refresh_all)
+
+    def get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Returns the process pool, creating it on first use. None if offloading is disabled."""
+        if self.executor is None:
+            workers = int(Config().get("processor_workers", 0))
+            if workers > 0:
+                self.executor = ProcessPoolExecutor(max_workers=workers)
+                logger.info(f"Data processor started {workers} worker processes.")
+        return self.executor
+
+    def shutdown_executor(self) -> None:
+        """Stops the worker processes, if any."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def apply_offloaded_formula(self, target: List[float], raw: List[Any], formula: Callable[[Any], Any], vectorised: bool, pop: bool, refresh_all: bool = False) -> None:
+        """Ships pending raw samples to the worker processes in chunks and merges the results back in order."""
+        executor = self.get_executor()
+        if executor is None:
+            return
+        raw_len = len(raw)
+        start = 0 if (refresh_all or pop) else len(target)
+        if start >= raw_len and not refresh_all:
+            return
+        block = raw[start:raw_len]
+        chunk_size = max(1, int(Config().get("processor_chunk_size", 64)))
+        chunks = [block[i:i + chunk_size] for i in range(0, len(block), chunk_size)]
+        results = executor.map(_apply_formula_chunk, repeat(formula), chunks, repeat(vectorised))
+        new_values = [value for chunk_result in results for value in chunk_result]
+        if refresh_all:
+            target.clear()
+        target.extend(new_values)
+        if pop:
+            del raw[:raw_len]
+
+    def apply_vector_formula(self, target: List[float], raw: List[Any], formula: Callable[[np.ndarray], Any], pop: bool, refresh_all: bool = False) -> None:
+        """Applies a vectorised formula to all pending raw samples in a single call."""
+        raw_len = len(raw)
+        if refresh_all:
+            new_values = evaluate_vector_formula(formula, raw[:raw_len])
+            target.clear()
+            target.extend(new_values)
+        elif pop:
+            new_values = evaluate_vector_formula(formula, raw[:raw_len])
+            target.extend(new_values)
+            del raw[:raw_len]
+        else:
+            cur_index = len(target)
+            if cur_index < raw_len:
+                target.extend(evaluate_vector_formula(formula, raw[cur_index:raw_len]))
+
     def apply_formula(self, target: List[float], raw: List[float], formula: Callable[[float], float], pop: bool, refresh_all: bool = False) -> None:
         """Applies a mathematical formula to raw data and updates the target list."""
         
@@ -98,29 +222,52 @@ class DataProcessor:
                 value = raw[i]
                 new_value = formula(value)
                 target.append(new_value)
-            for _ in range(raw_len):
-                raw.pop(0)
+            del raw[:raw_len]
+    def compact_journals(self) -> None:
+        """Rewrites this run's backup journals as one checkpoint each (end of run)."""
+        for journal in self.journals.values():
+            if not journal.path.exists():
+                continue
+            try:
+                ChartJournal.compact(str(journal.path))
+            except Exception as e:
+                logger.error(f"Failed to compact backup journal {journal.path}: {e}")
+
     def backup_saver(self):
+        """Appends the samples gathered since the last checkpoint to each chart's backup journal."""
         try:
             # Flag check
             if not Config().get("backup_switch", True):
                 return
             date: str = self.datetime
-            backup_schedule: float = Config().get("backup_schedule", 60.0)
             file_path: str = (
                 Config().get("data_charts_path")
                 + "\\"
                 + Config().get("data_charts_relative_bkps")
             )
-            postfix: str = f"{date}.json"
+            postfix: str = f"{date}.jsonl"
             local_data = copy.copy(self.data)
+            # Cursor is captured before the data so a resume never skips a sample
+            cursor = dict(self.cur_task.checkpoint)
             for chart in local_data:
-                # Set a backup name
-                backup_file_name: str = f"BKP_{chart.name}_{postfix}"
-                full_path = os.path.join(
-                    file_path,
-                    backup_file_name,
-                )
-                chart.save_json_atomic(full_path)
+                journal = self.journals.get(id(chart))
+                if journal is None:
+                    # Set a backup name
+                    backup_file_name: str = f"BKP_{chart.name}_{postfix}"
+                    full_path = os.path.join(
+                        file_path,
+                        backup_file_name,
+                    )
+                    journal = ChartJournal(
+                        full_path,
+                        metadata={
+                            "task_name": self.cur_task.name,
+                            "custom_alias": self.cur_task.custom_alias,
+                            "run": date,
+                        },
+                    )
+                    self.journals[id(chart)] = journal
+                journal.append(chart, extra=cursor)
+                ChartCatalogue().record(str(journal.path), [chart], journal.metadata, kind="backup")
         except Exception as e:
             logger.error(f"Error in backup saver: {e}")
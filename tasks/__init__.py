@@ -1,3 +1,9 @@
-from .task import Task, Tasks
-from .structures import ChartData, ChartData_Config
-from .helper import str_to_bool
\ No newline at end of file
+from .task import Task, Tasks, TaskState
+from .structures import ChartData, ChartData_Config, CHART_SCHEMA_VERSION, migrate_chart_dict, clean_stream_store
+from .columns import ArrayColumn, SpillColumn, record_dtype
+from .pyramid import SeriesPyramid
+from .helper import str_to_bool
+from .journal import ChartJournal
+from .storage import save_charts_npz, load_charts_npz, read_npz_header, read_header, save_charts_json, write_charts_json
+from .catalogue import ChartCatalogue
+from .snapshot import ChartSnapshot, SnapshotPublisher
@@ -0,0 +1,252 @@
+from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from threading import RLock
+import datetime
+import logging
+import os
+import sqlite3
+from config import Config
+from .structures import ChartData
+from .storage import read_header
+
+logger = logging.getLogger(__name__)
+
+CHART_SUFFIXES: Tuple[str, ...] = (".json", ".npz", ".jsonl")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    format TEXT NOT NULL,
+    task_name TEXT NOT NULL DEFAULT '',
+    custom_alias TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL DEFAULT '',
+    mtime REAL NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS charts (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0,
+    custom_type TEXT NOT NULL DEFAULT '',
+    x_label TEXT NOT NULL DEFAULT '',
+    x_unit TEXT NOT NULL DEFAULT '',
+    y_label TEXT NOT NULL DEFAULT '',
+    y_unit TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (path, idx)
+);
+CREATE INDEX IF NOT EXISTS files_task ON files(task_name, timestamp);
+CREATE INDEX IF NOT EXISTS charts_name ON charts(name);
+"""
+
+
+def _chart_row(idx: int, chart: Dict[str, Any], points: int) -> Tuple[Any, ...]:
+    x_meta = chart.get("x", {}).get("meta", {})
+    y_meta = chart.get("y", {}).get("meta", {})
+    return (
+        idx,
+        chart.get("name", ""),
+        points,
+        chart.get("config", {}).get("custom_type", ""),
+        x_meta.get("label", ""),
+        x_meta.get("unit", ""),
+        y_meta.get("label", ""),
+        y_meta.get("unit", ""),
+    )
+
+
+class ChartCatalogue:
+    """
+    Persistent SQLite index of the chart files saved under data_charts_path.
+
+    Every saved chart file (and backup journal) has one row in ``files`` with
+    the task name, alias and timestamp, plus one row per chart in ``charts``
+    with its name, processed point count and axis units. Task saves and the
+    backup saver record their files as they write them; ``scan`` picks up
+    files written by other means and drops deleted ones, re-reading only files
+    whose mtime changed. Connections are opened per call, so the catalogue can
+    be used from task threads and Streamlit sessions alike.
+    """
+
+    _lock = RLock()
+    _instance = None
+
+    def __new__(cls) -> "ChartCatalogue":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._ready_path = None
+        return cls._instance
+
+    @property
+    def db_path(self) -> str:
+        return Config().get(
+            "chart_catalogue_path",
+            os.path.join(Config().get("data_charts_path"), "catalogue.sqlite3"),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.db_path
+        conn = sqlite3.connect(path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self._ready_path != path:
+            with self._lock:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(_SCHEMA)
+                self._ready_path = path
+        return conn
+
+    # ---------------- Writers ----------------
+    def _upsert(
+        self,
+        conn: sqlite3.Connection,
+        path: str,
+        kind: str,
+        metadata: Dict[str, Any],
+        chart_rows: List[Tuple[Any, ...]],
+    ) -> None:
+        p = Path(path)
+        stat = p.stat()
+        timestamp = metadata.get("timestamp") or datetime.datetime.fromtimestamp(stat.st_mtime).isoformat()
+        conn.execute(
+            "INSERT OR REPLACE INTO files (path, file_name, kind, format, task_name, custom_alias, timestamp, mtime, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                str(p),
+                p.name,
+                kind,
+                p.suffix.lower().lstrip("."),
+                metadata.get("task_name", ""),
+                metadata.get("custom_alias", ""),
+                timestamp,
+                stat.st_mtime,
+                stat.st_size,
+            ),
+        )
+        conn.execute("DELETE FROM charts WHERE path = ?", (str(p),))
+        conn.executemany(
+            "INSERT INTO charts (path, idx, name, points, custom_type, x_label, x_unit, y_label, y_unit) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(str(p),) + row for row in chart_rows],
+        )
+
+    def record(
+        self,
+        path: str,
+        charts: List[ChartData],
+        metadata: Optional[Dict[str, Any]] = None,
+        kind: str = "result",
+    ) -> None:
+        """Index a file just written from in-memory charts (no re-read). Errors are logged, never raised."""
+        metadata = metadata if metadata is not None else {}
+        try:
+            rows = [_chart_row(i, c.header_dict(), len(c.y_series.processed)) for i, c in enumerate(charts)]
+            with self._lock, self._connect() as conn:
+                self._upsert(conn, path, kind, metadata, rows)
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not index chart file {path}: {e}")
+
+    def _read_file(self, path: Path) -> Tuple[str, Dict[str, Any], List[Tuple[Any, ...]]]:
+        """Read the index information of a file written outside of the running app (header only)."""
+        header = read_header(str(path))
+        rows = [
+            _chart_row(i, chart, chart.get("points", {}).get("y/processed", 0))
+            for i, chart in enumerate(header.get("charts", []))
+        ]
+        kind = "backup" if path.suffix.lower() == ".jsonl" else "result"
+        return kind, header.get("metadata", {}), rows
+
+    def scan(self, root: Optional[str] = None) -> int:
+        """Synchronise the index with the files on disk. Returns the number of files (re)indexed."""
+        root_path = Path(root if root is not None else Config().get("data_charts_path"))
+        indexed = 0
+        with self._lock, self._connect() as conn:
+            known = {row["path"]: row["mtime"] for row in conn.execute("SELECT path, mtime FROM files")}
+            seen = set()
+            if root_path.is_dir():
+                for p in root_path.rglob("*"):
+                    if p.suffix.lower() not in CHART_SUFFIXES or not p.is_file():
+                        continue
+                    seen.add(str(p))
+                    if known.get(str(p)) == p.stat().st_mtime:
+                        continue
+                    try:
+                        kind, metadata, rows = self._read_file(p)
+                        self._upsert(conn, str(p), kind, metadata, rows)
+                        indexed += 1
+                    except Exception as e:
+                        logger.warning(f"Skipping unreadable chart file {p}: {e}")
+            gone = [(path,) for path in known if path not in seen and not os.path.exists(path)]
+            conn.executemany("DELETE FROM files WHERE path = ?", gone)
+        conn.close()
+        if indexed or gone:
+            logger.info(f"Chart catalogue: {indexed} files indexed, {len(gone)} removed.")
+        return indexed
+
+    # ---------------- Queries ----------------
+    @staticmethod
+    def _file_filter(kind: Optional[str], task_name: Optional[str], search: str) -> Tuple[str, List[Any]]:
+        """WHERE clause (on files f) and parameters shared by files() and count()."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if kind:
+            clauses.append("f.kind = ?")
+            params.append(kind)
+        if task_name:
+            clauses.append("f.task_name = ?")
+            params.append(task_name)
+        if search:
+            like = f"%{search}%"
+            clauses.append(
+                "(f.file_name LIKE ? OR f.custom_alias LIKE ? OR EXISTS (SELECT 1 FROM charts s WHERE s.path = f.path "
+                "AND (s.name LIKE ? OR s.x_unit LIKE ? OR s.y_unit LIKE ?)))"
+            )
+            params.extend([like] * 5)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def files(
+        self,
+        kind: Optional[str] = "result",
+        task_name: Optional[str] = None,
+        search: str = "",
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """List indexed files, newest first, with their chart names and point counts.
+
+        kind is "result" (saved charts), "backup" (journals) or None for both.
+        search matches file name, alias, chart name or units (case-insensitive).
+        limit/offset select a page; count() gives the number of matching files.
+        """
+        where, params = self._file_filter(kind, task_name, search)
+        query = (
+            "SELECT f.path, f.file_name, f.task_name, f.custom_alias, f.timestamp, f.format, f.size, "
+            "group_concat(c.name, ', ') AS chart_names, coalesce(sum(c.points), 0) AS points "
+            "FROM files f LEFT JOIN charts c ON c.path = f.path" + where
+            + " GROUP BY f.path ORDER BY f.timestamp DESC, f.path LIMIT ? OFFSET ?"
+        )
+        params.extend([limit, offset])
+        with self._connect() as conn:
+            rows = [dict(row) for row in conn.execute(query, params)]
+        conn.close()
+        return rows
+
+    def count(self, kind: Optional[str] = "result", task_name: Optional[str] = None, search: str = "") -> int:
+        """Number of indexed files matching the files() filters."""
+        where, params = self._file_filter(kind, task_name, search)
+        with self._connect() as conn:
+            total = conn.execute("SELECT count(*) FROM files f" + where, params).fetchone()[0]
+        conn.close()
+        return int(total)
+
+    def task_names(self) -> List[str]:
+        """Distinct task names present in the index."""
+        with self._connect() as conn:
+            names = [row[0] for row in conn.execute("SELECT DISTINCT task_name FROM files WHERE task_name != '' ORDER BY 1")]
+        conn.close()
+        return names
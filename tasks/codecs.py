@@ -0,0 +1,136 @@
+from typing import Any, List, Optional
+import logging
+import zlib
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Elements per byte-shuffle block. Fixed so streamed and one-shot encodes are identical.
+CODEC_BLOCK = 1 << 16
+CODECS: List[str] = ["none", "zlib", "zstd", "delta-shuffle-zlib", "delta-shuffle-zstd"]
+
+# Series codecs
+# ------------
+# A codec is "<transform>-<compressor>" or just "<compressor>":
+#   delta:   difference of consecutive elements, computed on their unsigned
+#            integer bit pattern (exact for floats too, wraps on overflow)
+#   shuffle: groups byte 0 of every element, then byte 1, ... per block of
+#            CODEC_BLOCK elements, so slowly varying values compress well
+#   zlib / zstd: general purpose compressor (zstd needs the zstandard package)
+
+
+def _word(dtype: np.dtype) -> int:
+    """Integer word size used by delta/shuffle, 0 when the dtype does not split into words."""
+    if dtype.itemsize in (1, 2, 4, 8):
+        return dtype.itemsize
+    if dtype.itemsize % 8 == 0:
+        return 8  # complex128 and friends
+    return 0
+
+
+def choose_codec(dtype: np.dtype, requested: str = "auto", sample: Optional[Any] = None) -> str:
+    """Resolve the codec for a series of the given dtype.
+
+    "auto" picks delta+shuffle for integer data (8-bit scope codes, counters,
+    ...). Floats only benefit from it when the series is smooth (e.g. a time
+    axis), so both variants are tried on ``sample`` (the first elements of the
+    series) and the smaller one is kept; without a sample the plain compressor
+    is used. Anything else gets plain compression. zstd is used when
+    installed, otherwise zlib.
+    """
+    requested = (requested or "auto").lower()
+    compressor = "zstd" if zstandard is not None else "zlib"
+    if requested == "auto":
+        if not (dtype.kind in "biufc" and _word(dtype)):
+            return compressor
+        shuffled = f"delta-shuffle-{compressor}"
+        if dtype.kind in "biu":
+            return shuffled
+        if sample is None:
+            return compressor
+        block = np.ascontiguousarray(sample, dtype=dtype).reshape(-1)[:CODEC_BLOCK]
+        if not len(block):
+            return compressor
+        return shuffled if len(encode_array(block, shuffled)) < len(encode_array(block, compressor)) else compressor
+    if requested not in CODECS:
+        logger.warning(f"Unknown codec '{requested}', storing uncompressed.")
+        return "none"
+    if requested.endswith("zstd") and zstandard is None:
+        logger.warning("zstandard is not installed, falling back to zlib.")
+        requested = requested[:-4] + "zlib"
+    if requested.startswith("delta-shuffle") and not (dtype.kind in "biufc" and _word(dtype)):
+        return requested.split("-")[-1]
+    return requested
+
+
+class SeriesEncoder:
+    """Incremental encoder: feed array blocks with ``encode`` and finish with ``flush``."""
+
+    def __init__(self, codec: str, dtype: np.dtype) -> None:
+        self.codec = codec
+        self.dtype = np.dtype(dtype)
+        self.transform = codec.startswith("delta-shuffle")
+        word = _word(self.dtype)
+        self._word_dtype = np.dtype(f"<u{word}") if word else None
+        self._previous = 0
+        self._pending = np.empty(0, dtype=self._word_dtype) if self.transform else None
+        if codec.endswith("zstd"):
+            self._compressor = zstandard.ZstdCompressor().compressobj()
+        else:
+            self._compressor = zlib.compressobj(6)
+
+    def _shuffle(self, words: np.ndarray) -> bytes:
+        deltas = np.diff(words, prepend=self._word_dtype.type(self._previous))
+        self._previous = words[-1]
+        return deltas.view(np.uint8).reshape(-1, self._word_dtype.itemsize).T.tobytes()
+
+    def encode(self, block: Any) -> bytes:
+        data = np.ascontiguousarray(block, dtype=self.dtype)
+        if not self.transform:
+            return self._compressor.compress(data.tobytes())
+        words = np.concatenate([self._pending, data.reshape(-1).view(self._word_dtype)])
+        full = len(words) - len(words) % CODEC_BLOCK
+        out = [self._compressor.compress(self._shuffle(words[i : i + CODEC_BLOCK])) for i in range(0, full, CODEC_BLOCK)]
+        self._pending = words[full:]
+        return b"".join(out)
+
+    def flush(self) -> bytes:
+        out = b""
+        if self.transform and len(self._pending):
+            out = self._compressor.compress(self._shuffle(self._pending))
+            self._pending = self._pending[:0]
+        return out + self._compressor.flush()
+
+
+def encode_array(data: np.ndarray, codec: str) -> bytes:
+    """Encode a whole array in one call."""
+    encoder = SeriesEncoder(codec, data.dtype)
+    return encoder.encode(data) + encoder.flush()
+
+
+def decode_array(payload: bytes, codec: str, dtype: np.dtype, shape: Optional[Any]) -> np.ndarray:
+    """Decode a payload produced by SeriesEncoder back into an array of the given dtype/shape."""
+    dtype = np.dtype(dtype)
+    if codec.endswith("zstd"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this chart file.")
+        raw = zstandard.ZstdDecompressor().decompressobj().decompress(payload)
+    else:
+        raw = zlib.decompress(payload)
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    if codec.startswith("delta-shuffle"):
+        word = _word(dtype)
+        block_bytes = CODEC_BLOCK * word
+        unshuffled = np.empty_like(buf)
+        for start in range(0, len(buf), block_bytes):
+            chunk = buf[start : start + block_bytes]
+            unshuffled[start : start + len(chunk)] = chunk.reshape(word, -1).T.ravel()
+        words = unshuffled.view(f"<u{word}")
+        buf = np.cumsum(words, dtype=words.dtype).view(np.uint8)
+    arr = buf.view(dtype)
+    return arr.reshape(shape) if shape is not None else arr
@@ -0,0 +1,366 @@
+from pathlib import Path
+from threading import Lock, RLock
+from typing import Any, Iterable, Iterator, Optional, Tuple, Union
+import numpy as np
+
+
+def record_dtype(fields: Iterable[Tuple[str, Any]]) -> np.dtype:
+    """Structured dtype for record samples, e.g. record_dtype([("V", "f8"), ("label", "U32")])."""
+    return np.dtype([(str(name), np.dtype(dtype)) for name, dtype in fields])
+
+
+class ArrayColumn:
+    """
+    Growable, NumPy-backed column with the list API used by tasks and the DataProcessor.
+
+    Samples are stored contiguously in a typed buffer (8 bytes per float64 point)
+    that grows geometrically, so ``append`` is amortised O(1). Each element may be
+    a scalar or a fixed-shape row (``row_shape``), e.g. (2, 2000) for [t, V]
+    waveforms.
+
+    With a structured dtype (see record_dtype) every sample is one record with
+    named fields, stored once in columnar form; list samples are accepted and
+    converted to records, and ``column.view()["field"]`` is a plain array.
+
+    Samples already stored are never rewritten by append/extend/clear/del (those
+    allocate a new buffer when needed), so views returned by ``view()``/slicing
+    stay valid snapshots while the column keeps growing. Mutations hold a lock,
+    so a task thread may append while the DataProcessor deletes the consumed
+    prefix (pop_raw) without losing samples.
+
+    Parameters
+    ----------
+    values: Iterable
+        Initial samples.
+    dtype:
+        NumPy dtype of the samples (default float64).
+    row_shape: Optional[Tuple[int, ...]]
+        Shape of a single sample. None infers it from ``values`` (scalar if empty).
+    capacity: int
+        Initial buffer capacity in samples.
+    """
+
+    def __init__(
+        self,
+        values: Iterable[Any] = (),
+        dtype: Any = np.float64,
+        row_shape: Optional[Tuple[int, ...]] = None,
+        capacity: int = 1024,
+    ) -> None:
+        initial = self._as_block(values if not isinstance(values, ArrayColumn) else values.view(), np.dtype(dtype))
+        if row_shape is None:
+            row_shape = tuple(initial.shape[1:]) if initial.ndim > 1 else ()
+        self.dtype = np.dtype(dtype)
+        self.row_shape: Tuple[int, ...] = tuple(row_shape)
+        self._buffer = np.empty((max(capacity, len(initial)),) + self.row_shape, dtype=self.dtype)
+        self._length = 0
+        self._lock = Lock()
+        if initial.size:
+            self.extend(initial)
+
+    @staticmethod
+    def _as_block(values: Any, dtype: np.dtype) -> np.ndarray:
+        if dtype.names and not isinstance(values, np.ndarray):
+            # NumPy only builds records from tuples
+            values = [tuple(v) if isinstance(v, list) else v for v in values]
+        return np.asarray(values, dtype=dtype)
+
+    # ---------------- Buffer management ----------------
+    def _reserve(self, extra: int) -> None:
+        needed = self._length + extra
+        if needed > len(self._buffer):
+            capacity = max(needed, 2 * len(self._buffer), 16)
+            buffer = np.empty((capacity,) + self.row_shape, dtype=self.dtype)
+            buffer[: self._length] = self._buffer[: self._length]
+            self._buffer = buffer
+
+    def _rebuild(self, data: np.ndarray) -> None:
+        """Replace the contents with a copy of data in a fresh buffer."""
+        self._buffer = np.empty((max(len(data), 16),) + self.row_shape, dtype=self.dtype)
+        self._buffer[: len(data)] = data
+        self._length = len(data)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the stored samples (excluding spare capacity)."""
+        return self._length * self.dtype.itemsize * int(np.prod(self.row_shape))
+
+    # ---------------- List API ----------------
+    def append(self, value: Any) -> None:
+        if self.dtype.names and isinstance(value, list):
+            value = tuple(value)
+        with self._lock:
+            self._reserve(1)
+            self._buffer[self._length] = value
+            self._length += 1
+
+    def extend(self, values: Iterable[Any]) -> None:
+        if isinstance(values, ArrayColumn):
+            values = values.view()
+        block = self._as_block(values, self.dtype).reshape((-1,) + self.row_shape)
+        with self._lock:
+            self._reserve(len(block))
+            self._buffer[self._length : self._length + len(block)] = block
+            self._length += len(block)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer = np.empty((len(self._buffer),) + self.row_shape, dtype=self.dtype)
+            self._length = 0
+
+    def pop(self, index: int = -1) -> Any:
+        with self._lock:
+            data = self.view()
+            value = data[index].copy() if self.row_shape else data[index]
+            self._rebuild(np.delete(data, index, axis=0))
+        return value
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return self.view()[index]
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        with self._lock:
+            self._buffer[: self._length][index] = value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        with self._lock:
+            if isinstance(index, slice):
+                index = np.arange(self._length)[index]
+            self._rebuild(np.delete(self.view(), index, axis=0))
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.view())
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> np.ndarray:
+        data = self.view()
+        if dtype is not None and np.dtype(dtype) != self.dtype:
+            return data.astype(dtype)
+        return data.copy() if copy else data
+
+    def __repr__(self) -> str:
+        return f"ArrayColumn(len={self._length}, dtype={self.dtype}, row_shape={self.row_shape})"
+
+    # ---------------- Conversions ----------------
+    def view(self) -> np.ndarray:
+        """Read-only array view of the stored samples (no copy)."""
+        data = self._buffer[: self._length]
+        data.flags.writeable = False
+        return data
+
+    def tolist(self) -> list:
+        return self.view().tolist()
+
+
+class SpillColumn:
+    """
+    Series container that spills older samples to an on-disk chunk store.
+
+    Samples are appended to an in-memory tail; once the tail holds twice
+    ``tail`` samples, all but the newest ``tail`` are appended to a flat binary
+    file at ``path``. Memory use is therefore bounded regardless of run length,
+    while the column keeps the full list API: indexing and slicing read spilled
+    samples back from disk (via a read-only memmap) when needed.
+
+    The dtype and sample shape are inferred from the first sample. Numeric
+    samples (scalars or fixed-shape rows such as [t, V] waveforms) are stored as
+    float64, except integer NumPy arrays (e.g. raw scope codes), which keep
+    their dtype; anything else (strings, ragged rows) keeps a plain in-memory
+    list, since it cannot be spilled as a typed array.
+
+    Parameters
+    ----------
+    path: str
+        File backing the spilled samples. Created on first spill.
+    tail: int
+        Samples kept in memory after a spill.
+    """
+
+    def __init__(self, path: str, tail: int = 4096) -> None:
+        self.path = Path(path)
+        self.tail = max(int(tail), 1)
+        self.dtype: Optional[np.dtype] = None
+        self.row_shape: Tuple[int, ...] = ()
+        self._memory: Any = []  # ArrayColumn once a numeric first sample is seen
+        self._spilled = 0  # samples stored on disk
+        self._skip = 0  # leading samples deleted (offset into the store)
+        self._lock = RLock()  # the task appends while the DataProcessor reads/deletes
+
+    # ---------------- Chunk store ----------------
+    @property
+    def columnar(self) -> bool:
+        """True when samples are typed (and can be spilled)."""
+        return isinstance(self._memory, ArrayColumn)
+
+    @property
+    def in_memory(self) -> int:
+        """Number of samples currently held in RAM."""
+        return len(self._memory)
+
+    def _adopt(self, sample: Any) -> None:
+        """Pick the storage for the first sample."""
+        try:
+            first = np.asarray(sample)
+        except ValueError:
+            return
+        if first.dtype.kind in "biuf":
+            # Typed integer arrays (e.g. 8-bit scope codes) keep their width, anything else is float64
+            integer = isinstance(sample, np.ndarray) and first.dtype.kind in "biu"
+            self.dtype = first.dtype if integer else np.dtype(np.float64)
+            self.row_shape = tuple(first.shape)
+            self._memory = ArrayColumn(dtype=self.dtype, row_shape=self.row_shape)
+
+    def _to_list(self) -> None:
+        """Fall back to an in-memory list (ragged/non-numeric data); only possible before a spill."""
+        if self._spilled:
+            raise ValueError(f"Sample does not match spilled column shape {self.row_shape}.")
+        self._memory = self._memory.tolist()
+
+    def _disk(self) -> np.ndarray:
+        return np.memmap(self.path, dtype=self.dtype, mode="r", shape=(self._spilled,) + self.row_shape)
+
+    def _maybe_spill(self) -> None:
+        if not self.columnar or len(self._memory) < 2 * self.tail:
+            return
+        keep = self.tail
+        data = self._memory.view()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(np.ascontiguousarray(data[:-keep]).tobytes())
+        self._spilled += len(data) - keep
+        self._memory = ArrayColumn(data[-keep:], dtype=self.dtype, row_shape=self.row_shape)
+
+    def iter_chunks(self, chunk: int = 65536) -> Iterator[Any]:
+        """Yield the samples in order as blocks of at most ``chunk`` samples (arrays or lists)."""
+        for start in range(self._skip, self._spilled, chunk):
+            yield np.array(self._disk()[start : min(start + chunk, self._spilled)])
+        if len(self._memory):
+            yield self._memory.view() if self.columnar else list(self._memory)
+
+    def discard(self) -> None:
+        """Drop all samples and delete the backing file."""
+        self.clear()
+
+    # ---------------- List API ----------------
+    def append(self, value: Any) -> None:
+        with self._lock:
+            if self.dtype is None and not len(self._memory):
+                self._adopt(value)
+            try:
+                self._memory.append(value)
+            except (ValueError, TypeError):
+                self._to_list()
+                self._memory.append(value)
+            self._maybe_spill()
+
+    def extend(self, values: Iterable[Any]) -> None:
+        with self._lock:
+            if not hasattr(values, "__len__"):
+                values = list(values)
+            if self.dtype is None and not len(self._memory) and len(values):
+                self._adopt(values[0])
+            if self.columnar:
+                try:
+                    self._memory.extend(values)
+                    self._maybe_spill()
+                    return
+                except (ValueError, TypeError):
+                    pass
+            for value in values:
+                self.append(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory = ArrayColumn(dtype=self.dtype, row_shape=self.row_shape) if self.columnar else []
+            self._spilled = 0
+            self._skip = 0
+            self.path.unlink(missing_ok=True)
+
+    def pop(self, index: int = -1) -> Any:
+        with self._lock:
+            if index in (-1, len(self) - 1) and len(self._memory):
+                return self._memory.pop()
+            value = self[index]
+            del self[index]
+            return value
+
+    def __len__(self) -> int:
+        return self._spilled - self._skip + len(self._memory)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        with self._lock:
+            length = len(self)
+            offset = self._spilled - self._skip  # first in-memory sample
+            if isinstance(index, slice):
+                start, stop, step = index.indices(length)
+                if step != 1:
+                    return self[start:stop][::step] if stop > start else self._memory[0:0]
+                stop = max(stop, start)
+                if start >= offset:
+                    return self._memory[start - offset : stop - offset]
+                disk = np.array(self._disk()[self._skip + start : self._skip + min(stop, offset)])
+                if stop <= offset:
+                    return disk
+                return np.concatenate([disk, self._memory.view()[: stop - offset]])
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("SpillColumn index out of range")
+            if index >= offset:
+                return self._memory[index - offset]
+            return np.array(self._disk()[self._skip + index])
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        with self._lock:
+            offset = self._spilled - self._skip
+            if index < 0:
+                index += len(self)
+            if index >= offset:
+                self._memory[index - offset] = value
+                return
+            disk = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(self._spilled,) + self.row_shape)
+            disk[self._skip + index] = value
+            disk.flush()
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        with self._lock:
+            length = len(self)
+            if isinstance(index, slice):
+                start, stop, step = index.indices(length)
+                if start == 0 and step == 1:
+                    # Deleting a prefix (pop_raw buffers) only moves the store offset
+                    count = max(stop, 0)
+                    on_disk = min(count, self._spilled - self._skip)
+                    self._skip += on_disk
+                    del self._memory[: count - on_disk]
+                    if self._skip == self._spilled and self._spilled:
+                        self.path.unlink(missing_ok=True)
+                        self._spilled = self._skip = 0
+                    return
+            # Anything else rewrites the column
+            drop = set(range(length)[index]) if isinstance(index, slice) else {index % length}
+            data = [v for i, v in enumerate(self) if i not in drop]
+            self.clear()
+            self.extend(data)
+
+    def __iter__(self) -> Iterator[Any]:
+        for block in self.iter_chunks():
+            yield from block
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> np.ndarray:
+        data = self.view()
+        return data.astype(dtype) if dtype is not None else data
+
+    def __repr__(self) -> str:
+        return f"SpillColumn(len={len(self)}, in_memory={self.in_memory}, path={str(self.path)!r})"
+
+    # ---------------- Conversions ----------------
+    def view(self) -> np.ndarray:
+        """Full array of the samples (reads the spilled part from disk)."""
+        return np.asarray(self[:])
+
+    def tolist(self) -> list:
+        data = self[:]
+        return data.tolist() if hasattr(data, "tolist") else list(data)
@@ -0,0 +1,168 @@
+from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+import json
+import logging
+import os
+from .structures import ChartData, to_plain_list
+
+logger = logging.getLogger(__name__)
+
+SERIES_KEYS: List[Tuple[str, str]] = [
+    ("x", "raw"),
+    ("x", "processed"),
+    ("y", "raw"),
+    ("y", "processed"),
+]
+
+
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for NumPy scalars/arrays that end up in raw buffers."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ChartJournal:
+    """
+    Append-only JSON Lines backup of a single ChartData.
+
+    The first line is a header record (chart metadata plus caller supplied
+    metadata such as task name). Every checkpoint appends one chunk record
+    holding only the samples added since the previous checkpoint, so the cost
+    of a backup depends on the new data and not on the run length.
+
+    A series that shrank since the last checkpoint (pop_raw buffers, cleared
+    lists) or that is rewritten in place (refresh_all processed data) is written
+    in full and flagged as a reset, replacing what was journaled before. At the
+    end of a run the DataProcessor compacts the journal into a single checkpoint
+    (see ``compact``), dropping the superseded records.
+
+    When the chart metadata changes during the run (e.g. axis meta attrs set
+    on the first acquisition), a new header record is appended before the next
+    chunk; replay applies it to the chart without touching the samples.
+    """
+
+    def __init__(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        self.path = Path(path)
+        self.metadata: Dict[str, Any] = metadata if metadata is not None else {}
+        self._offsets: Dict[str, int] = {}
+        self._header: Optional[str] = None  # last header record written
+
+    def append(self, chart: ChartData, extra: Optional[Dict[str, Any]] = None) -> int:
+        """Write the samples added since the last checkpoint. Returns the number of samples written.
+
+        ``extra`` is stored verbatim in the chunk record (e.g. a task resume cursor).
+        """
+        lines: List[str] = []
+        header = json.dumps(
+            {"type": "header", "chart": chart.header_dict(), "metadata": self.metadata},
+            ensure_ascii=False,
+            default=_json_default,
+        )
+        if header != self._header:
+            lines.append(header)
+
+        chunk: Dict[str, Any] = {"type": "chunk", "x": {}, "y": {}, "reset": []}
+        written = 0
+        for axis, kind in SERIES_KEYS:
+            if kind == "raw" and not chart.config.include_raw_on_save:
+                continue
+            series = chart.x_series if axis == "x" else chart.y_series
+            values = getattr(series, kind)
+            key = f"{axis}.{kind}"
+            offset = self._offsets.get(key, 0)
+            length = len(values)
+            rewritten = (kind == "raw" and chart.config.pop_raw) or (kind == "processed" and chart.config.refresh_all)
+            if length < offset or (rewritten and length > 0):
+                chunk[axis][kind] = to_plain_list(values[:length])
+                chunk["reset"].append(key)
+                written += length
+            elif length > offset:
+                chunk[axis][kind] = to_plain_list(values[offset:length])
+                written += length - offset
+            self._offsets[key] = length
+        if extra:
+            chunk["extra"] = extra
+        if written or chunk["reset"] or extra:
+            lines.append(json.dumps(chunk, ensure_ascii=False, default=_json_default))
+
+        if lines:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._header = header
+        return written
+
+    @staticmethod
+    def read_metadata(path: str) -> Dict[str, Any]:
+        """Return the caller metadata of a journal by reading only its header line."""
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.loads(f.readline() or "{}")
+        if record.get("type") != "header":
+            raise ValueError(f"No header record found in journal {path}.")
+        return record.get("metadata", {})
+
+    @staticmethod
+    def load(path: str) -> Tuple[ChartData, Dict[str, Any], Dict[str, Any]]:
+        """Replay a journal into a ChartData.
+
+        Returns (chart, metadata, extra) where extra is the last extra record
+        journaled. A truncated trailing line (crash while writing) is ignored.
+        """
+        chart: Optional[ChartData] = None
+        metadata: Dict[str, Any] = {}
+        extra: Dict[str, Any] = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupted record at line {line_no} of {path}.")
+                    continue
+                if record.get("type") == "header":
+                    header = ChartData.from_dict(record.get("chart", {}))
+                    if chart is None:
+                        chart = header
+                    else:
+                        # Metadata changed during the run: keep the samples replayed so far
+                        chart.x_series.meta = header.x_series.meta
+                        chart.y_series.meta = header.y_series.meta
+                    metadata = record.get("metadata", {})
+                elif record.get("type") == "chunk" and chart is not None:
+                    resets = record.get("reset", [])
+                    for axis, kind in SERIES_KEYS:
+                        values = record.get(axis, {}).get(kind)
+                        if values is None:
+                            continue
+                        series = chart.x_series if axis == "x" else chart.y_series
+                        container = getattr(series, kind)
+                        if f"{axis}.{kind}" in resets:
+                            container.clear()
+                        container.extend(values)
+                    if record.get("extra"):
+                        extra = record["extra"]
+        if chart is None:
+            raise ValueError(f"No header record found in journal {path}.")
+        return chart, metadata, extra
+
+    @staticmethod
+    def compact(path: str, out_path: Optional[str] = None) -> str:
+        """Rewrite a journal as a single header and chunk record. Returns the output path.
+
+        Replays the journal (dropping the samples superseded by reset records)
+        and atomically replaces it (or writes out_path) with one checkpoint
+        holding the final series and the last extra record, so the result
+        stays loadable and resumable.
+        """
+        chart, metadata, extra = ChartJournal.load(path)
+        target = Path(out_path if out_path is not None else path)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.unlink(missing_ok=True)
+        ChartJournal(str(tmp), metadata).append(chart, extra=extra)
+        os.replace(tmp, target)
+        return str(target)
@@ -0,0 +1,175 @@
+from typing import Any, Dict, List, Optional
+from threading import RLock
+import math
+import numpy as np
+from .columns import ArrayColumn
+
+# Rows of every level are [min, max, sum, count] of one bucket (NaN samples ignored).
+BASE_BUCKET = 64
+FACTOR = 4
+
+
+def _bucket(block: np.ndarray, size: int) -> np.ndarray:
+    """Reduce a 1-D block to [min, max, sum, count] rows over buckets of size samples (last may be partial)."""
+    pad = (-len(block)) % size
+    if pad:
+        block = np.concatenate([block, np.full(pad, np.nan)])
+    grid = block.reshape(-1, size)
+    valid = ~np.isnan(grid)
+    return np.column_stack(
+        [
+            np.fmin.reduce(grid, axis=1),
+            np.fmax.reduce(grid, axis=1),
+            np.where(valid, grid, 0.0).sum(axis=1),
+            valid.sum(axis=1).astype(np.float64),
+        ]
+    )
+
+
+def _merge(rows: np.ndarray, factor: int) -> np.ndarray:
+    """Merge groups of factor consecutive bucket rows into one row each."""
+    grid = rows.reshape(-1, factor, 4)
+    return np.column_stack(
+        [
+            np.fmin.reduce(grid[:, :, 0], axis=1),
+            np.fmax.reduce(grid[:, :, 1], axis=1),
+            grid[:, :, 2].sum(axis=1),
+            grid[:, :, 3].sum(axis=1),
+        ]
+    )
+
+
+class SeriesPyramid:
+    """
+    Multi-resolution min/max/mean summary of a scalar series.
+
+    Level 0 summarises complete buckets of ``base`` samples, every following
+    level merges ``factor`` complete buckets of the level below. Only complete
+    buckets are stored, so the pyramid is extended incrementally from the new
+    samples alone (amortised O(1) per sample, ~0.7 bytes per sample with the
+    defaults). ``envelope`` answers "n points covering [start, stop)" from the
+    finest level whose buckets span at least (stop - start) / n samples, reading
+    raw samples only for the partial buckets at the edges.
+
+    Series holding non-scalar or non-numeric samples disable the pyramid.
+    Updates (including the catch-up done by ``envelope``) hold a lock, so a
+    pyramid shared by several readers is extended by one of them at a time.
+    """
+
+    def __init__(self, base: int = BASE_BUCKET, factor: int = FACTOR) -> None:
+        self.base = base
+        self.factor = factor
+        self.levels: List[ArrayColumn] = []
+        self.length = 0  # samples summarised so far (including the incomplete bucket)
+        self.enabled = True
+        self._lock = RLock()
+
+    def clear(self) -> None:
+        self.levels = []
+        self.length = 0
+        self.enabled = True
+
+    def bucket_size(self, level: int) -> int:
+        return self.base * self.factor**level
+
+    def _append_rows(self, level: int, rows: np.ndarray) -> None:
+        while len(self.levels) <= level:
+            self.levels.append(ArrayColumn(dtype=np.float64, row_shape=(4,)))
+        column = self.levels[level]
+        column.extend(rows)
+        # Propagate complete groups of factor buckets to the next level
+        done_above = len(self.levels[level + 1]) * self.factor if len(self.levels) > level + 1 else 0
+        complete = (len(column) // self.factor) * self.factor
+        if complete > done_above:
+            self._append_rows(level + 1, _merge(column.view()[done_above:complete], self.factor))
+
+    def update(self, values: Any, reset: bool = False) -> None:
+        """Summarise the samples appended to values since the last update.
+
+        reset (or a series that shrank) rebuilds the pyramid from scratch, e.g.
+        for refresh_all charts whose processed data is rewritten in place.
+        """
+        n = len(values)
+        with self._lock:
+            if reset or n < self.length:
+                self.clear()
+            if not self.enabled:
+                return
+            done = len(self.levels[0]) * self.base if self.levels else 0
+            stop = done + ((n - done) // self.base) * self.base
+            if stop > done:
+                try:
+                    block = np.asarray(values[done:stop], dtype=np.float64)
+                except (ValueError, TypeError):
+                    self.enabled = False
+                    self.levels = []
+                    return
+                if block.ndim != 1:
+                    self.enabled = False
+                    self.levels = []
+                    return
+                self._append_rows(0, _bucket(block, self.base))
+            self.length = n
+
+    def _raw_rows(self, values: Any, start: int, stop: int, size: int) -> np.ndarray:
+        if stop <= start:
+            return np.empty((0, 4))
+        return _bucket(np.asarray(values[start:stop], dtype=np.float64).ravel(), size)
+
+    def envelope(self, values: Any, n: int, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Return about n buckets covering samples [start, stop) of values.
+
+        The result maps "index" (first sample of each bucket), "count", "min",
+        "max" and "mean" to equally long arrays. Ranges of at most n samples are
+        returned as is (min = max = mean = sample).
+        """
+        length = len(values)
+        stop = length if stop is None else min(stop, length)
+        start = max(0, start)
+        count = max(stop - start, 0)
+        n = max(int(n), 1)
+        if count <= n:
+            arr = np.asarray(values[start:stop], dtype=np.float64).ravel() if count else np.empty(0)
+            return {
+                "index": np.arange(start, start + len(arr)),
+                "count": (~np.isnan(arr)).astype(np.int64),
+                "min": arr,
+                "max": arr,
+                "mean": arr,
+            }
+        with self._lock:
+            if self.length != length:
+                self.update(values)
+            target = count / n
+            level = next((lv for lv in range(len(self.levels)) if self.bucket_size(lv) >= target), len(self.levels) - 1)
+            if not self.enabled or target <= self.base or level < 0:
+                # Too fine for the pyramid (or no pyramid): bucket the raw range directly, O(count) <= O(n * base)
+                size = max(int(math.ceil(target)), 1)
+                rows = self._raw_rows(values, start, stop, size)
+                index = start + np.arange(len(rows)) * size
+            else:
+                size = self.bucket_size(level)
+                first = -(-start // size)
+                last = min(stop // size, len(self.levels[level]))
+                head = self._raw_rows(values, start, min(first * size, stop), size)
+                middle = self.levels[level].view()[first:last] if last > first else np.empty((0, 4))
+                tail_start = max(last * size, min(first * size, stop))
+                tail = self._raw_rows(values, tail_start, stop, stop - tail_start) if stop > tail_start else np.empty((0, 4))
+                rows = np.concatenate([head, middle, tail])
+                index = np.concatenate(
+                    [np.array([start] * len(head), dtype=np.int64), np.arange(first, first + len(middle)) * size, [tail_start] * len(tail)]
+                ).astype(np.int64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = rows[:, 2] / rows[:, 3]
+        return {"index": index, "count": rows[:, 3].astype(np.int64), "min": rows[:, 0], "max": rows[:, 1], "mean": mean}
+
+    # ---------------- Persistence ----------------
+    def to_arrays(self) -> List[np.ndarray]:
+        return [level.view() for level in self.levels]
+
+    @classmethod
+    def from_arrays(cls, arrays: List[Any], length: int, base: int = BASE_BUCKET, factor: int = FACTOR) -> "SeriesPyramid":
+        pyramid = cls(base, factor)
+        pyramid.levels = [ArrayColumn(np.asarray(a, dtype=np.float64).reshape(-1, 4), row_shape=(4,)) for a in arrays]
+        pyramid.length = length
+        return pyramid
@@ -0,0 +1,182 @@
+from dataclasses import replace
+from threading import RLock
+from typing import Any, List, Optional, Set, Tuple
+import numpy as np
+from .columns import ArrayColumn, SpillColumn
+from .pyramid import SeriesPyramid
+from .structures import ChartData, Series
+
+
+def _frozen_copy(values: Any) -> np.ndarray:
+    """Read-only array copy of a (bounded) block of samples."""
+    try:
+        arr = np.array(values)
+    except ValueError:
+        arr = None  # ragged rows
+    if arr is None or arr.ndim != 1:
+        arr = np.fromiter(values, dtype=object, count=len(values))
+    arr.flags.writeable = False
+    return arr
+
+
+def _frozen_pyramid(pyramid: SeriesPyramid) -> SeriesPyramid:
+    """Pyramid sharing the level columns of a live one, frozen at its current length.
+
+    Levels only ever grow by appending, so a copy of the level list with the
+    same length never needs (nor triggers) an update for the samples it covers.
+    """
+    frozen = SeriesPyramid(pyramid.base, pyramid.factor)
+    frozen.levels = list(pyramid.levels)
+    frozen.length = pyramid.length
+    frozen.enabled = pyramid.enabled
+    return frozen
+
+
+class ChartSnapshot(ChartData):
+    """
+    Immutable, versioned view of a running chart, published by the DataProcessor.
+
+    processed series are read-only NumPy arrays that are never modified after
+    publication, so sessions can read them while the task keeps appending.
+    Formulas and raw samples are not part of the snapshot; raw_lengths and
+    lengths keep the raw and processed sample counts, as read before the series
+    were copied (the copies may hold a few more samples, never fewer). index_offset is the index of the first sample of
+    streamed (stream_to_disk) charts, which only snapshot their in-memory window.
+    """
+
+    def __init__(
+        self,
+        chart: ChartData,
+        version: int,
+        x: np.ndarray,
+        y: np.ndarray,
+        index_offset: int = 0,
+        lengths: Optional[Tuple[int, int]] = None,
+        raw_lengths: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        super().__init__(
+            name=chart.name,
+            schema_version=chart.schema_version,
+            created_at=chart.created_at,
+            config=replace(chart.config),
+            x_series=Series(raw=[], processed=x, meta=replace(chart.x_series.meta)),
+            y_series=Series(raw=[], processed=y, meta=replace(chart.y_series.meta)),
+        )
+        self.version = version
+        self.source_id = id(chart)
+        self.index_offset = index_offset
+        self.raw_lengths: Tuple[int, int] = raw_lengths or (len(chart.x_series.raw), len(chart.y_series.raw))
+        self.lengths: Tuple[int, int] = lengths or (len(chart.x_series.processed), len(chart.y_series.processed))
+        self.pyramids = {axis: _frozen_pyramid(p) for axis, p in chart.pyramids.items()}
+
+
+class _Mirror:
+    """Append-only copy of a plain-list processed series (float64 while possible)."""
+
+    def __init__(self) -> None:
+        self.column = ArrayColumn()
+
+    def sync(self, values: Any, rewrite: bool) -> np.ndarray:
+        length = len(values)
+        if rewrite or length < len(self.column):
+            self.column = ArrayColumn(dtype=self.column.dtype)
+        block = values[len(self.column) : length]
+        try:
+            self.column.extend(block)
+        except (TypeError, ValueError):
+            # Non-numeric samples: continue as an object column
+            self.column = ArrayColumn(list(values[:length]), dtype=object)
+        return self.column.view()
+
+
+class SnapshotPublisher:
+    """
+    Process-wide registry of the latest ChartSnapshot of every running chart.
+
+    The DataProcessor publishes after each tick. Processed series may still be
+    written meanwhile, by formulas or directly by the task thread (e.g. the
+    demo charts of test_task), so a snapshot only holds frozen copies: plain
+    lists go through an append-only mirror owned by the publisher, and
+    ArrayColumn series are published as zero-copy views, which is only safe
+    because append/extend/clear/del never rewrite stored samples (item
+    assignment does, so tasks must not assign into a published ArrayColumn).
+    x and y are read one after the other and may differ by the samples
+    appended in between; readers align them on the shorter one. A new version
+    is only produced when the data or the chart type changed; readers
+    (Streamlit sessions, the live server) compare versions instead of data and
+    can share whatever they derive from one version. Publishing costs
+    O(new samples).
+    """
+
+    _lock = RLock()
+    _instance = None
+
+    def __new__(cls) -> "SnapshotPublisher":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._snapshots = {}
+                cls._instance._mirrors = {}
+                cls._instance._versions = {}
+        return cls._instance
+
+    def _freeze(self, key: Tuple[int, str], values: Any, rewrite: bool) -> np.ndarray:
+        if isinstance(values, ArrayColumn):
+            return values.view()
+        if isinstance(values, np.ndarray):
+            return _frozen_copy(values) if rewrite else values
+        if key not in self._mirrors:
+            self._mirrors[key] = _Mirror()
+        return self._mirrors[key].sync(values, rewrite)
+
+    def publish(self, chart: ChartData) -> ChartSnapshot:
+        """Publish the current state of chart (called by the DataProcessor after each tick)."""
+        with self._lock:
+            previous: Optional[ChartSnapshot] = self._snapshots.get(id(chart))
+            x, y = chart.x_series.processed, chart.y_series.processed
+            rewrite = chart.config.refresh_all
+            # Read before copying: a task appending meanwhile makes the next publish see a change
+            lengths = (len(x), len(y))
+            raw_lengths = (len(chart.x_series.raw), len(chart.y_series.raw))
+            unchanged = (
+                previous is not None
+                and not rewrite
+                and previous.lengths == lengths
+                and previous.raw_lengths == raw_lengths
+                and previous.config.custom_type == chart.config.custom_type
+            )
+            if unchanged:
+                return previous
+            index_offset = 0
+            if isinstance(x, SpillColumn) or isinstance(y, SpillColumn):
+                # Streamed charts: snapshot the aligned window still held in memory
+                window = min((v.in_memory for v in (x, y) if isinstance(v, SpillColumn) and len(v)), default=0)
+                stop = min(len(v) for v in (x, y) if len(v)) if len(x) or len(y) else 0
+                index_offset = max(stop - window, 0)
+                x_arr = _frozen_copy(x[index_offset:stop]) if len(x) else _frozen_copy([])
+                y_arr = _frozen_copy(y[index_offset:stop]) if len(y) else _frozen_copy([])
+            else:
+                x_arr = self._freeze((id(chart), "x"), x, rewrite)
+                y_arr = self._freeze((id(chart), "y"), y, rewrite)
+            version = self._versions.get(id(chart), 0) + 1
+            self._versions[id(chart)] = version
+            snapshot = ChartSnapshot(chart, version, x_arr, y_arr, index_offset, lengths, raw_lengths)
+            self._snapshots[id(chart)] = snapshot
+            return snapshot
+
+    def latest(self, chart: ChartData) -> Optional[ChartSnapshot]:
+        """Latest snapshot of chart, None before its first publication."""
+        return self._snapshots.get(id(chart))
+
+    def sources(self) -> Set[int]:
+        """ids of the charts that currently have a snapshot."""
+        return set(self._snapshots)
+
+    def discard(self, charts: List[ChartData]) -> None:
+        """Forget the snapshots and mirrors of charts whose run is over."""
+        with self._lock:
+            for chart in charts:
+                self._snapshots.pop(id(chart), None)
+                self._versions.pop(id(chart), None)
+                self._mirrors.pop((id(chart), "x"), None)
+                self._mirrors.pop((id(chart), "y"), None)
@@ -0,0 +1,473 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import logging
+import os
+import re
+import struct
+import tempfile
+import time
+import uuid
+import zipfile
+import numpy as np
+from config import Config
+from .codecs import CODEC_BLOCK, SeriesEncoder, choose_codec, decode_array
+from .columns import ArrayColumn, SpillColumn
+from .pyramid import SeriesPyramid
+from .structures import CHART_SCHEMA_VERSION, ChartData, migrate_chart_dict, to_plain_list
+from .journal import _json_default
+
+logger = logging.getLogger(__name__)
+
+NPZ_FORMAT = "wasic-chart"
+NPZ_VERSION = 1
+HEADER_MEMBER = "header.json"
+SERIES_KEYS: List[str] = ["x/raw", "x/processed", "y/raw", "y/processed"]
+
+# Binary chart files are regular .npz archives (readable with np.load) laid out as:
+#   header.json                -> file metadata + per-chart header_dict and series index
+#   charts/<i>/<axis>/<kind>.npy -> one typed array per series
+# Series that cannot be stored as a typed array (ragged or mixed lists) are kept
+# as UTF-8 JSON in a uint8 array and flagged with encoding "json" in the header.
+
+
+@contextmanager
+def _replace_on_success(path: Path, atomic: bool) -> Iterator[Path]:
+    """Yield the file to write: with atomic set, a temporary sibling moved over path on success."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not atomic:
+        yield path
+        return
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        yield tmp
+        tmp.replace(path)
+    finally:
+        # best-effort cleanup
+        tmp.unlink(missing_ok=True)
+
+
+def _series_values(chart: ChartData, key: str) -> Any:
+    axis, kind = key.split("/")
+    series = chart.x_series if axis == "x" else chart.y_series
+    return getattr(series, kind)
+
+
+def _encode_series(values: Any) -> Tuple[np.ndarray, str]:
+    """Return (array, encoding) for a series container."""
+    if isinstance(values, ArrayColumn):
+        return values.view(), "npy"
+    if isinstance(values, np.ndarray) and not values.dtype.hasobject:
+        return values, "npy"
+    try:
+        arr = np.asarray(values)
+    except ValueError:
+        arr = None  # ragged nested lists
+    if arr is not None:
+        kind = arr.dtype.kind
+        if kind in "biufc" or (kind == "V" and arr.dtype.names and not arr.dtype.hasobject):
+            return arr, "npy"
+        # NumPy silently stringifies mixed lists; only accept genuinely all-string data
+        if kind == "U" and arr.tolist() == to_plain_list(values):
+            return arr, "npy"
+    payload = json.dumps(to_plain_list(values), ensure_ascii=False).encode("utf-8")
+    return np.frombuffer(payload, dtype=np.uint8), "json"
+
+
+def _decode_series(arr: np.ndarray, encoding: str) -> Any:
+    if encoding == "json":
+        return json.loads(arr.tobytes().decode("utf-8"))
+    if arr.dtype.kind == "U":
+        return arr.tolist()
+    return ArrayColumn(arr, dtype=arr.dtype)
+
+
+def _member_info(name: str, compress: bool) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    return info
+
+
+def _write_member(zf: zipfile.ZipFile, name: str, arr: np.ndarray, compress: bool = False) -> None:
+    with zf.open(_member_info(name, compress), "w", force_zip64=True) as member:
+        np.lib.format.write_array(member, np.ascontiguousarray(arr), allow_pickle=False)
+
+
+def _write_streamed_member(zf: zipfile.ZipFile, name: str, column: SpillColumn, compress: bool = False) -> None:
+    """Stream a spilled column into a .npy member chunk by chunk (never materialised in memory)."""
+    header = {
+        "descr": np.lib.format.dtype_to_descr(column.dtype),
+        "fortran_order": False,
+        "shape": (len(column),) + column.row_shape,
+    }
+    with zf.open(_member_info(name, compress), "w", force_zip64=True) as member:
+        np.lib.format.write_array_header_2_0(member, header)
+        for block in column.iter_chunks():
+            member.write(np.ascontiguousarray(block, dtype=column.dtype).tobytes())
+
+
+def _write_encoded_member(zf: zipfile.ZipFile, name: str, blocks: Iterable[Any], codec: str, dtype: np.dtype) -> None:
+    """Write blocks through a SeriesEncoder into a raw member (see tasks.codecs)."""
+    encoder = SeriesEncoder(codec, dtype)
+    with zf.open(_member_info(name, False), "w", force_zip64=True) as member:
+        for block in blocks:
+            member.write(encoder.encode(block))
+        member.write(encoder.flush())
+
+
+def _write_series(zf: zipfile.ZipFile, member: str, values: Any, codec: str) -> Dict[str, Any]:
+    """Write one series with the requested codec and return its header entry.
+
+    "none" keeps a plain .npy member (memory-mappable), "zlib" a deflated .npy
+    member (still readable by np.load), other codecs a raw encoded member.
+    """
+    streamed = isinstance(values, SpillColumn) and values.columnar
+    if streamed:
+        arr, encoding = None, "npy"
+        dtype, shape = values.dtype, (len(values),) + values.row_shape
+    else:
+        arr, encoding = _encode_series(values)
+        dtype, shape = arr.dtype, arr.shape
+    if encoding == "json" or dtype.kind not in "biufc":
+        # Text/record payloads only get general purpose compression
+        codec = "none" if codec == "none" else "zlib"
+    else:
+        # A leading block of samples lets "auto" compare codecs on the actual data
+        rows = max(CODEC_BLOCK // max(int(np.prod(shape[1:])), 1), 1)
+        codec = choose_codec(dtype, codec, sample=values[:rows] if streamed else arr[:rows])
+    info: Dict[str, Any] = {"member": member, "encoding": encoding, "length": len(values)}
+    if codec in ("none", "zlib"):
+        if streamed:
+            _write_streamed_member(zf, member, values, compress=codec == "zlib")
+        else:
+            _write_member(zf, member, arr, compress=codec == "zlib")
+        info["dtype"] = dtype.str if encoding == "npy" else "json"
+    else:
+        info["member"] = member = member[: -len(".npy")] + ".bin"
+        blocks = values.iter_chunks() if streamed else [arr]
+        _write_encoded_member(zf, member, blocks, codec, dtype)
+        info.update({"encoding": "codec", "codec": codec, "dtype": dtype.str, "shape": list(shape)})
+    return info
+
+
+def _write_pyramids(zf: zipfile.ZipFile, idx: int, chart: ChartData) -> Dict[str, Any]:
+    """Persist the downsampling pyramids of the processed series (small, stored uncompressed)."""
+    entries: Dict[str, Any] = {}
+    for axis, series in (("x", chart.x_series), ("y", chart.y_series)):
+        pyramid = chart.pyramids[axis]
+        pyramid.update(series.processed, reset=chart.config.refresh_all)
+        if not pyramid.enabled or not pyramid.levels:
+            continue
+        members = []
+        for level, rows in enumerate(pyramid.to_arrays()):
+            member = f"charts/{idx}/{axis}/pyramid/{level}.npy"
+            _write_member(zf, member, rows)
+            members.append(member)
+        entries[axis] = {"base": pyramid.base, "factor": pyramid.factor, "length": pyramid.length, "levels": members}
+    return entries
+
+
+def save_charts_npz(
+    charts: List[ChartData],
+    path: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    include_raw: bool = True,
+    atomic: bool = True,
+) -> None:
+    """Save one or more charts to a binary .npz chart file.
+
+    With atomic set the archive is written to a temporary file in the destination
+    directory and moved into place, so readers never see a partial file. Each
+    series is stored with the chart's codec (ChartData_Config.codec, or the
+    chart_codec config key when empty).
+    """
+    header: Dict[str, Any] = {
+        "format": NPZ_FORMAT,
+        "version": NPZ_VERSION,
+        "metadata": metadata if metadata is not None else {},
+        "charts": [],
+    }
+    default_codec = Config().get("chart_codec", "none")
+    with _replace_on_success(Path(path), atomic) as target:
+        with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for idx, chart in enumerate(charts):
+                chart_header = chart.header_dict()
+                chart_header["series"] = {}
+                codec = chart.config.codec or default_codec
+                for key in SERIES_KEYS:
+                    if key.endswith("raw") and not (include_raw and chart.config.include_raw_on_save):
+                        continue
+                    member = f"charts/{idx}/{key}.npy"
+                    chart_header["series"][key] = _write_series(zf, member, _series_values(chart, key), codec)
+                chart_header["pyramids"] = _write_pyramids(zf, idx, chart)
+                header["charts"].append(chart_header)
+            zf.writestr(HEADER_MEMBER, json.dumps(header, ensure_ascii=False))
+
+
+def read_npz_header(path: str) -> Dict[str, Any]:
+    """Read only the header of a binary chart file (no series data is touched)."""
+    with zipfile.ZipFile(path, "r") as zf:
+        header = json.loads(zf.read(HEADER_MEMBER).decode("utf-8"))
+    if header.get("format") != NPZ_FORMAT:
+        raise ValueError(f"{path} is not a WASIC chart file.")
+    return header
+
+
+def _member_data_offset(f: Any, info: zipfile.ZipInfo) -> int:
+    """Offset of a member's data in the archive file (after its local file header)."""
+    f.seek(info.header_offset)
+    local = f.read(30)
+    if local[:4] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local header for member {info.filename}.")
+    name_len, extra_len = struct.unpack("<HH", local[26:30])
+    return info.header_offset + 30 + name_len + extra_len
+
+
+def _map_member(path: str, f: Any, info: zipfile.ZipInfo) -> Optional[np.ndarray]:
+    """Memory-map an uncompressed .npy member. Returns None if it cannot be mapped."""
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    f.seek(_member_data_offset(f, info))
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    if dtype.hasobject:
+        return None
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order="F" if fortran_order else "C")
+
+
+def load_charts_npz(
+    path: str, series: Optional[Iterable[str]] = None, lazy: bool = False
+) -> Tuple[List[ChartData], Dict[str, Any]]:
+    """Load charts from a binary chart file.
+
+    Parameters
+    ----------
+    path: str
+        File to read.
+    series: Optional[Iterable[str]]
+        Series keys to load (e.g. ["y/processed"]). None loads everything; the
+        other series are left empty, so only the requested members are read.
+    lazy: bool
+        If True, typed series are read-only np.memmap arrays into the file: only
+        the header is read now, and slicing/len touch just the pages they need.
+        Compressed or JSON-encoded members are still decoded eagerly. The file
+        stays open while the arrays are alive.
+
+    Returns
+    -------
+    (charts, metadata)
+    """
+    wanted = set(series) if series is not None else None
+    charts: List[ChartData] = []
+    with open(path, "rb") as raw_file, zipfile.ZipFile(raw_file, "r") as zf:
+        header = json.loads(zf.read(HEADER_MEMBER).decode("utf-8"))
+        if header.get("format") != NPZ_FORMAT:
+            raise ValueError(f"{path} is not a WASIC chart file.")
+        for chart_header in header.get("charts", []):
+            chart = ChartData.from_dict(chart_header)
+            for key, info in chart_header.get("series", {}).items():
+                if wanted is not None and key not in wanted:
+                    continue
+                encoding = info.get("encoding", "npy")
+                values: Any = None
+                if lazy and encoding == "npy":
+                    values = _map_member(path, raw_file, zf.getinfo(info["member"]))
+                if encoding == "codec":
+                    arr = decode_array(zf.read(info["member"]), info["codec"], info["dtype"], info.get("shape"))
+                    values = _decode_series(arr, "npy")
+                elif values is None:
+                    with zf.open(info["member"]) as member:
+                        arr = np.lib.format.read_array(member, allow_pickle=False)
+                    values = _decode_series(arr, encoding)
+                axis, kind = key.split("/")
+                target = chart.x_series if axis == "x" else chart.y_series
+                setattr(target, kind, values)
+            for axis, entry in chart_header.get("pyramids", {}).items():
+                arrays = []
+                for member_name in entry["levels"]:
+                    with zf.open(member_name) as member:
+                        arrays.append(np.lib.format.read_array(member, allow_pickle=False))
+                chart.pyramids[axis] = SeriesPyramid.from_arrays(arrays, entry["length"], entry["base"], entry["factor"])
+            charts.append(chart)
+    return charts, header.get("metadata", {})
+
+
+# ---------------- Streaming JSON ----------------
+JSON_CHUNK = 4096
+JSON_HEADER_PREFIX = '{"header": '
+
+
+def chart_file_header(
+    charts: List[ChartData], metadata: Optional[Dict[str, Any]] = None, include_raw: bool = True
+) -> Dict[str, Any]:
+    """Metadata block of a chart file: chart headers plus the point count of each stored series."""
+    headers = []
+    for chart in charts:
+        chart_header = chart.header_dict()
+        chart_header["points"] = {
+            key: len(_series_values(chart, key))
+            for key in SERIES_KEYS
+            if not key.endswith("raw") or (include_raw and chart.config.include_raw_on_save)
+        }
+        headers.append(chart_header)
+    return {
+        "format": NPZ_FORMAT,
+        "schema_version": CHART_SCHEMA_VERSION,
+        "metadata": metadata if metadata is not None else {},
+        "charts": headers,
+    }
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """Read the metadata of any chart file (.json, .npz or .jsonl journal) without its series.
+
+    Returns {"format", "schema_version", "metadata", "charts"} where every chart
+    header is migrated to the current schema and carries "points" (series key ->
+    number of samples, when known). Version 2 JSON files and NPZ files are read
+    in a few KB; older JSON files have no header block and are parsed in full.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".npz":
+        header = read_npz_header(path)
+        charts = [
+            dict(chart, points={key: info.get("length", 0) for key, info in chart.get("series", {}).items()})
+            for chart in header.get("charts", [])
+        ]
+        metadata = header.get("metadata", {})
+    elif suffix == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            record = json.loads(f.readline() or "{}")
+        if record.get("type") != "header":
+            raise ValueError(f"No header record found in journal {path}.")
+        charts = [dict(record.get("chart", {}), points={})]
+        metadata = record.get("metadata", {})
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            first = f.readline()
+            if first.startswith(JSON_HEADER_PREFIX):
+                header = json.loads(first[len(JSON_HEADER_PREFIX) :].rstrip().rstrip(","))
+                charts, metadata = header.get("charts", []), header.get("metadata", {})
+            else:
+                # Version 1 file: no header block
+                f.seek(0)
+                data = json.load(f)
+                chart_dicts = data["charts"] if "charts" in data else [data]
+                metadata = data.get("metadata", {}) if "charts" in data else {}
+                charts = []
+                for chart in chart_dicts:
+                    points = {
+                        f"{axis}/{kind}": len(chart.get(axis, {}).get(kind, []))
+                        for axis in ("x", "y")
+                        for kind in ("raw", "processed")
+                        if kind in chart.get(axis, {})
+                    }
+                    light = {k: v for k, v in chart.items() if k not in ("x", "y")}
+                    light.update({axis: {"meta": chart.get(axis, {}).get("meta", {})} for axis in ("x", "y")})
+                    light["points"] = points
+                    charts.append(light)
+    return {
+        "format": NPZ_FORMAT,
+        "schema_version": CHART_SCHEMA_VERSION,
+        "metadata": metadata,
+        "charts": [dict(migrate_chart_dict(chart), points=chart.get("points", {})) for chart in charts],
+    }
+
+
+def _iter_blocks(values: Any, chunk: int = JSON_CHUNK) -> Iterator[Any]:
+    """Yield a series in blocks of at most chunk samples, straight from its buffer."""
+    if isinstance(values, SpillColumn):
+        yield from values.iter_chunks(chunk)
+        return
+    if isinstance(values, ArrayColumn):
+        values = values.view()
+    for start in range(0, len(values), chunk):
+        yield values[start : start + chunk]
+
+
+def _write_json_series(f: TextIO, values: Any) -> None:
+    """Write a series as a compact JSON array, encoding one block at a time."""
+    f.write("[")
+    first = True
+    for block in _iter_blocks(values):
+        text = json.dumps(to_plain_list(block), ensure_ascii=False, default=_json_default)[1:-1]
+        if not text:
+            continue
+        if not first:
+            f.write(", ")
+        f.write(text)
+        first = False
+    f.write("]")
+
+
+def write_charts_json(
+    f: TextIO,
+    charts: List[ChartData],
+    metadata: Optional[Dict[str, Any]] = None,
+    merged: bool = False,
+    include_raw: bool = True,
+    indent: Optional[int] = None,
+) -> None:
+    """Stream charts to an open text file in the ChartData.to_dict layout.
+
+    The first line holds a compact "header" entry (see chart_file_header); the
+    remaining keys are the to_dict layout, so older readers still work.
+
+    The document skeleton (headers, metadata) is encoded with json and each
+    series is written block by block from its buffer, so no full copy of the
+    data is ever built. With merged set the output is {"charts": [...],
+    "metadata": {...}}, otherwise charts must hold a single chart. indent
+    pretty-prints the skeleton only; series arrays are always written inline.
+    """
+    if not merged and len(charts) != 1:
+        raise ValueError("Exactly one chart is required for a non merged file.")
+    token = uuid.uuid4().hex
+    series: Dict[str, Any] = {}
+    skeletons: List[Dict[str, Any]] = []
+    for idx, chart in enumerate(charts):
+        skeleton = chart.header_dict()
+        # Same key order as to_dict: meta, processed, raw
+        for axis in ("x", "y"):
+            for kind in ("processed", "raw"):
+                if kind == "raw" and not (include_raw and chart.config.include_raw_on_save):
+                    continue
+                key = f"{axis}/{kind}"
+                series[f"{idx}:{key}"] = _series_values(chart, key)
+                skeleton[axis][kind] = f"{token}:{idx}:{key}"
+        skeletons.append(skeleton)
+    document: Dict[str, Any] = skeletons[0]
+    if merged:
+        document = {"charts": skeletons, "metadata": metadata if metadata is not None else {}}
+    text = json.dumps(document, ensure_ascii=False, indent=indent, default=_json_default)
+    # The header always takes the whole first line, so read_header never touches the series
+    header = chart_file_header(charts, metadata, include_raw)
+    f.write(JSON_HEADER_PREFIX + json.dumps(header, ensure_ascii=False, default=_json_default) + ",\n")
+    text = text[1:].lstrip("\n")
+    pos = 0
+    for match in re.finditer(f'"{token}:([^"]+)"', text):
+        f.write(text[pos : match.start()])
+        _write_json_series(f, series[match.group(1)])
+        pos = match.end()
+    f.write(text[pos:])
+
+
+def save_charts_json(
+    charts: List[ChartData],
+    path: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    merged: bool = False,
+    include_raw: bool = True,
+    indent: Optional[int] = None,
+    atomic: bool = True,
+) -> None:
+    """Stream charts to a .json chart file (see write_charts_json), atomically by default."""
+    with _replace_on_success(Path(path), atomic) as target:
+        with open(target, "w", encoding="utf-8") as f:
+            write_charts_json(f, charts, metadata=metadata, merged=merged, include_raw=include_raw, indent=indent)
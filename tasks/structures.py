@@ -2,9 +2,15 @@ from typing import List, Callable, Optional, Any, Dict
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import math
+import os
+import uuid
 import json
-import tempfile
 from pathlib import Path
+import logging
+import numpy as np
+from .columns import ArrayColumn, SpillColumn, record_dtype
+from .pyramid import SeriesPyramid
+from config import Config
 
 @dataclass
 class AxisMeta:
@@ -16,11 +22,16 @@ class AxisMeta:
     unit: str = field(default="", metadata={"help": "Unit string (e.g. 'V')."})
     scale: str = field(default="linear", metadata={"help": "Scale: 'linear' or 'log'."})
     description: str = field(default="", metadata={"help": "Optional longer description."})
+    attrs: Dict[str, Any] = field(default_factory=dict, metadata={"help": "Extra JSON metadata saved with the chart (e.g. the scale of raw instrument codes)."})
 
 
 @dataclass
 class Series:
-    """Pair of raw/processed series with axis metadata."""
+    """Pair of raw/processed series with axis metadata.
+
+    raw and processed are plain lists by default; any list-like container with
+    append/extend/len/slicing (e.g. ArrayColumn) can be used instead.
+    """
     raw: List[Any] = field(default_factory=list, metadata={"help": "Raw samples for this series."})
     processed: List[float] = field(default_factory=list, metadata={"help": "Processed samples for this series."})
     meta: AxisMeta = field(default_factory=AxisMeta, metadata={"help": "Axis metadata."})
@@ -48,6 +59,20 @@ class ChartData_Config:
         Per-chart backup frequency in seconds.
     backup_path: Optional[str]
         Per-chart backup directory. If None use global path.
+    columnar: bool
+        If True, series created by ChartData are ArrayColumn buffers (float64)
+        instead of Python lists. Raw samples must then be scalars.
+    stream_to_disk: bool
+        If True, series created by ChartData are SpillColumn containers: older
+        samples are spilled to a chunk store under the backups directory and only
+        the last stream_tail_samples stay in memory. Takes precedence over columnar.
+    offload_formula: bool
+        If True, formulas are evaluated in the DataProcessor process pool
+        (requires processor_workers > 0 and a picklable, module-level formula).
+    codec: str
+        Compression codec for the series in binary chart files ("", "none",
+        "auto", "zlib", "zstd", "delta-shuffle-zlib", "delta-shuffle-zstd").
+        Empty uses the chart_codec config key; "auto" picks by dtype and a sample of the data.
     custom_type: str
         Optional chart type/category.
     schema_version: int
@@ -60,11 +85,129 @@ class ChartData_Config:
     sample_points_x: int = field(default=0, metadata={"help": "Max X points to keep (0=unlimited)."})
     sample_points_y: int = field(default=0, metadata={"help": "Max Y points to keep (0=unlimited)."})
     refresh_all: bool = field(default=False, metadata={"help": "If True, request full UI refresh when this chart updates."})
+    columnar: bool = field(default=False, metadata={"help": "Store series in compact float64 ArrayColumn buffers."})
+    stream_to_disk: bool = field(default=False, metadata={"help": "Spill older samples to disk, keeping a bounded tail in memory."})
+    offload_formula: bool = field(default=False, metadata={"help": "Evaluate formulas in worker processes when a process pool is configured."})
+    codec: str = field(default="", metadata={"help": "Series codec for binary chart files (empty = chart_codec config)."})
     custom_type: str = field(default="", metadata={"help": "Chart type or category."})
     schema_version: int = field(default=1, metadata={"help": "Config schema version."})
 
 
 
+logger = logging.getLogger(__name__)
+
+# Version of the chart dict layout written by ChartData; older dicts are upgraded on load.
+CHART_SCHEMA_VERSION = 2
+
+
+def _migrate_v1(data: Dict[str, Any]) -> Dict[str, Any]:
+    """v1 -> v2: config may be missing or not a dict, axis meta may be missing."""
+    data = dict(data)
+    if not isinstance(data.get("config"), dict):
+        data["config"] = {}
+    for axis in ("x", "y"):
+        series = dict(data.get(axis) or {})
+        series.setdefault("meta", {})
+        data[axis] = series
+    data["schema_version"] = 2
+    return data
+
+
+# schema_version -> upgrader to the next version
+CHART_MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    1: _migrate_v1,
+}
+
+
+def migrate_chart_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Upgrade a chart dict (or chart header) to CHART_SCHEMA_VERSION.
+
+    Migrations run lazily when a file is read; files on disk are never rewritten.
+    """
+    version = data.get("schema_version", 1)
+    while version < CHART_SCHEMA_VERSION:
+        upgrade = CHART_MIGRATIONS.get(version)
+        if upgrade is None:
+            raise ValueError(f"No migration from chart schema version {version}.")
+        data = upgrade(data)
+        version = data["schema_version"]
+    if version > CHART_SCHEMA_VERSION:
+        logger.warning(f"Chart {data.get('name')!r} uses schema version {version}, newer than {CHART_SCHEMA_VERSION}.")
+    return data
+
+
+def to_plain_list(values: Any) -> List[Any]:
+    """Convert a series container (list, ArrayColumn, ndarray) to a plain Python list."""
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return list(values)
+
+
+def _columnar_or_list(values: Any) -> Any:
+    """Load values into an ArrayColumn, keeping a list for ragged or non-numeric data."""
+    try:
+        return ArrayColumn(values)
+    except (ValueError, TypeError):
+        return list(values)
+
+
+def record_fields(values: Any) -> Optional[List[List[str]]]:
+    """[[name, dtype], ...] of a structured (record) series, None for any other container."""
+    dtype = getattr(values, "dtype", None)
+    if dtype is None or not dtype.names:
+        return None
+    return [[name, dtype.fields[name][0].str] for name in dtype.names]
+
+
+def _with_fields(values: Any, fields: Optional[List[List[str]]]) -> Any:
+    """Rebuild a record series saved as nested lists (JSON) from its recorded fields."""
+    if not fields or getattr(values, "dtype", None) is not None and values.dtype.names:
+        return values
+    return ArrayColumn(values, dtype=record_dtype(fields))
+
+
+def stream_store_dir() -> str:
+    """Directory holding the chunk stores (.bin) of stream_to_disk charts."""
+    return os.path.join(
+        Config().get("data_charts_path") + "\\" + Config().get("data_charts_relative_bkps"), "stream"
+    )
+
+
+def clean_stream_store() -> int:
+    """Delete chunk stores left behind by runs that never saved their charts (crash, kill).
+
+    Call at startup, before any task creates a streamed chart. The samples of
+    such runs remain available in their backup journals. Returns the number of
+    files removed.
+    """
+    store = Path(stream_store_dir())
+    if not store.is_dir():
+        return 0
+    removed = 0
+    for path in store.glob("*.bin"):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError as e:
+            logger.warning(f"Could not remove orphan chunk store {path}: {e}")
+    if removed:
+        logger.info(f"Removed {removed} orphan chunk store file(s) from {store}.")
+    return removed
+
+
+def evaluate_vector_formula(formula: Callable[[np.ndarray], Any], block: Any) -> List[Any]:
+    """Evaluate a vectorised formula over a block of raw samples.
+
+    The block is stacked into a single NumPy array (e.g. shape (n,) for scalar
+    samples or (n, 2, points) for [t, V] waveforms) and passed to the formula in
+    one call. The result is flattened into a plain list of processed values.
+    """
+    if len(block) == 0:
+        return []
+    result = formula(np.asarray(block))
+    return np.asarray(result).ravel().tolist()
+
+
 class ChartData:
     """
     ChartData_ - runtime object with helpers.
@@ -83,18 +226,24 @@ class ChartData:
         Prepopulated series; if omitted fresh series are created.
     math_formula_x, math_formula_y: Optional[Callable]
         Runtime-only formulas; not serialized.
+    vector_formula_x, vector_formula_y: Optional[Callable]
+        Runtime-only vectorised formulas; they receive a NumPy block of raw
+        samples and return one processed value per sample. When set they take
+        precedence over math_formula_x/y. Not serialized.
     """
 
     def __init__(
         self,
         name: str = "Custom Chart",
-        schema_version: int = 1,
+        schema_version: int = CHART_SCHEMA_VERSION,
         created_at: Optional[str] = None,
         config: Optional[ChartData_Config] = None,
         x_series: Optional[Series] = None,
         y_series: Optional[Series] = None,
         math_formula_x: Optional[Callable[[Any], float]] = None,
         math_formula_y: Optional[Callable[[Any], Any]] = None,
+        vector_formula_x: Optional[Callable[[np.ndarray], Any]] = None,
+        vector_formula_y: Optional[Callable[[np.ndarray], Any]] = None,
     ):
         self.name = name
         self.schema_version = schema_version
@@ -104,12 +253,52 @@ class ChartData:
         self.config = config if config is not None else ChartData_Config()
 
         # Data section - create new Series/AxisMeta instances per object
-        self.x_series = x_series if x_series is not None else Series(meta=AxisMeta(label="X-axis"))
-        self.y_series = y_series if y_series is not None else Series(meta=AxisMeta(label="Y-axis"))
+        self.x_series = x_series if x_series is not None else self._new_series("X-axis")
+        self.y_series = y_series if y_series is not None else self._new_series("Y-axis")
 
         # runtime-only callables
         self.math_formula_x = math_formula_x
         self.math_formula_y = math_formula_y
+        self.vector_formula_x = vector_formula_x
+        self.vector_formula_y = vector_formula_y
+
+        # min/max/mean summaries of the processed series, kept up to date by the DataProcessor
+        self.pyramids: Dict[str, SeriesPyramid] = {"x": SeriesPyramid(), "y": SeriesPyramid()}
+
+    def _new_series(self, label: str) -> Series:
+        """Create an empty series honouring the columnar/stream_to_disk config."""
+        if self.config.stream_to_disk:
+            store = stream_store_dir()
+            stem = f"{self.name}_{uuid.uuid4().hex[:8]}_{label[0].lower()}"
+            tail = Config().get("stream_tail_samples", 1024)
+            return Series(
+                raw=SpillColumn(os.path.join(store, f"{stem}_raw.bin"), tail=tail),
+                processed=SpillColumn(os.path.join(store, f"{stem}_processed.bin"), tail=tail),
+                meta=AxisMeta(label=label),
+            )
+        if self.config.columnar:
+            return Series(raw=ArrayColumn(), processed=ArrayColumn(), meta=AxisMeta(label=label))
+        return Series(meta=AxisMeta(label=label))
+
+    def update_pyramids(self) -> None:
+        """Extend the downsampling pyramids with the processed samples added since the last call."""
+        for axis, series in (("x", self.x_series), ("y", self.y_series)):
+            self.pyramids[axis].update(series.processed, reset=self.config.refresh_all)
+
+    def envelope(self, n: int, start: int = 0, stop: Optional[int] = None, axis: str = "y") -> Dict[str, np.ndarray]:
+        """About n min/max/mean buckets of the processed series covering samples [start, stop).
+
+        See SeriesPyramid.envelope; the pyramid is brought up to date first.
+        """
+        series = self.x_series if axis == "x" else self.y_series
+        return self.pyramids[axis].envelope(series.processed, n, start, stop)
+
+    def release_store(self) -> None:
+        """Delete the on-disk chunk stores of a streamed chart (once it has been saved)."""
+        for series in (self.x_series, self.y_series):
+            for values in (series.raw, series.processed):
+                if isinstance(values, SpillColumn):
+                    values.discard()
 
     def __repr__(self):
         return (
@@ -117,18 +306,25 @@ class ChartData:
             f"created_at={self.created_at!r})"
         )
     def compute(self) -> None:
-        """Apply math formulas (if present) to the raw series and populate processed series."""
-        if self.math_formula_x is not None:
+        """Apply math formulas (if present) to the raw series and populate processed series.
+
+        Vectorised formulas are preferred and evaluated once over the whole raw block.
+        """
+        if self.vector_formula_x is not None:
+            self.x_series.processed = evaluate_vector_formula(self.vector_formula_x, self.x_series.raw)
+        elif self.math_formula_x is not None:
             self.x_series.processed = [self.math_formula_x(v) for v in self.x_series.raw]
-        if self.math_formula_y is not None:
+        if self.vector_formula_y is not None:
+            self.y_series.processed = evaluate_vector_formula(self.vector_formula_y, self.y_series.raw)
+        elif self.math_formula_y is not None:
             self.y_series.processed = [self.math_formula_y(v) for v in self.y_series.raw]
         if self.config.pop_raw:
             self.x_series.raw.clear()
             self.y_series.raw.clear()
 
-    def to_dict(self, include_raw: bool = True) -> Dict[str, Any]:
-        """Return a JSON-serializable dict containing only plain data (no callables or objects)."""
-        d: Dict[str, Any] = {
+    def header_dict(self) -> Dict[str, Any]:
+        """Return the chart metadata (name, config, axis meta) without any series data."""
+        header = {
             "schema_version": self.schema_version,
             "name": self.name,
             "created_at": self.created_at,
@@ -138,9 +334,9 @@ class ChartData:
                 "sample_points_y": self.config.sample_points_y,
                 "refresh_all": getattr(self.config, "refresh_all", False),
                 "custom_type": self.config.custom_type,
+                "columnar": self.config.columnar,
             },
             "x": {
-                "processed": list(self.x_series.processed),
                 "meta": {
                     "label": self.x_series.meta.label,
                     "unit": self.x_series.meta.unit,
@@ -148,7 +344,6 @@ class ChartData:
                 },
             },
             "y": {
-                "processed": list(self.y_series.processed),
                 "meta": {
                     "label": self.y_series.meta.label,
                     "unit": self.y_series.meta.unit,
@@ -156,13 +351,27 @@ class ChartData:
                 },
             },
         }
+        for axis, series in (("x", self.x_series), ("y", self.y_series)):
+            if series.meta.attrs:
+                header[axis]["meta"]["attrs"] = dict(series.meta.attrs)
+            fields = record_fields(series.raw)
+            if fields:
+                header[axis]["raw_fields"] = fields
+        return header
+
+    def to_dict(self, include_raw: bool = True) -> Dict[str, Any]:
+        """Return a JSON-serializable dict containing only plain data (no callables or objects)."""
+        d: Dict[str, Any] = self.header_dict()
+        d["x"]["processed"] = to_plain_list(self.x_series.processed)
+        d["y"]["processed"] = to_plain_list(self.y_series.processed)
         if include_raw and self.config.include_raw_on_save:
-            d["x"]["raw"] = list(self.x_series.raw)
-            d["y"]["raw"] = list(self.y_series.raw)
+            d["x"]["raw"] = to_plain_list(self.x_series.raw)
+            d["y"]["raw"] = to_plain_list(self.y_series.raw)
         return d
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ChartData":
+        data = migrate_chart_dict(data)
         cfg = data.get("config", {})
         config = ChartData_Config(
             pop_raw=cfg.get("pop_raw", False),
@@ -170,6 +379,7 @@ class ChartData:
             sample_points_y=cfg.get("sample_points_y", 0),
             refresh_all=cfg.get("refresh_all", False) if isinstance(cfg, dict) else False,
             custom_type=cfg.get("custom_type", ""),
+            columnar=cfg.get("columnar", False),
         )
 
         x = data.get("x", {})
@@ -178,20 +388,31 @@ class ChartData:
         x_meta = x.get("meta", {})
         y_meta = y.get("meta", {})
 
+        container = _columnar_or_list if config.columnar else list
         x_series = Series(
-            raw=list(x.get("raw", [])),
-            processed=list(x.get("processed", [])),
-            meta=AxisMeta(label=x_meta.get("label", ""), unit=x_meta.get("unit", ""), scale=x_meta.get("scale", "linear")),
+            raw=_with_fields(container(x.get("raw", [])), x.get("raw_fields")),
+            processed=container(x.get("processed", [])),
+            meta=AxisMeta(
+                label=x_meta.get("label", ""),
+                unit=x_meta.get("unit", ""),
+                scale=x_meta.get("scale", "linear"),
+                attrs=dict(x_meta.get("attrs", {})),
+            ),
         )
         y_series = Series(
-            raw=list(y.get("raw", [])),
-            processed=list(y.get("processed", [])),
-            meta=AxisMeta(label=y_meta.get("label", ""), unit=y_meta.get("unit", ""), scale=y_meta.get("scale", "linear")),
+            raw=_with_fields(container(y.get("raw", [])), y.get("raw_fields")),
+            processed=container(y.get("processed", [])),
+            meta=AxisMeta(
+                label=y_meta.get("label", ""),
+                unit=y_meta.get("unit", ""),
+                scale=y_meta.get("scale", "linear"),
+                attrs=dict(y_meta.get("attrs", {})),
+            ),
         )
 
         obj = cls(
             name=data.get("name", "Custom Chart"),
-            schema_version=data.get("schema_version", 1),
+            schema_version=data.get("schema_version", CHART_SCHEMA_VERSION),
             created_at=data.get("created_at"),
             config=config,
             x_series=x_series,
@@ -199,29 +420,74 @@ class ChartData:
         )
         return obj
 
-    def save_json_atomic(self, path: str, include_raw: bool = True) -> None:
-        """Write the dict to a temporary file then atomically replace the destination.
+    def save_json_atomic(self, path: str, include_raw: bool = True, indent: Optional[int] = None) -> None:
+        """Stream the chart to a temporary file then atomically replace the destination.
 
-        This avoids partially written files if the process is interrupted.
+        This avoids partially written files if the process is interrupted. Series
+        are written straight from their buffers (see tasks.storage.write_charts_json);
+        indent defaults to the chart_json_indent config key (None = compact).
         """
-        p = Path(path)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        tmp = None
-        try:
-            if self.config.atomic_save:
-                with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8") as tf:
-                    json.dump(self.to_dict(include_raw=include_raw), tf, ensure_ascii=False, indent=4)
-                    tmp = Path(tf.name)
-                tmp.replace(p)
-            else:
-                p.write_text(json.dumps(self.to_dict(include_raw=include_raw), ensure_ascii=False, indent=4), encoding="utf-8")
-        finally:
-            # best-effort cleanup
-            try:
-                if tmp is not None and tmp.exists():
-                    tmp.unlink(missing_ok=True)
-            except Exception:
-                pass
+        from .storage import save_charts_json
+
+        if indent is None:
+            indent = Config().get("chart_json_indent", None)
+        save_charts_json([self], path, include_raw=include_raw, indent=indent, atomic=self.config.atomic_save)
+
+    def save_npz_atomic(self, path: str, include_raw: bool = True) -> None:
+        """Write the chart to a binary .npz chart file (see tasks.storage)."""
+        from .storage import save_charts_npz
+
+        save_charts_npz([self], path, include_raw=include_raw, atomic=self.config.atomic_save)
+
+    @classmethod
+    def open(cls, path: str, lazy: bool = True) -> List["ChartData"]:
+        """Open a chart file, memory-mapping the series of .npz files when lazy.
+
+        Only the metadata is read up front; series are np.memmap views that load
+        pages on access. JSON files are always loaded in full (see load_file),
+        as are backup journals (.jsonl, see ChartJournal.load).
+        """
+        suffix = Path(path).suffix.lower()
+        if suffix == ".npz":
+            from .storage import load_charts_npz
+
+            charts, _ = load_charts_npz(path, lazy=lazy)
+            return charts
+        if suffix == ".jsonl":
+            from .journal import ChartJournal
+
+            chart, _, _ = ChartJournal.load(path)
+            return [chart]
+        return cls.load_file(path)
+
+    @classmethod
+    def load_file(cls, path: str) -> List["ChartData"]:
+        """Load every chart stored in a .json (single or merged) or .npz chart file."""
+        if Path(path).suffix.lower() == ".npz":
+            from .storage import load_charts_npz
+
+            charts, _ = load_charts_npz(path)
+            return charts
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "charts" in data:
+            return [cls.from_dict(d) for d in data["charts"]]
+        return [cls.from_dict(data)]
+
+    def field(self, name: str, axis: str = "y") -> np.ndarray:
+        """Return one named field of a record (structured) raw series as an array.
+
+        Raises
+        ------
+        KeyError
+            If the raw series has no field with that name.
+        """
+        raw = (self.x_series if axis == "x" else self.y_series).raw
+        fields = record_fields(raw)
+        if not fields or name not in raw.dtype.names:
+            raise KeyError(f"Chart {self.name} has no raw {axis} field '{name}'.")
+        return np.asarray(raw)[name]
+
     # Switch: 0 -> X axis, 1 -> Y axis 2-> Total
     def get_length(self, switch: int) -> int:
         """
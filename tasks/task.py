@@ -2,9 +2,13 @@ from math import e
 from easy_scpi import Instrument
 from config import Config
 from typing import List, Callable, Dict, Any, Optional
-from threading import Thread, Event, Lock, RLock
+from threading import Thread, Event, Lock, RLock, current_thread
+from enum import Enum
 from instruments import Instrument_Entry
 from .structures import ChartData
+from .journal import ChartJournal
+from .storage import save_charts_npz, save_charts_json
+from .catalogue import ChartCatalogue
 from .helper import str_to_bool
 from connections import Connections
 import json
@@ -18,6 +22,15 @@ import atexit
 logger = logging.getLogger(__name__)
 
 
+class TaskState(Enum):
+    """Lifecycle of a task run. A stopped run goes STOPPING -> FLUSHING -> SAVED in the background."""
+    IDLE = "idle"
+    RUNNING = "running"
+    STOPPING = "stopping"
+    FLUSHING = "flushing"
+    SAVED = "saved"
+
+
 class Task:
     """
     Represents a single task that can be run in a separate thread.
@@ -47,13 +60,26 @@ class Task:
         self.thread_handle: Optional[Thread] = None
         self.parameters: Dict[str, str] = parameters
         self.running: bool = False
+        self.state: TaskState = TaskState.IDLE
+        self.finaliser: Optional[Thread] = None
+        self._run = 0  # incremented per start(); a finaliser only updates the state of its own run
         self._rlock = RLock()
+        # Resume support: the task function stores its loop position in checkpoint,
+        # which is journaled with every backup and handed back as resume_cursor.
+        self.checkpoint: Dict[str, Any] = {}
+        self.resume_cursor: Dict[str, Any] = {}
+        self.resume_charts: Dict[str, ChartData] = {}
 
     def start(self) -> None:
         """Starts the task's function in a new non-blocking thread if not already running."""
         with self._rlock:
-            if self.thread_handle is None or not self.thread_handle.is_alive() and not self.running:
-                self.exit_flag.clear()
+            if self.state == TaskState.STOPPING:
+                logger.warning(f"Task {self.name} is still stopping its previous run.")
+            elif self.thread_handle is None or not self.thread_handle.is_alive() and not self.running:
+                # Fresh event per run: a previous run still winding down keeps its own (set) flag
+                self.exit_flag = Event()
+                self.checkpoint = dict(self.resume_cursor)
+                self._run += 1
                 # Task thread
                 self.thread_handle = Thread(
                     target=self.function, args=(self,)
@@ -64,6 +90,7 @@ class Task:
                 self.data_processor_obj: Optional[DataProcessor] = DataProcessor(self)
                 self.data_processor = self.data_processor_obj.start()
                 self.running = True
+                self.state = TaskState.RUNNING
 
                 logger.info(f"Task {self.name} started.")
             else:
@@ -75,45 +102,184 @@ class Task:
             self.stop()
 
     def stop(self) -> None:
-        """Signals the task to stop and waits for the thread to finish."""
+        """Signals the task to stop and waits until its data has been saved."""
+        # stop_async clears thread_handle: keep it to detect a call from the task thread,
+        # which the finaliser joins (waiting there would deadlock)
+        task_thread = self.thread_handle
+        finaliser = self.stop_async()
+        if finaliser is not None and finaliser is not current_thread() and current_thread() is not task_thread:
+            finaliser.join()
+
+    def stop_async(self) -> Optional[Thread]:
+        """Signals the task to stop and finalises the run in a background thread.
+
+        The collected charts are detached from the task, so a new run can start
+        while the previous data is still being written. Progress is visible in
+        ``state`` (STOPPING -> FLUSHING -> SAVED). Returns the finaliser thread,
+        or the previous one if the task was not running.
+        """
+        with self._rlock:
+            if not self.running:
+                return self.finaliser
+            self.exit_flag.set()
+            self.running = False
+            self.state = TaskState.STOPPING
+            task_thread = self.thread_handle
+            processor_thread = getattr(self, "data_processor", None)
+            charts = self.data
+            self.data = []
+            self.thread_handle = None
+            self.resume_cursor = {}
+            self.resume_charts = {}
+            self.finaliser = Thread(
+                target=self._finalise,
+                args=(task_thread, processor_thread, charts, self.custom_alias, self._run),
+                name=f"{self.name} finaliser",
+            )
+            self.finaliser.start()
+            return self.finaliser
+
+    def _finalise(
+        self,
+        task_thread: Optional[Thread],
+        processor_thread: Optional[Thread],
+        charts: List[ChartData],
+        custom_alias: str,
+        run: int,
+    ) -> None:
+        """Waits for the task and processor threads, then saves the detached charts.
+
+        The state is only updated while run is still the latest run, so a run
+        started in the meantime is never reported as FLUSHING/SAVED.
+        """
+        for thread in (task_thread, processor_thread):
+            if thread is not None and thread is not current_thread() and thread.is_alive():
+                thread.join()
+        logger.info(f"Task {self.name} stopped.")
+        self._set_run_state(run, TaskState.FLUSHING)
+        if self._save_chart_data(charts, custom_alias):
+            # Streamed charts keep their chunk stores until the data is safely saved
+            for chart in charts:
+                chart.release_store()
+        charts.clear()
+        self._set_run_state(run, TaskState.SAVED)
+
+    def _set_run_state(self, run: int, state: TaskState) -> None:
         with self._rlock:
-            if self.thread_handle and self.thread_handle.is_alive():
-                self.exit_flag.set()
-                self.thread_handle.join()
-                logger.info(f"Task {self.name} stopped.")
-            if  self.running:
-                self.thread_handle = None
-                self._save_chart_data()
-                self.data.clear()
-                self.running = False
+            if self._run == run:
+                self.state = state
+
+    def restore_chart(self, chart: ChartData, samples: Optional[int] = None) -> ChartData:
+        """Fills a freshly created chart with the data recovered from a checkpoint, if any.
+
+        Task functions call this after building their charts; configuration and
+        formulas of the new chart are kept, only raw/processed samples are restored.
+
+        The backup cursor is captured before the chart data, so a journal may
+        hold samples appended after the last cursor update. samples is the
+        number of samples the resume cursor accounts for (e.g. its meas_idx):
+        anything beyond it is dropped, since the task measures it again.
+        """
+        recovered = self.resume_charts.get(chart.name)
+        if recovered is not None:
+            stop = samples
+            for target, source in ((chart.x_series, recovered.x_series), (chart.y_series, recovered.y_series)):
+                target.raw.extend(source.raw[:stop])
+                target.processed.extend(source.processed[:stop])
+            dropped = len(recovered.y_series.raw) - len(chart.y_series.raw)
+            logger.info(
+                f"Restored {len(chart.y_series.raw)} raw samples into chart {chart.name}"
+                + (f" ({dropped} past the resume cursor dropped)." if dropped > 0 else ".")
+            )
+        return chart
+
+    def find_checkpoints(self) -> Dict[str, List[str]]:
+        """Returns the backup journals of this task grouped by run timestamp."""
+        backups_path = Config().get("data_charts_path") + "\\" + Config().get("data_charts_relative_bkps")
+        runs: Dict[str, List[str]] = {}
+        if not os.path.isdir(backups_path):
+            return runs
+        for file_name in os.listdir(backups_path):
+            if not (file_name.startswith("BKP_") and file_name.endswith(".jsonl")):
+                continue
+            full_path = os.path.join(backups_path, file_name)
+            try:
+                metadata = ChartJournal.read_metadata(full_path)
+            except Exception as e:
+                logger.warning(f"Unreadable backup journal {full_path}: {e}")
+                continue
+            if metadata.get("task_name") == self.name:
+                runs.setdefault(metadata.get("run", ""), []).append(full_path)
+        return runs
+
+    def load_checkpoint(self, run: Optional[str] = None) -> bool:
+        """Loads the charts and resume cursor of a previous run (latest if run is None)."""
+        runs = self.find_checkpoints()
+        if not runs:
+            logger.warning(f"No checkpoint found for task {self.name}.")
+            return False
+        run = run if run is not None else max(runs)
+        if run not in runs:
+            logger.warning(f"Checkpoint {run} not found for task {self.name}.")
+            return False
+        resume_charts: Dict[str, ChartData] = {}
+        resume_cursor: Dict[str, Any] = {}
+        for journal_path in runs[run]:
+            try:
+                chart, metadata, extra = ChartJournal.load(journal_path)
+            except Exception as e:
+                logger.error(f"Failed to load backup journal {journal_path}: {e}")
+                return False
+            resume_charts[chart.name] = chart
+            resume_cursor = extra or resume_cursor
+            self.custom_alias = metadata.get("custom_alias", self.custom_alias)
+        self.resume_charts = resume_charts
+        self.resume_cursor = resume_cursor
+        logger.info(f"Task {self.name} will resume from run {run} at {resume_cursor}.")
+        return True
         
-    def _save_chart_data(self) -> None:
-        """Saves collected chart data to files."""
-        if self.custom_alias == "":
-            self.custom_alias = "anonymous"
+    def _save_chart_data(self, charts: Optional[List[ChartData]] = None, custom_alias: Optional[str] = None) -> bool:
+        """Saves collected chart data to files (defaults to the task's current charts and alias).
+
+        Returns True when every file was written.
+        """
+        charts = charts if charts is not None else self.data
+        custom_alias = custom_alias if custom_alias is not None else self.custom_alias
+        if custom_alias == "":
+            custom_alias = "anonymous"
+        file_format = str(Config().get("chart_file_format", "json")).lower()
+        if file_format not in ("json", "npz"):
+            logger.warning(f"Unknown chart_file_format '{file_format}', falling back to json.")
+            file_format = "json"
+        metadata = {
+            "task_name": self.name,
+            "custom_alias": custom_alias,
+            "timestamp": datetime.datetime.now().isoformat(),
+        }
         try:
             if not str_to_bool(self.parameters.get("merge_chart_files", "false").lower()):
-                for chart in self.data:
-                    file_name = f"{chart.name}_{self.custom_alias}_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+                for chart in charts:
+                    file_name = f"{chart.name}_{custom_alias}_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{file_format}"
                     file_path = os.path.join(Config().get("data_charts_path"), file_name)
-                    chart.save_json_atomic(file_path)
+                    if file_format == "npz":
+                        chart.save_npz_atomic(file_path)
+                    else:
+                        chart.save_json_atomic(file_path)
+                    ChartCatalogue().record(file_path, [chart], metadata)
                     logger.info(f"Chart data saved to {file_path}.")
             else:
-                merged_data = {
-                    "charts": [chart.to_dict() for chart in self.data],
-                    "metadata": {
-                        "task_name": self.name,
-                        "custom_alias": self.custom_alias,
-                        "timestamp": datetime.datetime.now().isoformat(),
-                    },
-                }
-                file_name = f"merged_charts_{self.custom_alias}_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+                file_name = f"merged_charts_{custom_alias}_{datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.{file_format}"
                 file_path = os.path.join(Config().get("data_charts_path"), file_name)
-                with open(file_path, "w") as f:
-                    json.dump(merged_data, f, indent=4)
+                if file_format == "npz":
+                    save_charts_npz(charts, file_path, metadata=metadata)
+                else:
+                    save_charts_json(charts, file_path, metadata=metadata, merged=True, indent=Config().get("chart_json_indent", None))
+                ChartCatalogue().record(file_path, charts, metadata)
                 logger.info(f"Merged chart data saved to {file_path}.")
         except Exception as e:
             logger.error(f"Failed to save merged chart data: {e}")
+            return False
+        return True
 
 
     def has_instruments(self) -> bool:
@@ -174,7 +340,10 @@ class Tasks:
     def run_task(self, name: str) -> None:
         """Runs a task by its name if no other task is currently running."""
         with self._lock:
-            if self._is_running is None:
+            stopping = [tsk.name for tsk in self._tasks_list if tsk.state == TaskState.STOPPING]
+            if stopping:
+                logger.warning(f"Task(s) {stopping} still stopping. Aborting launch of task {name}.")
+            elif self._is_running is None:
                 for task in self._tasks_list:
                     if task.name == name and task.has_instruments():
                         task.start()
@@ -188,13 +357,46 @@ class Tasks:
                     f"Aborting launch of task {name}."
                 )
 
-    def stop_task(self) -> None:
-        """Stops the currently running task, if any."""
+    def resume_task(self, name: str, run: Optional[str] = None) -> None:
+        """Runs a task resuming from its last backup checkpoint (or the given run)."""
+        if self._is_running is not None:
+            logger.warning(
+                f"A task is already running ({self._is_running.name}). "
+                f"Aborting resume of task {name}."
+            )
+            return
+        task = self.get_task(name)
+        if task is None:
+            logger.warning(f"Task {name} not found.")
+            return
+        if task.load_checkpoint(run):
+            self.run_task(name)
+            if self._is_running is not task:
+                task.resume_cursor = {}
+                task.resume_charts = {}
+
+    def stop_task(self, wait: bool = False) -> None:
+        """Stops the currently running task, if any.
+
+        By default returns immediately; the run is finalised (joined and saved) in the
+        background and a new task can be started right away. Set wait to block until
+        the data has been saved.
+        """
         with self._lock:
-            if self._is_running is not None:
-                self._is_running.stop()
-                self._is_running = None
-                logger.info("Task stopped.")
+            task = self._is_running
+            self._is_running = None
+        if task is not None:
+            finaliser = task.stop_async()
+            logger.info(f"Stop requested for task {task.name}.")
+            if wait and finaliser is not None and finaliser is not current_thread():
+                finaliser.join()
+
+    def finalising_tasks(self) -> List[Task]:
+        """Returns the tasks whose previous run is still being stopped or saved."""
+        return [
+            tsk for tsk in self._tasks_list
+            if tsk.state in (TaskState.STOPPING, TaskState.FLUSHING)
+        ]
 
     def check(self) -> None:
 
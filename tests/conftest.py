@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+import pytest
+
+# Modules import each other from the repository root (e.g. "from config import Config")
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+from config import Config  # noqa: E402 (needs the root on sys.path)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point data_charts_path (chart files, backups, catalogue, chunk stores) at a temporary directory."""
+    monkeypatch.setitem(Config()._data, "data_charts_path", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,37 @@
+from tasks import ChartCatalogue, ChartData, ChartJournal
+
+
+def test_files_are_paged_and_counted(data_dir):
+    catalogue = ChartCatalogue()
+    chart = ChartData(name="R")
+    chart.y_series.processed.extend([1.0, 2.0])
+    for i in range(1205):
+        path = data_dir / f"R_{i:04d}.json"
+        path.touch()
+        catalogue.record(str(path), [chart], {"task_name": "T", "timestamp": f"{i:04d}"})
+
+    assert catalogue.count() == 1205
+    assert catalogue.count(search="R_000") == 10
+    pages = [catalogue.files(limit=500, offset=offset) for offset in (0, 500, 1000)]
+    paths = [row["path"] for page in pages for row in page]
+    assert [len(page) for page in pages] == [500, 500, 205]
+    assert len(set(paths)) == 1205
+    assert pages[0][0]["file_name"] == "R_1204.json"  # newest first
+    assert pages[0][0]["points"] == 2
+
+
+def test_backup_journals_are_listed_by_kind(data_dir):
+    catalogue = ChartCatalogue()
+    chart = ChartData(name="R")
+    chart.y_series.processed.extend([1.0, 2.0, 3.0])
+    chart.save_json_atomic(str(data_dir / "R.json"))
+    journal = ChartJournal(str(data_dir / "BKP_R.jsonl"), {"task_name": "T"})
+    journal.append(chart)
+    catalogue.scan()
+
+    assert [row["file_name"] for row in catalogue.files()] == ["R.json"]
+    backups = catalogue.files(kind="backup")
+    assert [row["file_name"] for row in backups] == ["BKP_R.jsonl"]
+    assert catalogue.count(kind=None) == 2 and catalogue.count(kind=None, task_name="T") == 1
+    opened = ChartData.open(backups[0]["path"])
+    assert [c.name for c in opened] == ["R"] and list(opened[0].y_series.processed) == [1.0, 2.0, 3.0]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from tasks import ChartData, ChartData_Config
+from tasks.codecs import CODEC_BLOCK, SeriesEncoder, choose_codec, decode_array, encode_array, zstandard
+from tasks.storage import load_charts_npz, read_npz_header, save_charts_npz
+
+AVAILABLE = [c for c in ("zlib", "zstd", "delta-shuffle-zlib", "delta-shuffle-zstd") if zstandard is not None or not c.endswith("zstd")]
+rng = np.random.default_rng(0)
+
+
+def noisy_waveforms(n=50, points=2000):
+    t = np.linspace(0, 1, points)
+    return np.sin(2 * np.pi * 5 * t) + rng.normal(0, 0.05, (n, points))
+
+
+@pytest.mark.parametrize("codec", AVAILABLE)
+@pytest.mark.parametrize(
+    "data",
+    [
+        noisy_waveforms(),
+        rng.integers(0, 256, (30, 2000)).astype(np.uint8),
+        np.arange(-5000, 5000, dtype=np.int16),
+        (rng.normal(size=300) + 1j * rng.normal(size=300)),
+        np.empty(0),
+    ],
+    ids=["float-waveforms", "uint8-codes", "int16", "complex", "empty"],
+)
+def test_roundtrip(codec, data):
+    payload = encode_array(data, codec)
+    assert np.array_equal(decode_array(payload, codec, data.dtype, data.shape), data)
+
+
+def test_streamed_encode_matches_one_shot():
+    data = rng.normal(size=3 * CODEC_BLOCK + 17)
+    encoder = SeriesEncoder("delta-shuffle-zlib", data.dtype)
+    streamed = b"".join(encoder.encode(block) for block in np.array_split(data, 7)) + encoder.flush()
+    assert streamed == encode_array(data, "delta-shuffle-zlib")
+
+
+def test_auto_prefers_delta_for_integer_codes():
+    assert choose_codec(np.dtype(np.uint8), "auto").startswith("delta-shuffle")
+    assert not choose_codec(np.dtype("U8"), "auto").startswith("delta-shuffle")
+
+
+def test_auto_never_worse_than_plain_compression_on_floats():
+    compressor = choose_codec(np.dtype(np.float64), "zstd" if zstandard is not None else "zlib")
+    for data in (noisy_waveforms(), np.cumsum(rng.normal(size=20000)), np.arange(20000) * 1e-6):
+        codec = choose_codec(data.dtype, "auto", sample=data)
+        assert len(encode_array(data, codec)) <= len(encode_array(data, compressor))
+    assert choose_codec(np.dtype(np.float64), "auto") == compressor  # no sample to compare
+
+
+def test_streamed_codes_chart_roundtrip(data_dir):
+    chart = ChartData(name="codes", config=ChartData_Config(stream_to_disk=True, codec="auto"))
+    chart.y_series.meta.attrs.update({"YMUlt": 0.04, "YOFf": 0.0})
+    codes = rng.integers(100, 110, (3000, 500)).astype(np.uint8)
+    for row in codes:
+        chart.y_series.raw.append(row)
+    assert chart.y_series.raw.dtype == np.uint8
+
+    path = str(data_dir / "codes.npz")
+    save_charts_npz([chart], path)
+    entry = read_npz_header(path)["charts"][0]["series"]["y/raw"]
+    assert entry["dtype"] == "|u1" and entry["codec"].startswith("delta-shuffle")
+    (loaded,), _ = load_charts_npz(path)
+    assert np.array_equal(np.asarray(loaded.y_series.raw[:]), codes)
+    assert loaded.y_series.meta.attrs == {"YMUlt": 0.04, "YOFf": 0.0}
@@ -0,0 +1,79 @@
+from threading import Thread
+import numpy as np
+import pytest
+from tasks import ArrayColumn, SpillColumn, record_dtype
+
+
+def test_array_column_list_api():
+    col = ArrayColumn([1.0, 2.0], capacity=1)
+    col.append(3.0)
+    col.extend([4.0, 5.0])
+    assert len(col) == 5
+    assert col[-1] == 5.0
+    del col[:2]
+    assert col.tolist() == [3.0, 4.0, 5.0]
+    assert col.pop() == 5.0
+    col.clear()
+    assert len(col) == 0
+
+
+def test_view_survives_growth_and_prefix_delete():
+    col = ArrayColumn(range(4))
+    view = col.view()
+    col.extend(range(1000))
+    del col[:2]
+    assert view.tolist() == [0.0, 1.0, 2.0, 3.0]
+    with pytest.raises(ValueError):
+        view[0] = 9.0
+
+
+def test_record_column():
+    col = ArrayColumn(dtype=record_dtype([("V", "f8"), ("label", "U8")]))
+    col.append([1.5, "a"])
+    col.extend([(2.5, "b")])
+    assert col.view()["V"].tolist() == [1.5, 2.5]
+    assert col.view()["label"].tolist() == ["a", "b"]
+
+
+def test_spill_column_indexing(tmp_path):
+    col = SpillColumn(str(tmp_path / "s.bin"), tail=4)
+    col.extend(range(10))
+    col.append(10)
+    assert col.in_memory < len(col) == 11
+    assert col[:].tolist() == list(range(11))
+    assert col[2:9:3].tolist() == [2.0, 5.0, 8.0]
+    assert float(col[1]) == 1.0 and float(col[-1]) == 10.0
+    del col[:6]
+    assert col.tolist() == [6.0, 7.0, 8.0, 9.0, 10.0]
+    col.discard()
+    assert not (tmp_path / "s.bin").exists()
+
+
+def consume_while_producing(col, total=200_000):
+    """Append total samples from one thread while another deletes the prefix as pop_raw does."""
+    consumed = []
+    done = []
+
+    def produce():
+        for i in range(total):
+            col.append(float(i))
+        done.append(True)
+
+    producer = Thread(target=produce)
+    producer.start()
+    while not done or len(col):
+        length = len(col)
+        consumed.extend(np.asarray(col[:length]).tolist())
+        del col[:length]
+    producer.join()
+    return consumed
+
+
+def test_prefix_delete_is_atomic_with_append():
+    consumed = consume_while_producing(ArrayColumn())
+    assert consumed == [float(i) for i in range(200_000)]
+
+
+def test_spill_prefix_delete_is_atomic_with_append(tmp_path):
+    consumed = consume_while_producing(SpillColumn(str(tmp_path / "c.bin"), tail=256), total=50_000)
+    assert consumed == [float(i) for i in range(50_000)]
@@ -0,0 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor
+from threading import Event
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from tasks.DataProcessor import DataProcessor
+
+
+def double(value):
+    return 2 * value
+
+
+def fail(value):
+    raise ValueError("bad sample")
+
+
+@pytest.fixture
+def processor():
+    processor = DataProcessor(SimpleNamespace(data=[], exit_flag=Event()))
+    processor.executor = ProcessPoolExecutor(max_workers=1)
+    yield processor
+    processor.shutdown_executor()
+
+
+def test_offload_module_formula(processor):
+    target, raw = [], [1.0, 2.0, 3.0]
+    processor.process_series(target, raw, double, None, pop=False, offload=True)
+    assert target == [2.0, 4.0, 6.0]
+    assert not processor._local_formulas
+
+
+def test_unpicklable_formula_runs_locally(processor):
+    target, raw = [], [1.0, 2.0]
+    formula = lambda v: v + 1
+    processor.process_series(target, raw, formula, None, pop=False, offload=True)
+    assert target == [2.0, 3.0]
+    assert formula in processor._local_formulas
+
+
+def test_worker_error_is_raised_not_demoted(processor):
+    with pytest.raises(ValueError):
+        processor.process_series([], [1.0], fail, None, pop=False, offload=True)
+    assert fail not in processor._local_formulas
+
+
+def test_vector_formula_matches_per_sample_formula():
+    processor = DataProcessor(SimpleNamespace(data=[], exit_flag=Event()))
+    waveforms = [[[0.0, 1.0, 2.0], [float(i), float(i) + 1, float(i) + 4]] for i in range(20)]
+    per_sample, vectorised = [], []
+    processor.process_series(per_sample, waveforms, lambda w: max(w[1]) - min(w[1]), None, pop=False)
+    processor.process_series(vectorised, waveforms, None, lambda b: np.ptp(b[:, 1, :], axis=1), pop=False)
+    assert vectorised == per_sample == [4.0] * 20
+    # Only the new samples are evaluated on the next tick
+    waveforms.append([[0.0, 1.0, 2.0], [0.0, 0.0, 1.0]])
+    processor.process_series(vectorised, waveforms, None, lambda b: np.ptp(b[:, 1, :], axis=1), pop=False)
+    assert vectorised[-1] == 1.0 and len(vectorised) == 21
+
+
+def test_ragged_samples_fall_back_to_per_sample_formula():
+    processor = DataProcessor(SimpleNamespace(data=[], exit_flag=Event()))
+    raw = [[1.0, 2.0], [3.0]]
+    target = []
+    processor.process_series(target, raw, sum, lambda b: b.sum(axis=1), pop=True)
+    assert target == [3.0, 3.0] and raw == []
@@ -0,0 +1,61 @@
+import numpy as np
+from config import Config
+from tasks import ChartData, ChartData_Config
+from webapp import make_plotly_figure
+from webapp.decimation import decimate_indices, histogram_bins, lttb_indices, minmax_indices
+
+rng = np.random.default_rng(2)
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    y = rng.normal(size=100_003)
+    y[[10, 55_555]] = [50.0, -50.0]  # isolated spikes
+    keep = minmax_indices(y, 400)
+    assert len(keep) <= 400 and np.all(np.diff(keep) > 0)
+    assert {10, 55_555} <= set(keep.tolist())
+    width = -(-len(y) // 200)
+    for start in range(0, len(y), width):
+        block = keep[(keep >= start) & (keep < start + width)]
+        assert y[block].max() == y[start : start + width].max()
+        assert y[block].min() == y[start : start + width].min()
+
+
+def test_lttb_keeps_endpoints_and_count():
+    x = np.linspace(0, 10, 50_000)
+    keep = lttb_indices(x, np.sin(x), 300)
+    assert len(keep) == 300 and keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_decimation_drops_nan_pairs():
+    y = rng.normal(size=10_000)
+    x = np.arange(10_000.0)
+    y[::3] = np.nan
+    x[1::7] = np.nan
+    for method in ("minmax", "lttb"):
+        keep = decimate_indices(x, y, 500, method)
+        assert len(keep) <= 500
+        assert not np.isnan(y[keep]).any() and not np.isnan(x[keep]).any()
+    short = decimate_indices(None, np.array([1.0, np.nan, 3.0]), 10)
+    assert short.tolist() == [0, 2]
+
+
+def test_histogram_bins_are_capped():
+    values = np.concatenate([rng.normal(size=100_000), [np.nan, np.inf]])
+    counts, edges = histogram_bins(values, bins=5_000, max_bins=100)
+    assert len(counts) == 100 and len(edges) == 101
+    assert counts.sum() == 100_000
+
+
+def test_figure_stays_within_the_point_budget(monkeypatch):
+    for method in ("minmax", "lttb"):
+        monkeypatch.setitem(Config()._data, "chart_decimation", method)
+        chart = ChartData(name="long", config=ChartData_Config(custom_type="line"))
+        chart.y_series.processed.extend(np.cumsum(rng.normal(size=200_000)).tolist())
+        fig = make_plotly_figure(chart, max_points=1_000)
+        assert 0 < len(fig.data[0].y) <= 1_000
+        if method == "minmax":
+            assert max(fig.data[0].y) == max(chart.y_series.processed)
+
+        zoom = make_plotly_figure(chart, max_points=1_000, sample_range=(1_000, 3_000))
+        assert zoom.data[0].x[0] >= 1_000 and zoom.data[0].x[-1] < 3_000
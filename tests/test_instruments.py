@@ -0,0 +1,46 @@
+import pytest
+from addons.instruments.K2000 import K2000
+
+
+class FakeK2000(K2000):
+    """K2000 without a VISA session, rejecting writes mentioning `missing`."""
+
+    def __init__(self, missing=":SENS:CURR:AC:NPLC"):
+        self._SCPI_Instrument__inst = None  # never connected
+        self._SCPI_Instrument__rm = None
+        self.missing = missing
+        self.writes = []
+        self.properties_snapshot = {}
+        self.init_properties()
+
+    def write(self, command):
+        self.writes.append(command)
+        if self.missing in command:
+            raise RuntimeError(f"undefined header: {command}")
+
+
+def test_nplc_skips_functions_the_instrument_lacks():
+    dmm = FakeK2000()
+    dmm.nplc = 10
+    written = [w for w in dmm.writes if ";" not in w and w != "*CLS"]
+    assert ":SENS:VOLT:DC:NPLC 10" in written
+    assert ":SENS:FRES:NPLC 10" in written
+    assert ":SENS:CURR:AC:NPLC 10" in written  # tried, rejected, skipped
+
+
+def test_nplc_must_be_positive():
+    dmm = FakeK2000()
+    with pytest.raises(ValueError):
+        dmm.nplc = 0
+    with pytest.raises(ValueError):
+        dmm.write_properties({"NPLC": -1})
+    assert dmm.writes == []
+
+
+def test_batched_write_falls_back_to_setters():
+    dmm = FakeK2000()
+    dmm.write_properties({"NPLC": 1, "Autozero": True})
+    assert ";" in dmm.writes[0] and dmm.writes[1] == "*CLS"
+    assert ":SENS:RES:NPLC 1" in dmm.writes
+    assert ":SYST:AZER:STAT ON" in dmm.writes
+    assert dmm.properties_snapshot == {"NPLC": 1, "Autozero": True}
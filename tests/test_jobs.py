@@ -0,0 +1,76 @@
+from threading import Barrier, Event, Lock, Thread
+import time
+from webapp import JobRunner, JobState
+
+
+def wait(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while job.active:
+        assert time.time() < deadline, f"job {job.name} did not finish"
+        time.sleep(0.005)
+    return job
+
+
+def test_result_progress_and_failure():
+    def measure(job, value):
+        job.report(0.5, "halfway")
+        return value * 2
+
+    done = wait(JobRunner().submit("test-result", "measure", measure, 21))
+    assert done.state == JobState.DONE and done.result == 42 and done.progress == 1.0
+    assert done.finished is not None  # set before the state, so pollers never see it missing
+    assert done.message == "halfway"
+
+    def broken(job):
+        raise RuntimeError("bus timeout")
+
+    failed = wait(JobRunner().submit("test-result", "broken", broken))
+    assert failed.state == JobState.FAILED and failed.error == "bus timeout"
+    assert JobRunner().jobs("test-result")[:2] == [failed, done]
+
+
+def test_cancel_is_cooperative():
+    started = Event()
+
+    def scan(job):
+        started.set()
+        while not job.cancelled:
+            time.sleep(0.001)
+        return "partial"
+
+    job = JobRunner().submit("test-cancel", "scan", scan)
+    started.wait(5)
+    JobRunner().cancel(job.id)
+    assert wait(job).state == JobState.CANCELLED and job.result == "partial"
+
+
+def test_jobs_sharing_a_key_never_overlap():
+    running, overlaps, lock = [0], [0], Lock()
+
+    def command(job):
+        with lock:
+            running[0] += 1
+            overlaps[0] += running[0] > 1
+        time.sleep(0.002)
+        with lock:
+            running[0] -= 1
+
+    barrier = Barrier(8)
+    submitted = []
+
+    def client():
+        barrier.wait()
+        for _ in range(100):
+            submitted.append(JobRunner().submit("test-bus", "command", command))
+            JobRunner().active("test-bus")
+            JobRunner().jobs()
+
+    threads = [Thread(target=client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for job in submitted:
+        wait(job)
+    assert overlaps[0] == 0
+    assert len({job.id for job in submitted}) < len(submitted)  # active jobs were returned, not duplicated
@@ -0,0 +1,66 @@
+import json
+from tasks import ChartData, ChartData_Config, ChartJournal
+
+
+def test_journal_roundtrip_with_resets(tmp_path):
+    chart = ChartData(name="J", config=ChartData_Config(pop_raw=True))
+    journal = ChartJournal(str(tmp_path / "BKP_J.jsonl"), metadata={"run": "r1"})
+    chart.y_series.raw.extend([1.0, 2.0])
+    chart.y_series.processed.extend([10.0, 20.0])
+    journal.append(chart, extra={"i": 2})
+    chart.y_series.raw.clear()
+    chart.y_series.raw.append(3.0)
+    chart.y_series.processed.append(30.0)
+    journal.append(chart, extra={"i": 3})
+
+    loaded, metadata, extra = ChartJournal.load(str(journal.path))
+    assert metadata == {"run": "r1"}
+    assert extra == {"i": 3}
+    assert list(loaded.y_series.processed) == [10.0, 20.0, 30.0]
+    assert list(loaded.y_series.raw) == [3.0]
+
+
+def test_compact_keeps_content_in_one_checkpoint(tmp_path):
+    chart = ChartData(name="C", config=ChartData_Config(pop_raw=True))
+    journal = ChartJournal(str(tmp_path / "BKP_C.jsonl"))
+    for i in range(20):
+        chart.y_series.raw.clear()
+        chart.y_series.raw.extend([float(i)] * 50)
+        chart.y_series.processed.append(float(i))
+        journal.append(chart, extra={"i": i})
+    before = journal.path.stat().st_size
+
+    ChartJournal.compact(str(journal.path))
+
+    assert journal.path.stat().st_size < before
+    assert len(journal.path.read_text(encoding="utf-8").splitlines()) == 2
+    loaded, _, extra = ChartJournal.load(str(journal.path))
+    assert list(loaded.y_series.processed) == [float(i) for i in range(20)]
+    assert list(loaded.y_series.raw) == [19.0] * 50
+    assert extra == {"i": 19}
+
+
+def test_meta_set_after_the_first_checkpoint_is_journaled(tmp_path):
+    # rm_transient stores the scope scale only when the first waveform arrives
+    import numpy as np
+    from addons.tasks.rm_transient.rm_transient import append_waveform
+    from addons.tasks.rm_transient.rm_transient_uts import calculate_rise_time_codes, calculate_rise_times_codes
+
+    chart = ChartData(name="T", config=ChartData_Config())
+    journal = ChartJournal(str(tmp_path / "BKP_T.jsonl"))
+    journal.append(chart)  # backup tick before any acquisition
+    pre = {"XZEro": 0.0, "XINcr": 1e-6, "YOFf": 0.0, "YMUlt": 0.04, "YZEro": 0.0, "NR_Pt": 4.0}
+    append_waveform(chart, np.array([0, 50, 125, 125], dtype=np.uint8), pre, calculate_rise_time_codes, calculate_rise_times_codes)
+    journal.append(chart)
+    journal.append(chart)  # unchanged metadata: no further header
+
+    records = [json.loads(line) for line in journal.path.read_text(encoding="utf-8").splitlines()]
+    assert [r["type"] for r in records] == ["header", "header", "chunk"]
+    loaded, _, _ = ChartJournal.load(str(journal.path))
+    assert loaded.y_series.meta.attrs["YMUlt"] == 0.04
+    assert list(loaded.y_series.raw[0]) == [0, 50, 125, 125]
+
+    ChartJournal.compact(str(journal.path))
+    compacted, _, _ = ChartJournal.load(str(journal.path))
+    assert compacted.y_series.meta.attrs == loaded.y_series.meta.attrs
+    assert len(journal.path.read_text(encoding="utf-8").splitlines()) == 2
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from config import Config
+from tasks import ChartData, ChartData_Config
+from webapp import LiveFigure, make_plotly_figure
+
+
+def trace_values(fig):
+    trace = fig.data[0]
+    return [None if trace.x is None else list(trace.x), None if trace.y is None else list(trace.y)]
+
+
+@pytest.mark.parametrize("custom_type", ["scatter", "line", "histogram"])
+def test_extended_figure_matches_a_rebuild(custom_type):
+    chart = ChartData(name="live", config=ChartData_Config(custom_type=custom_type))
+    live = LiveFigure()
+    for tick in range(5):
+        block = np.arange(tick * 10, tick * 10 + 10, dtype=float)
+        block[3] = np.nan
+        chart.y_series.processed.extend(block.tolist())
+        if custom_type == "scatter":
+            chart.x_series.processed.extend((block * 2).tolist())
+        fig = live.update(chart)
+    assert live.cursor == 50
+    assert trace_values(fig) == trace_values(make_plotly_figure(chart))
+
+
+def test_shrink_and_type_change_rebuild():
+    chart = ChartData(name="live", config=ChartData_Config(custom_type="line"))
+    chart.y_series.processed.extend([1.0, 2.0, 3.0])
+    live = LiveFigure()
+    first = live.update(chart)
+    chart.y_series.processed.clear()
+    chart.y_series.processed.append(9.0)
+    assert live.update(chart) is not first and list(live.figure.data[0].y) == [9.0]
+    chart.config.custom_type = "histogram"
+    assert live.update(chart).data[0].type == "histogram"
+
+
+class TrackedList(list):
+    """List recording how many samples every slice read touches."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reads = []
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self.reads.append(len(range(*index.indices(len(self)))))
+        return super().__getitem__(index)
+
+
+@pytest.mark.parametrize("with_x", [True, False])
+def test_ticks_past_the_budget_only_read_new_samples(monkeypatch, with_x):
+    monkeypatch.setitem(Config()._data, "chart_viewport_px", 100)  # budget: 200 points
+    monkeypatch.setitem(Config()._data, "chart_webgl_threshold", 0)  # no WebGL switch (a one-off rebuild)
+    chart = ChartData(name="long", config=ChartData_Config(custom_type="line"))
+    chart.x_series.processed, chart.y_series.processed = TrackedList(), TrackedList()
+    rng = np.random.default_rng(3)
+    values = np.cumsum(rng.normal(size=50_000))
+    values[777] = np.nan
+    live = LiveFigure()
+    block = 250
+    for start in range(0, len(values), block):
+        if with_x:
+            chart.x_series.processed.extend((np.arange(start, start + block) * 0.1).tolist())
+        chart.y_series.processed.extend(values[start : start + block].tolist())
+        chart.x_series.processed.reads.clear()
+        chart.y_series.processed.reads.clear()
+        fig = live.update(chart)
+        if start >= 2 * block:
+            # Every tick past the budget touches the new block only, never the whole run
+            reads = chart.x_series.processed.reads + chart.y_series.processed.reads
+            assert max(reads) <= block
+        assert len(fig.data[0].y) <= 200
+
+    y = np.asarray(fig.data[0].y, dtype=float)
+    assert y.max() == np.nanmax(values) and y.min() == np.nanmin(values)
+    assert np.all(np.diff(np.asarray(fig.data[0].x, dtype=float)) > 0)
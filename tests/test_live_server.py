@@ -0,0 +1,48 @@
+from tasks import ChartData, ChartData_Config, SnapshotPublisher
+from webapp.live_server import chart_delta
+
+
+def publish(chart):
+    return SnapshotPublisher().publish(chart)
+
+
+def test_chart_delta_cursor_sends_only_new_samples():
+    chart = ChartData(name="line", config=ChartData_Config(custom_type="line"))
+    chart.y_series.processed.extend([1.0, 2.0, 3.0])
+    payload, cursor = chart_delta(publish(chart), None, backlog=2)
+    assert payload["reset"] and payload["y"] == [2.0, 3.0] and payload["x"] == [1, 2]
+    assert cursor[1] == 3
+
+    assert chart_delta(publish(chart), cursor, backlog=2) == (None, cursor)  # same version
+
+    chart.y_series.processed.extend([4.0, float("nan"), 6.0])
+    payload, cursor = chart_delta(publish(chart), cursor, backlog=2)
+    assert not payload["reset"] and payload["y"] == [4.0, 6.0] and payload["x"] == [3, 5]
+    assert payload["total"] == cursor[1] == 6
+
+    chart.y_series.processed.clear()
+    chart.y_series.processed.append(7.0)
+    payload, cursor = chart_delta(publish(chart), cursor, backlog=2)
+    assert payload["reset"] and payload["y"] == [7.0]
+
+
+def test_chart_delta_histogram_uses_x_when_y_is_empty():
+    chart = ChartData(name="hist", config=ChartData_Config(custom_type="histogram"))
+    chart.x_series.meta.label = "Rise time"
+    chart.x_series.processed.extend([0.5, 1.5, 2.5])
+    payload, cursor = chart_delta(publish(chart), None, backlog=100)
+    assert payload["type"] == "histogram"
+    assert payload["total"] == 3 and payload["y"] == [0.5, 1.5, 2.5] and payload["x"] == []
+    assert payload["y_label"] == "Rise time"
+
+    chart.x_series.processed.append(3.5)
+    payload, _ = chart_delta(publish(chart), cursor, backlog=100)
+    assert not payload["reset"] and payload["y"] == [3.5]
+
+
+def test_chart_delta_histogram_ignores_shorter_x():
+    chart = ChartData(name="hist-y", config=ChartData_Config(custom_type="hist"))
+    chart.x_series.processed.append(0.0)
+    chart.y_series.processed.extend([1.0, 2.0, 3.0])
+    payload, _ = chart_delta(publish(chart), None, backlog=100)
+    assert payload["type"] == "histogram" and payload["y"] == [1.0, 2.0, 3.0]
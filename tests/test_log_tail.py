@@ -0,0 +1,56 @@
+from webapp import LogTail
+
+
+def record(i, level="INFO", name="tasks.task"):
+    return f"2026-10-19 10:00:00,000 - {name} - {level} - message {i}\n"
+
+
+def write(path, text, mode="a"):
+    with open(path, mode, encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_reads_only_appended_bytes_and_completes_partial_lines(tmp_path):
+    log = tmp_path / "app.log"
+    write(log, record(0) + record(1, "ERROR", "connections") + "Traceback (most recent call last):\n")
+    tail = LogTail(str(log))
+    assert tail.poll() == log.stat().st_size
+    assert tail.poll() == 0
+    write(log, record(2, "WARNING")[:20])  # record cut mid-line
+    tail.poll()
+    assert len(tail.records) == 2
+    write(log, record(2, "WARNING")[20:])
+    assert tail.poll() == len(record(2, "WARNING")) - 20
+    lines = tail.lines()
+    assert len(lines) == 3 and lines[1].endswith("message 1\nTraceback (most recent call last):")
+    assert tail.lines(levels=["ERROR"]) == [lines[1]]
+    assert tail.lines(logger="tasks") == [lines[0], lines[2]]
+    assert tail.lines(search="MESSAGE 2") == [lines[2]]
+
+
+def test_truncation_and_rotation_restart_from_the_new_file(tmp_path):
+    log = tmp_path / "app.log"
+    write(log, "".join(record(i) for i in range(10)))
+    tail = LogTail(str(log))
+    tail.poll()
+    assert len(tail.records) == 10
+
+    write(log, record(100), mode="w")  # restart with mode="w"
+    tail.poll()
+    assert [text.split()[-1] for text in tail.lines()] == ["100"]
+
+    log.rename(tmp_path / "app.log.1")  # rotation: a new file with the same name
+    write(log, record(200) + record(201))
+    tail.poll()
+    assert [text.split()[-1] for text in tail.lines()] == ["200", "201"]
+
+
+def test_long_file_only_reads_the_backlog(tmp_path):
+    log = tmp_path / "app.log"
+    write(log, "".join(record(i) for i in range(5_000)))
+    tail = LogTail(str(log), max_records=100)
+    read = tail.poll()
+    assert read <= tail.backlog_bytes
+    texts = tail.lines()
+    assert len(texts) == 100 and texts[-1].endswith("message 4999")
+    assert all(text.startswith("2026-") for text in texts)  # the cut first line was dropped
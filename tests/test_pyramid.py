@@ -0,0 +1,89 @@
+import threading
+import numpy as np
+import pytest
+from tasks.pyramid import SeriesPyramid
+
+rng = np.random.default_rng(1)
+
+
+def series(length=100_000):
+    values = np.cumsum(rng.normal(size=length))
+    values[rng.integers(0, length, length // 100)] = np.nan
+    return values
+
+
+def brute_force(values, result, stop):
+    """min/max/mean/count of the samples of every returned bucket, computed directly."""
+    bounds = list(result["index"]) + [stop]
+    for i in range(len(result["index"])):
+        block = values[bounds[i] : bounds[i + 1]]
+        valid = block[~np.isnan(block)]
+        yield i, len(valid), valid.min(initial=np.inf), valid.max(initial=-np.inf), valid.mean() if len(valid) else np.nan
+
+
+@pytest.mark.parametrize("start, stop, n", [(0, None, 500), (0, None, 37), (1234, 98_765, 300), (5, 4_000, 1_000), (70_000, 70_300, 1_000)])
+def test_envelope_matches_brute_force(start, stop, n):
+    values = series()
+    pyramid = SeriesPyramid()
+    pyramid.update(values)
+    stop_index = len(values) if stop is None else stop
+    result = pyramid.envelope(values, n, start, stop)
+    assert result["index"][0] == start and np.all(np.diff(result["index"]) > 0)
+    assert len(result["index"]) <= 2 * n + 2
+    assert result["count"].sum() == np.count_nonzero(~np.isnan(values[start:stop_index]))
+    for i, count, lo, hi, mean in brute_force(values, result, stop_index):
+        assert result["count"][i] == count
+        if count:
+            assert result["min"][i] == lo and result["max"][i] == hi
+            assert result["mean"][i] == pytest.approx(mean)
+
+
+def test_incremental_updates_match_a_single_build():
+    values = series(50_000)
+    incremental = SeriesPyramid()
+    for stop in range(0, len(values) + 1, 777):
+        incremental.update(values[:stop])
+    incremental.update(values)
+    single = SeriesPyramid()
+    single.update(values)
+    assert len(incremental.levels) == len(single.levels)
+    for a, b in zip(incremental.to_arrays(), single.to_arrays()):
+        np.testing.assert_allclose(a, b, equal_nan=True)
+
+    restored = SeriesPyramid.from_arrays(single.to_arrays(), single.length)
+    expected = single.envelope(values, 200)
+    for key, value in restored.envelope(values, 200).items():
+        np.testing.assert_array_equal(value, expected[key])
+
+
+def test_shrink_rebuilds_and_non_scalar_disables():
+    pyramid = SeriesPyramid()
+    pyramid.update(np.arange(1000.0))
+    pyramid.update(np.arange(100.0))
+    assert pyramid.length == 100 and len(pyramid.levels[0]) == 1
+
+    rows = SeriesPyramid()
+    rows.update(np.zeros((1000, 2)))
+    assert not rows.enabled and rows.levels == []
+
+
+def test_concurrent_envelopes_build_the_pyramid_once():
+    # Readers sharing a cached chart all find the pyramid stale and catch it up
+    values = series(200_000)
+    single = SeriesPyramid()
+    single.update(values)
+    shared = SeriesPyramid()
+    barrier = threading.Barrier(8)
+
+    def read():
+        barrier.wait()
+        shared.envelope(values, 300)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert shared.length == len(values)
+    for a, b in zip(shared.to_arrays(), single.to_arrays()):
+        np.testing.assert_allclose(a, b, equal_nan=True)
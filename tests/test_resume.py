@@ -0,0 +1,36 @@
+import os
+from types import SimpleNamespace
+from config import Config
+from tasks import ArrayColumn, ChartData, Task
+from tasks.DataProcessor import DataProcessor
+from addons.tasks.r_cube.records import FRES_RECORD
+
+
+def test_resume_drops_rows_journaled_past_the_cursor(data_dir, monkeypatch):
+    monkeypatch.setitem(Config()._data, "backup_switch", True)
+    task = Task("resume", "", [], function=lambda t: None)
+    chart = ChartData(name="R")
+    chart.y_series.raw = ArrayColumn(dtype=FRES_RECORD)
+    task.data = [chart]
+    processor = DataProcessor(task)
+    for meas_idx in range(3):
+        chart.y_series.raw.append([1.0, 0.1, 10.0, meas_idx])
+        task.checkpoint["meas_idx"] = meas_idx + 1
+    # Backup tick between the append of row 3 and its cursor update
+    chart.y_series.raw.append([1.0, 0.1, 10.0, 3])
+    processor.backup_saver()
+    assert os.path.isfile(processor.journals[id(chart)].path)
+
+    resumed = Task("resume", "", [], function=lambda t: None)
+    assert resumed.load_checkpoint()
+    resume_idx = int(resumed.resume_cursor["meas_idx"])
+    assert resume_idx == 3
+    fresh = ChartData(name="R")
+    fresh.y_series.raw = ArrayColumn(dtype=FRES_RECORD)
+    resumed.restore_chart(fresh, samples=resume_idx)
+    # The task measures index 3 again: it must not already be there
+    assert fresh.field("meas_idx").tolist() == [0, 1, 2]
+
+    everything = ChartData(name="R")
+    resumed.restore_chart(everything)
+    assert len(everything.y_series.raw) == 4
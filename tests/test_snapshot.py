@@ -0,0 +1,44 @@
+from threading import Event, Thread
+import numpy as np
+from tasks import ArrayColumn, ChartData, ChartData_Config, SnapshotPublisher
+
+
+def test_snapshot_of_list_series_written_by_the_task_thread():
+    # Like the test_task histogram: the task appends to processed while the processor publishes
+    chart = ChartData(name="hist", config=ChartData_Config(custom_type="histogram"))
+    done = Event()
+
+    def task() -> None:
+        for i in range(50_000):
+            chart.x_series.processed.append(float(i))
+        done.set()
+
+    thread = Thread(target=task)
+    thread.start()
+    snapshots = []
+    while not done.is_set():
+        snapshots.append(SnapshotPublisher().publish(chart))
+    thread.join()
+    snapshots.append(SnapshotPublisher().publish(chart))
+    SnapshotPublisher().discard([chart])
+
+    for snapshot in snapshots:
+        x = snapshot.x_series.processed
+        assert not x.flags.writeable
+        assert np.array_equal(x, np.arange(len(x), dtype=float))  # a frozen, gap-free prefix
+    assert len(snapshots[-1].x_series.processed) == 50_000
+
+
+def test_array_column_views_survive_rewrites():
+    chart = ChartData(name="col", config=ChartData_Config(columnar=True))
+    assert isinstance(chart.y_series.processed, ArrayColumn)
+    chart.y_series.processed.extend([1.0, 2.0, 3.0])
+    first = SnapshotPublisher().publish(chart)
+    chart.y_series.processed.clear()
+    chart.y_series.processed.extend([9.0, 9.0, 9.0, 9.0])
+    second = SnapshotPublisher().publish(chart)
+    SnapshotPublisher().discard([chart])
+
+    assert first.y_series.processed.tolist() == [1.0, 2.0, 3.0]
+    assert second.y_series.processed.tolist() == [9.0] * 4
+    assert second.version != first.version
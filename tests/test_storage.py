@@ -0,0 +1,172 @@
+import json
+import numpy as np
+import pytest
+from config import Config
+from tasks import ArrayColumn, ChartData, ChartData_Config, record_dtype
+from tasks.storage import JSON_CHUNK, load_charts_npz, read_header, read_npz_header, save_charts_json, save_charts_npz
+from tasks.structures import CHART_SCHEMA_VERSION
+
+
+def plain(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def sample_charts():
+    scalars = ChartData(name="scalars", config=ChartData_Config(custom_type="line"))
+    scalars.x_series.processed.extend([0.0, 1.0, 2.0])
+    scalars.y_series.processed.extend([1.5, float("nan"), 3.5])
+    scalars.y_series.raw.extend([1, 2, 3])
+    scalars.y_series.meta.label, scalars.y_series.meta.unit = "Voltage", "V"
+
+    mixed = ChartData(name="mixed", config=ChartData_Config(columnar=True))
+    mixed.y_series.raw = [[0.1, [1, 2]], "text", None]  # ragged/mixed: stored as JSON
+    mixed.x_series.raw = ["a", "b", "c"]
+    mixed.y_series.processed.extend(np.arange(10.0))
+    return [scalars, mixed]
+
+
+def assert_same_series(loaded, original):
+    for axis in ("x", "y"):
+        for kind in ("raw", "processed"):
+            got = plain(getattr(getattr(loaded, f"{axis}_series"), kind))
+            want = plain(getattr(getattr(original, f"{axis}_series"), kind))
+            assert json.dumps(got) == json.dumps(want), f"{original.name} {axis}/{kind}"
+
+
+@pytest.mark.parametrize("codec", ["none", "zlib", "auto"])
+def test_npz_roundtrip(data_dir, codec):
+    charts = sample_charts()
+    for chart in charts:
+        chart.config.codec = codec
+    path = str(data_dir / "charts.npz")
+    save_charts_npz(charts, path, metadata={"task_name": "demo"})
+    loaded, metadata = load_charts_npz(path)
+    assert metadata == {"task_name": "demo"}
+    assert [c.name for c in loaded] == ["scalars", "mixed"]
+    for got, want in zip(loaded, charts):
+        assert_same_series(got, want)
+        assert got.config.custom_type == want.config.custom_type
+    assert loaded[0].y_series.meta.unit == "V"
+
+
+def test_npz_without_raw_and_series_selection(data_dir):
+    charts = sample_charts()
+    path = str(data_dir / "charts.npz")
+    save_charts_npz(charts, path, include_raw=False)
+    assert "y/raw" not in read_npz_header(path)["charts"][0]["series"]
+    (scalars, _), _ = load_charts_npz(path, series=["y/processed"])
+    assert len(scalars.x_series.processed) == 0 and len(scalars.y_series.raw) == 0
+    assert plain(scalars.y_series.processed)[0] == 1.5
+
+
+@pytest.mark.parametrize("merged", [False, True])
+def test_streamed_json_matches_to_dict(data_dir, merged):
+    charts = sample_charts() if merged else sample_charts()[:1]
+    path = data_dir / "charts.json"
+    save_charts_json(charts, str(path), metadata={"run": 1}, merged=merged)
+    document = json.loads(path.read_text(encoding="utf-8"))
+    assert document.pop("header")["charts"][0]["points"]["y/processed"] == 3
+    dicts = document["charts"] if merged else [document]
+    for got, chart in zip(dicts, charts):
+        assert json.dumps(got) == json.dumps(chart.to_dict())
+    if merged:
+        assert document["metadata"] == {"run": 1}
+    for got, want in zip(ChartData.load_file(str(path)), charts):
+        assert_same_series(got, want)
+
+
+def test_streamed_json_writes_large_series_in_blocks(data_dir):
+    chart = ChartData(name="long", config=ChartData_Config(columnar=True))
+    chart.y_series.processed.extend(np.arange(3 * JSON_CHUNK + 5, dtype=float))
+    path = data_dir / "long.json"
+    save_charts_json([chart], str(path))
+    (loaded,) = ChartData.load_file(str(path))
+    assert plain(loaded.y_series.processed) == plain(chart.y_series.processed)
+
+
+def test_lazy_load_maps_uncompressed_members(data_dir):
+    chart = ChartData(name="mapped", config=ChartData_Config(columnar=True, codec="none"))
+    chart.y_series.processed.extend(np.sin(np.arange(50_000) / 100))
+    chart.y_series.raw.extend(np.arange(50_000, dtype=float))
+    chart.update_pyramids()
+    packed = ChartData(name="packed", config=ChartData_Config(columnar=True, codec="zlib"))
+    packed.y_series.processed.extend([1.0, 2.0])
+    path = str(data_dir / "lazy.npz")
+    save_charts_npz([chart, packed], path)
+
+    mapped, eager = ChartData.open(path, lazy=True)
+    processed = mapped.y_series.processed
+    assert isinstance(processed, np.memmap) and not processed.flags.writeable
+    np.testing.assert_array_equal(processed, chart.y_series.processed.view())
+    assert float(mapped.y_series.raw[-1]) == 49_999.0
+    assert not isinstance(eager.y_series.processed, np.memmap)  # deflated: decoded eagerly
+    assert plain(eager.y_series.processed) == [1.0, 2.0]
+
+    # The saved pyramid answers overviews of the mapped series
+    env = mapped.envelope(100)
+    assert env["max"].max() == processed.max() and env["min"].min() == processed.min()
+
+
+def test_streamed_chart_is_saved_from_its_chunk_store(data_dir, monkeypatch):
+    monkeypatch.setitem(Config()._data, "stream_tail_samples", 100)
+    chart = ChartData(name="streamed", config=ChartData_Config(stream_to_disk=True, codec="none"))
+    for i in range(1_000):
+        chart.y_series.raw.append([i, 2 * i])
+        chart.y_series.processed.append(float(i))
+    assert chart.y_series.raw.in_memory < 1_000
+    path = str(data_dir / "streamed.npz")
+    save_charts_npz([chart], path)
+    (loaded,) = ChartData.open(path, lazy=True)
+    assert loaded.y_series.raw.shape == (1_000, 2)
+    np.testing.assert_array_equal(loaded.y_series.raw[:, 1], 2 * np.arange(1_000))
+    np.testing.assert_array_equal(loaded.y_series.processed, np.arange(1_000.0))
+
+
+def test_v1_chart_dicts_are_migrated():
+    v1 = {"name": "old", "config": None, "y": {"processed": [1.0, 2.0]}}
+    chart = ChartData.from_dict(v1)
+    assert chart.schema_version == CHART_SCHEMA_VERSION
+    assert plain(chart.y_series.processed) == [1.0, 2.0] and chart.x_series.meta.label == ""
+    assert v1 == {"name": "old", "config": None, "y": {"processed": [1.0, 2.0]}}  # input left untouched
+
+
+def test_read_header_never_parses_the_series(data_dir):
+    charts = sample_charts()
+    json_path = data_dir / "charts.json"
+    save_charts_json(charts, str(json_path), metadata={"task_name": "demo"}, merged=True)
+    # Corrupt everything after the header line: a metadata-only read must not notice
+    first_line = json_path.read_text(encoding="utf-8").split("\n", 1)[0]
+    json_path.write_text(first_line + "\n{ not json", encoding="utf-8")
+    header = read_header(str(json_path))
+    assert header["metadata"] == {"task_name": "demo"}
+    assert [c["name"] for c in header["charts"]] == ["scalars", "mixed"]
+    assert header["charts"][0]["points"] == {"x/raw": 0, "x/processed": 3, "y/raw": 3, "y/processed": 3}
+
+    npz_path = str(data_dir / "charts.npz")
+    save_charts_npz(charts, npz_path)
+    assert read_header(npz_path)["charts"][1]["points"]["y/processed"] == 10
+
+    v1_path = data_dir / "v1.json"
+    v1_path.write_text(json.dumps({"name": "old", "y": {"processed": [1, 2, 3]}}), encoding="utf-8")
+    (old,) = read_header(str(v1_path))["charts"]
+    assert old["schema_version"] == CHART_SCHEMA_VERSION and old["points"] == {"y/processed": 3}
+
+
+@pytest.mark.parametrize("suffix", [".json", ".npz"])
+def test_record_series_roundtrip(data_dir, suffix):
+    dtype = record_dtype([("V", "f8"), ("I", "f8"), ("label", "U16")])
+    chart = ChartData(name="records", config=ChartData_Config(columnar=True))
+    chart.y_series.raw = ArrayColumn(dtype=dtype)
+    chart.y_series.raw.extend([(1.0, 0.5, "a1"), [2.0, 0.25, "b2"]])
+    path = str(data_dir / f"records{suffix}")
+    if suffix == ".npz":
+        save_charts_npz([chart], path)
+    else:
+        save_charts_json([chart], path)
+    assert read_header(path)["charts"][0]["y"]["raw_fields"] == [["V", "<f8"], ["I", "<f8"], ["label", "<U16"]]
+    (loaded,) = ChartData.open(path)
+    assert loaded.y_series.raw.dtype == dtype
+    assert loaded.field("V").tolist() == [1.0, 2.0]
+    assert loaded.field("label").tolist() == ["a1", "b2"]
+    with pytest.raises(KeyError):
+        loaded.field("R")
@@ -0,0 +1,27 @@
+from pathlib import Path
+from config import Config
+from tasks import ChartData, ChartData_Config, Task, clean_stream_store
+from tasks.structures import stream_store_dir
+
+
+def streamed_chart(monkeypatch) -> ChartData:
+    monkeypatch.setitem(Config()._data, "stream_tail_samples", 4)
+    chart = ChartData(name="S", config=ChartData_Config(stream_to_disk=True))
+    chart.y_series.processed.extend([float(i) for i in range(20)])
+    return chart
+
+
+def test_chunk_stores_removed_once_saved(data_dir, monkeypatch):
+    chart = streamed_chart(monkeypatch)
+    assert list(Path(stream_store_dir()).glob("*.bin"))
+    task = Task("stream", "", [], function=lambda t: None)
+    task._finalise(None, None, [chart], "alias", run=task._run)
+    assert list(data_dir.glob("S_alias_*.json"))
+    assert not list(Path(stream_store_dir()).glob("*.bin"))
+
+
+def test_clean_stream_store_removes_orphans(data_dir, monkeypatch):
+    streamed_chart(monkeypatch)  # never saved, as after a crash
+    assert clean_stream_store() == 1
+    assert not list(Path(stream_store_dir()).glob("*.bin"))
+    assert clean_stream_store() == 0
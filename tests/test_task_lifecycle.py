@@ -0,0 +1,34 @@
+from threading import Thread, current_thread
+from tasks import Task, TaskState
+
+
+def make_task(monkeypatch):
+    task = Task("lifecycle", "", [], function=lambda t: None)
+    monkeypatch.setattr(task, "_save_chart_data", lambda charts, alias: True)
+    return task
+
+
+def test_old_finaliser_does_not_overwrite_new_run(monkeypatch):
+    task = make_task(monkeypatch)
+    task._run = 2
+    task.state = TaskState.RUNNING
+    task._finalise(None, None, [], "", run=1)
+    assert task.state == TaskState.RUNNING
+    task._finalise(None, None, [], "", run=2)
+    assert task.state == TaskState.SAVED
+
+
+def test_stop_from_task_thread_does_not_wait(monkeypatch):
+    task = make_task(monkeypatch)
+
+    def body():
+        task.thread_handle = current_thread()
+        task.running = True
+        task.stop()
+
+    worker = Thread(target=body)
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    task.finaliser.join(timeout=5)
+    assert task.state == TaskState.SAVED
@@ -1,3 +1,10 @@
 from .web_utilities import (
     make_plotly_figure,
+    point_budget,
+    LiveFigure,
+    SharedFigures,
+    make_field_figure,
+    record_frame,
 )
+from .log_tail import LEVELS, LogTail
+from .jobs import Job, JobRunner, JobState
@@ -0,0 +1,151 @@
+from typing import Any, Optional, Tuple
+import numpy as np
+
+# Level-of-detail helpers for make_plotly_figure. Every function returns the
+# indices of the samples to keep, so x/y of any dtype (labels, timestamps) can
+# be gathered afterwards.
+
+
+def float_array(values: Any) -> Optional[np.ndarray]:
+    """1-D float64 view/copy of values, None if they are not scalar numbers (strings are never parsed)."""
+    try:
+        arr = np.asarray(values)
+    except (TypeError, ValueError):
+        return None  # ragged rows
+    if arr.ndim != 1 or arr.dtype.kind not in "biuf":
+        return None
+    return arr.astype(np.float64, copy=False)
+
+
+def minmax_indices(y: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the minimum and maximum of y in n/2 equal buckets (peaks are never lost)."""
+    size = len(y)
+    buckets = max(n // 2, 1)
+    if size <= n:
+        return np.arange(size)
+    width = -(-size // buckets)
+    pad = width * buckets - size
+    low = np.concatenate([np.where(np.isnan(y), np.inf, y), np.full(pad, np.inf)]).reshape(buckets, width)
+    high = np.concatenate([np.where(np.isnan(y), -np.inf, y), np.full(pad, -np.inf)]).reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    keep = np.concatenate([offsets + low.argmin(axis=1), offsets + high.argmax(axis=1)])
+    return np.unique(keep[keep < size])
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: n indices keeping the visual shape of (x, y).
+
+    x and y must be free of NaN. Runs one vectorised step per output bucket.
+    """
+    size = len(y)
+    if size <= n or n < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    keep = np.empty(n, dtype=np.int64)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nxt_lo = hi
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else size
+        nxt_hi = max(nxt_hi, nxt_lo + 1)
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def decimate_indices(x: Optional[np.ndarray], y: np.ndarray, n: int, method: str = "minmax") -> np.ndarray:
+    """Indices of about n samples to draw; NaN pairs are dropped first."""
+    valid = ~np.isnan(y)
+    if x is not None:
+        valid &= ~np.isnan(x)
+    positions = np.flatnonzero(valid)
+    if len(positions) <= n:
+        return positions
+    y = y[positions]
+    if method == "lttb":
+        xs = x[positions] if x is not None else positions.astype(np.float64)
+        return positions[lttb_indices(xs, y, n)]
+    return positions[minmax_indices(y, n)]
+
+
+def histogram_bins(values: np.ndarray, bins: Any = "auto", max_bins: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """(counts, edges) of the finite values, with at most max_bins bins."""
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return np.zeros(0, dtype=np.int64), np.zeros(1)
+    edges = np.histogram_bin_edges(finite, bins=bins)
+    if len(edges) - 1 > max_bins:
+        edges = np.linspace(edges[0], edges[-1], max_bins + 1)
+    counts, edges = np.histogram(finite, bins=edges)
+    return counts, edges
+
+
+class MinMaxStream:
+    """
+    Incremental min/max decimation of an append-only (x, y) series.
+
+    Sample positions are grouped in buckets of ``width`` consecutive positions
+    and every bucket keeps its lowest and highest sample (by y). Once more than
+    ``buckets`` buckets exist the width doubles and neighbouring buckets are
+    merged, so at most 2 * buckets points are kept. ``extend`` costs O(new
+    samples) plus an amortised O(buckets) merge, whatever the run length.
+    """
+
+    # Row layout: position, x, y of the minimum then of the maximum (position -1 = empty bucket)
+    _EMPTY = (-1.0, np.nan, np.inf, -1.0, np.nan, -np.inf)
+
+    def __init__(self, buckets: int, width: int = 1) -> None:
+        self.buckets = max(int(buckets), 1)
+        self.width = max(int(width), 1)
+        self.rows = np.empty((0, 6))
+
+    def extend(self, positions: np.ndarray, x: np.ndarray, y: np.ndarray) -> None:
+        """Add samples (increasing positions, finite x/y) past the ones already added."""
+        if not len(positions):
+            return
+        while positions[-1] // self.width >= 2 * self.buckets:
+            self._halve()
+        bucket = positions // self.width
+        # Sorted by bucket then y: the first sample of a bucket is its minimum, the last its maximum
+        order = np.lexsort((y, bucket))
+        starts = np.flatnonzero(np.r_[True, np.diff(bucket[order]) != 0])
+        ends = np.r_[starts[1:], len(order)] - 1
+        lo, hi = order[starts], order[ends]
+        new = np.column_stack([positions[lo], x[lo], y[lo], positions[hi], x[hi], y[hi]]).astype(np.float64)
+        ids = bucket[order][starts]
+        size = max(int(ids[-1]) + 1, len(self.rows))
+        if size > len(self.rows):
+            self.rows = np.vstack([self.rows, np.tile(self._EMPTY, (size - len(self.rows), 1))])
+        self.rows[ids] = self._merge(self.rows[ids], new)
+        while len(self.rows) > self.buckets:
+            self._halve()
+
+    @staticmethod
+    def _merge(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        out = a.copy()
+        take_min = b[:, 2] < a[:, 2]
+        take_max = b[:, 5] > a[:, 5]
+        out[take_min, :3] = b[take_min, :3]
+        out[take_max, 3:] = b[take_max, 3:]
+        return out
+
+    def _halve(self) -> None:
+        self.width *= 2
+        if len(self.rows) % 2:
+            self.rows = np.vstack([self.rows, self._EMPTY])
+        self.rows = self._merge(self.rows[0::2], self.rows[1::2])
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(x, y) of the kept samples in position order."""
+        rows = self.rows[self.rows[:, 0] >= 0]
+        first_max = rows[:, 3] < rows[:, 0]
+        pairs = np.where(first_max[:, None], rows[:, [3, 4, 5, 0, 1, 2]], rows)
+        both = pairs[:, 0] != pairs[:, 3]
+        points = np.concatenate([pairs[:, :3], pairs[both, 3:]])
+        # Stable sort on position keeps every pair in order
+        points = points[np.argsort(points[:, 0], kind="stable")]
+        return points[:, 1], points[:, 2]
@@ -0,0 +1,124 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from threading import Event, RLock, Thread
+from typing import Any, Callable, List, Optional
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(Enum):
+    """Lifecycle of a background job."""
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class Job:
+    """
+    Handle of a function running in the background.
+
+    The function receives the job as its first argument: it reports progress
+    with ``report`` and should return early once ``cancelled`` is set.
+    """
+
+    id: int
+    key: str = field(metadata={"help": "Jobs with the same key never run concurrently."})
+    name: str = field(metadata={"help": "Label shown in the UI."})
+    state: JobState = JobState.RUNNING
+    progress: float = field(default=0.0, metadata={"help": "Fraction done, 0..1."})
+    message: str = ""
+    result: Any = None
+    error: str = ""
+    started: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    cancel_event: Event = field(default_factory=Event, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.state == JobState.RUNNING
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def report(self, progress: float, message: str = "") -> None:
+        self.progress = min(max(progress, 0.0), 1.0)
+        if message:
+            self.message = message
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+
+class JobRunner:
+    """
+    Runs slow operations (instrument scans, bus commands, config I/O) in
+    background threads so Streamlit callbacks return immediately.
+
+    Pages submit a function and poll the returned Job from a fragment
+    (progress, message, result). Jobs sharing a key are serialised: submitting
+    while one is active returns the active job. The most recent jobs are kept
+    so a page can pick up the result after a rerun.
+    """
+
+    _lock = RLock()
+    _instance = None
+    _history = 50
+
+    def __new__(cls) -> "JobRunner":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._jobs = {}
+                cls._instance._ids = itertools.count(1)
+        return cls._instance
+
+    def submit(self, key: str, name: str, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Job:
+        """Start function(job, *args, **kwargs) in a daemon thread (or return the active job of key)."""
+        with self._lock:
+            active = self.active(key)
+            if active is not None:
+                return active
+            job = Job(id=next(self._ids), key=key, name=name)
+            self._jobs[job.id] = job
+            for old_id in sorted(self._jobs)[: max(len(self._jobs) - self._history, 0)]:
+                if not self._jobs[old_id].active:
+                    del self._jobs[old_id]
+        Thread(target=self._run, args=(job, function, args, kwargs), name=f"Job-{key}", daemon=True).start()
+        return job
+
+    def _run(self, job: Job, function: Callable[..., Any], args: Any, kwargs: Any) -> None:
+        try:
+            job.result = function(job, *args, **kwargs)
+            job.finished = time.time()
+            job.progress = job.progress if job.cancelled else 1.0
+            job.state = JobState.CANCELLED if job.cancelled else JobState.DONE
+        except Exception as e:
+            logger.error(f"Job {job.name} failed: {e}")
+            job.error = str(e)
+            job.finished = time.time()
+            job.state = JobState.FAILED
+
+    def get(self, job_id: Optional[int]) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id) if job_id is not None else None
+
+    def active(self, key: str) -> Optional[Job]:
+        """Running job of key, if any."""
+        with self._lock:  # submit prunes old jobs from other threads
+            return next((j for j in self._jobs.values() if j.key == key and j.active), None)
+
+    def jobs(self, key: Optional[str] = None) -> List[Job]:
+        """Known jobs (optionally of one key), newest first."""
+        with self._lock:
+            return sorted((j for j in self._jobs.values() if key is None or j.key == key), key=lambda j: -j.id)
+
+    def cancel(self, job_id: int) -> None:
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
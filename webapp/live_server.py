@@ -0,0 +1,237 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import RLock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import time
+import numpy as np
+import plotly
+from config import Config
+from connections import Connections
+from tasks import ChartData, ChartSnapshot, SnapshotPublisher, Tasks
+from tasks.journal import _json_default
+from .web_utilities import series_array, valid_mask
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).parent / "static"
+PLOTLY_JS = Path(plotly.__file__).parent / "package_data" / "plotly.min.js"
+
+
+def _finite_pairs(x: np.ndarray, y: np.ndarray) -> Tuple[list, list]:
+    """Drop pairs that JSON/JavaScript cannot carry (NaN, inf, None) and return plain lists."""
+    keep = valid_mask(x) & valid_mask(y)
+    for arr in (x, y):
+        if arr.dtype.kind == "f":
+            keep &= np.isfinite(arr)
+    return x[keep].tolist(), y[keep].tolist()
+
+
+def chart_delta(
+    snapshot: ChartSnapshot, cursor: Optional[Tuple[int, int]], backlog: int
+) -> Tuple[Optional[Dict[str, Any]], Tuple[int, int]]:
+    """Samples of a chart snapshot appended since cursor, as an SSE payload, and the new cursor.
+
+    cursor is (snapshot version, samples sent). None (new client or chart)
+    sends the last backlog samples with "reset" set, as does a series that
+    shrank or a refresh_all chart (whose processed data is rewritten in place).
+    Histograms only send the plotted values in "y" (y_series, or x_series when
+    y is empty), labelled with that series' label.
+    Returns (None, cursor) when the snapshot version did not change.
+    """
+    if cursor is not None and cursor[0] == snapshot.version:
+        return None, cursor
+    x, y = snapshot.x_series.processed, snapshot.y_series.processed
+    histogram = snapshot.config.custom_type in ("histogram", "hist")
+    if histogram and not len(y):
+        # Histograms plot y, or x when only x holds data (as make_plotly_figure)
+        x, y = y, x
+    offset = snapshot.index_offset  # streamed charts only snapshot their in-memory window
+    length = offset + (min(len(x), len(y)) if len(x) and len(y) and not histogram else len(y))
+    sent = cursor[1] if cursor is not None else None
+    reset = sent is None or length < sent or snapshot.config.refresh_all
+    start = max(length - backlog, offset) if reset else max(sent, offset)
+    if not reset and start == length:
+        return None, (snapshot.version, length)
+    y_arr = series_array(y[start - offset : length - offset])
+    if histogram:
+        _, ys = _finite_pairs(y_arr, y_arr)
+        xs: list = []
+        data_meta = snapshot.y_series.meta if y is snapshot.y_series.processed else snapshot.x_series.meta
+    else:
+        x_arr = series_array(x[start - offset : length - offset]) if len(x) else np.arange(start, length)
+        xs, ys = _finite_pairs(x_arr, y_arr)
+    payload = {
+        "name": snapshot.name,
+        "reset": reset,
+        "type": "histogram" if histogram else snapshot.config.custom_type or "scatter",
+        "x_label": snapshot.x_series.meta.label,
+        "y_label": data_meta.label if histogram else snapshot.y_series.meta.label,
+        "total": length,
+        "x": xs,
+        "y": ys,
+    }
+    return payload, (snapshot.version, length)
+
+
+def status_payload() -> Dict[str, Any]:
+    """Running task and instrument status shown next to the live charts."""
+    task = Tasks()._is_running
+    connections = Connections()
+    return {
+        "task": task.name if task is not None else None,
+        "alias": task.custom_alias if task is not None else "",
+        "state": task.state.value if task is not None else "idle",
+        "finalising": [t.name for t in Tasks().finalising_tasks()],
+        "instruments": [
+            {
+                "alias": entry.data.alias,
+                "idn": entry.data.idn,
+                "port": entry.data.port,
+                "busy": connections.is_scpi_info_busy(entry.data),
+            }
+            for entry in list(connections.instruments_list)
+        ],
+    }
+
+
+class LiveRequestHandler(BaseHTTPRequestHandler):
+    """Serves the live page, plotly.js and the /events server-sent events stream."""
+
+    server_version = "WASICLive/1.0"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send_file(self, path: Path, content_type: str) -> None:
+        try:
+            body = path.read_bytes()
+        except OSError:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=3600")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        route = self.path.split("?", 1)[0]
+        if route in ("/", "/index.html"):
+            self._send_file(STATIC_DIR / "live.html", "text/html; charset=utf-8")
+        elif route == "/plotly.min.js":
+            self._send_file(PLOTLY_JS, "application/javascript")
+        elif route == "/events":
+            self._stream_events()
+        else:
+            self.send_error(404)
+
+    def _event(self, name: str, data: Any) -> None:
+        payload = json.dumps(data, ensure_ascii=False, default=_json_default)
+        self.wfile.write(f"event: {name}\ndata: {payload}\n\n".encode("utf-8"))
+
+    def _stream_events(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        server: LiveServer = self.server.live  # type: ignore[attr-defined]
+        cursors: Dict[int, Tuple[int, int]] = {}  # id(chart) -> (snapshot version, samples sent)
+        task_id: Optional[int] = None
+        last_status = ""
+        try:
+            while server.running:
+                task = Tasks()._is_running
+                status = status_payload()
+                encoded = json.dumps(status, sort_keys=True)
+                if encoded != last_status:
+                    self._event("status", status)
+                    last_status = encoded
+                if task is not None and id(task) != task_id:
+                    task_id = id(task)
+                    cursors = {}
+                    self._event("task", {"name": task.name})
+                charts: List[ChartData] = list(task.data) if task is not None else []
+                for idx, chart in enumerate(charts):
+                    # Read the published snapshot, never the lists the task is appending to
+                    snapshot = SnapshotPublisher().latest(chart)
+                    if snapshot is None:
+                        continue
+                    payload, cursors[id(chart)] = chart_delta(snapshot, cursors.get(id(chart)), server.backlog)
+                    if payload is not None:
+                        payload["idx"] = idx
+                        self._event("samples", payload)
+                # Comment line as keep-alive, detects closed connections
+                self.wfile.write(b": tick\n\n")
+                self.wfile.flush()
+                time.sleep(server.interval)
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            logger.debug("Live client disconnected.")
+
+
+class LiveServer:
+    """
+    Push-based live data endpoint running next to Streamlit.
+
+    A small threaded HTTP server streams the samples appended to the running
+    task's charts, the task state and the instrument status as server-sent
+    events (/events) to a static Plotly page (/). Each client only receives new
+    samples (plus a bounded backlog on connect), and nothing is re-executed per
+    viewer, unlike Streamlit reruns. Configured by live_server_port (0 disables),
+    live_server_host, live_server_interval and live_server_backlog.
+    """
+
+    _lock = RLock()
+    _instance = None
+
+    def __new__(cls) -> "LiveServer":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._httpd = None
+                cls._instance._thread = None
+        return cls._instance
+
+    @property
+    def running(self) -> bool:
+        return self._httpd is not None
+
+    @property
+    def interval(self) -> float:
+        return float(Config().get("live_server_interval", 0.5))
+
+    @property
+    def backlog(self) -> int:
+        return int(Config().get("live_server_backlog", 10000))
+
+    def start(self) -> Optional[Thread]:
+        """Start serving in a daemon thread (no-op if disabled or already running)."""
+        with self._lock:
+            port = int(Config().get("live_server_port", 0) or 0)
+            if self.running or port <= 0:
+                return self._thread
+            host = Config().get("live_server_host", "127.0.0.1")
+            try:
+                httpd = ThreadingHTTPServer((host, port), LiveRequestHandler)
+            except OSError as e:
+                logger.error(f"Live server could not listen on {host}:{port}: {e}")
+                return None
+            httpd.daemon_threads = True
+            httpd.live = self  # type: ignore[attr-defined]
+            self._httpd = httpd
+            self._thread = Thread(target=httpd.serve_forever, name="LiveServer", daemon=True)
+            self._thread.start()
+            logger.info(f"Live dashboard on http://{host}:{port}/")
+            return self._thread
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._httpd is None:
+                return
+            httpd, self._httpd = self._httpd, None
+            httpd.shutdown()
+            httpd.server_close()
+            self._thread = None
@@ -0,0 +1,99 @@
+from collections import deque
+from pathlib import Path
+from typing import Deque, Iterable, List, Optional, Tuple
+import re
+
+# Matches the main.py formatter: "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+RECORD_RE = re.compile(r"^\S+ \S+ - (?P<name>.+?) - (?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL) - ")
+LEVELS: List[str] = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+class LogTail:
+    """
+    Tail-follow reader of the application log.
+
+    Only the bytes appended since the previous ``poll`` are read (the byte
+    offset is remembered), and the most recent ``max_records`` records are kept
+    in a ring, so polling costs O(new data) however long the run gets. Lines
+    that do not start a record (tracebacks) are attached to the previous one.
+    A file that shrank (restart with mode="w", rotation) is followed from its
+    start; an already long file is only read from its last ``max_records``
+    lines' worth of bytes.
+
+    Parameters
+    ----------
+    path: str
+        Log file to follow.
+    max_records: int
+        Records kept in memory.
+    """
+
+    def __init__(self, path: str, max_records: int = 2000) -> None:
+        self.path = Path(path)
+        self.offset = 0
+        self._identity: Optional[Tuple[int, int]] = None
+        self._partial = b""
+        self._skip_line = False
+        self.backlog_bytes = max_records * 256
+        # (level, logger name, text)
+        self.records: Deque[Tuple[str, str, str]] = deque(maxlen=max_records)
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self._partial = b""
+        self.records.clear()
+
+    def poll(self) -> int:
+        """Read the lines appended since the last call. Returns the number of new bytes read."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return 0
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self._identity or stat.st_size < self.offset:
+            self._identity = identity
+            self._reset()
+            if stat.st_size > self.backlog_bytes:
+                # Start near the end; the first (cut) line is dropped
+                self.offset = stat.st_size - self.backlog_bytes
+                self._skip_line = True
+        if stat.st_size == self.offset:
+            return 0
+        with self.path.open("rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        self.offset += len(data)
+        chunks = (self._partial + data).split(b"\n")
+        self._partial = chunks.pop()  # incomplete last line, completed by a later poll
+        if self._skip_line and chunks:
+            chunks.pop(0)
+            self._skip_line = False
+        self._add_lines(chunk.decode("utf-8", errors="replace").rstrip("\r") for chunk in chunks)
+        return len(data)
+
+    def _add_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            match = RECORD_RE.match(line)
+            if match is not None:
+                self.records.append((match["level"], match["name"], line))
+            elif self.records:
+                level, name, text = self.records[-1]
+                self.records[-1] = (level, name, text + "\n" + line)
+            elif line:
+                self.records.append(("", "", line))
+
+    def lines(self, levels: Optional[Iterable[str]] = None, logger: str = "", search: str = "") -> List[str]:
+        """Records of the ring passing the filters, oldest first.
+
+        levels keeps the given level names, logger keeps records whose logger
+        name starts with it, search is a case-insensitive substring match.
+        """
+        wanted = set(levels) if levels is not None else None
+        search = search.lower()
+        return [
+            text
+            for level, name, text in self.records
+            if (wanted is None or level in wanted or not level)
+            and name.startswith(logger)
+            and (not search or search in text.lower())
+        ]
@@ -1,29 +1,83 @@
-import json
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 import pandas as pd
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
-from tasks import ChartData
-from webapp import make_plotly_figure
+from config import Config
+from tasks import ChartData, ChartCatalogue
+from webapp import make_plotly_figure, make_field_figure, record_frame, point_budget
 
 st.title("📊 Charts Selector")
 
+# Parsed files and prepared figures are shared by reruns and sessions, keyed by path and
+# mtime (a rewritten file is a new key); the least recently used entries are evicted.
+CACHE_ENTRIES = Config().get("chart_cache_entries", 16)
+# Catalogue kinds selectable on the page (None lists every kind)
+FILE_KINDS = {"Results": "result", "Backups": "backup", "All": None}
+
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def load_chart_file(path: str, mtime: float) -> List[ChartData]:
+    # Open the chart file (single or merged); NPZ series are memory-mapped
+    charts = ChartData.open(path, lazy=True)
+    # The cached charts are shared by every session: complete their pyramids now, so
+    # envelope() only reads them afterwards
+    for chart in charts:
+        chart.update_pyramids()
+    return charts
+
+
+@st.cache_data(max_entries=4 * CACHE_ENTRIES, show_spinner=False)
+def chart_figure(path: str, mtime: float, idx: int, sample_range: Optional[Tuple[int, int]], _chart_data: ChartData):
+    return make_plotly_figure(_chart_data, sample_range=sample_range)
+
+
 # Initialize charts_to_plot in session state if not present
 if st.session_state.get("charts_to_plot") is None:
     st.session_state["charts_to_plot"] = []
 
 charts_to_plot: List[str] = st.session_state["charts_to_plot"]
 
+catalogue = ChartCatalogue()
+# Sync the index with data/charts once per session (or on demand); reruns only query it
+if not st.session_state.get("charts_catalogue_synced"):
+    catalogue.scan()
+    st.session_state["charts_catalogue_synced"] = True
+
 with st.container():
-    # Layout with columns for selection and buttons
+    # Layout with columns for filters and selection
+    col_kind, col_task, col_search, col_refresh = st.columns([1, 2, 3, 1])
+    with col_kind:
+        kind = st.selectbox("Files", list(FILE_KINDS), key="charts_kind", help="Saved results, backup journals or both")
+    with col_task:
+        task_filter = st.selectbox("Task", ["All"] + catalogue.task_names(), key="charts_task_filter")
+    with col_search:
+        search = st.text_input("Search", placeholder="File, alias, chart name or unit", key="charts_search")
+    with col_refresh:
+        st.button("🔄 Refresh", on_click=catalogue.scan, key="refresh_catalogue_btn", help="Re-index data/charts")
 
-    # Fetch JSON files from data/charts directory
-    jsons_objs: List[Path] = list(Path("data/charts").rglob("*.json"))
-    jsons_list: List[str] = [json_obj.name for json_obj in jsons_objs]
+    # The catalogue is paged, so directories with thousands of files stay fully reachable
+    filters = dict(kind=FILE_KINDS[kind], task_name=None if task_filter == "All" else task_filter, search=search)
+    total = catalogue.count(**filters)
+    page_size = max(int(Config().get("chart_page_size", 500)), 1)
+    pages = max(-(-total // page_size), 1)
+    page = 1
+    if pages > 1:
+        # The widget reads its value from session state only; clamp it when filters narrowed the result
+        st.session_state["charts_page"] = min(max(int(st.session_state.get("charts_page", 1)), 1), pages)
+        page = int(st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key="charts_page"))
+    entries = catalogue.files(**filters, limit=page_size, offset=(page - 1) * page_size)
+    if total > len(entries):
+        first = (page - 1) * page_size + 1
+        st.caption(f"Showing files {first}–{first + len(entries) - 1} of {total}.")
+    labels = {
+        entry["path"]: f"{entry['file_name']} — {entry['chart_names'] or '?'} ({entry['points']} pts)"
+        for entry in entries
+    }
     chart_filename = st.selectbox(
         "Select a chart file",
-        jsons_list,
+        list(labels),
+        format_func=lambda path: labels.get(path, path),
         help="Check the custom title added when saving ChartData instance",
     )
 with st.container():
@@ -34,7 +88,7 @@ with st.container():
             "➕ Add Chart",
             on_click=lambda: charts_to_plot.append(chart_filename),
             key="add_chart_btn",
-            disabled=len(jsons_list) == 0,
+            disabled=len(labels) == 0,
         )
 
     with col2:
@@ -49,23 +103,50 @@ with st.container():
     st.divider()
     # Display selected charts
     for current_chart in charts_to_plot:
-        st.subheader(f"📈 Plotting: `{current_chart}`")
-        current_json_obj: Path = jsons_objs[jsons_list.index(current_chart)]
-
-        # Load the JSON file containing chart data
-        with open(current_json_obj, "r") as cur_file:
-            chart_data_dict = json.load(cur_file)
-            if "charts" in chart_data_dict:
-                # Merged file: list of charts
-                chart_data_list = [ChartData.from_dict(d) for d in chart_data_dict["charts"]]
-            else:
-                # Individual file: single chart
-                chart_data_list = [ChartData.from_dict(chart_data_dict)]
-
-            for chart_data in chart_data_list:
-                st.write(f"**Chart: {chart_data.name}**")
-                fig = make_plotly_figure(chart_data)
-                st.plotly_chart(
-                    fig,
-                    use_container_width=True,
+        current_json_obj: Path = Path(current_chart)
+        st.subheader(f"📈 Plotting: `{current_json_obj.name}`")
+        if not current_json_obj.exists():
+            st.warning("File not found, refresh the index.")
+            continue
+
+        mtime = current_json_obj.stat().st_mtime
+        chart_data_list = load_chart_file(str(current_json_obj), mtime)
+
+        for idx, chart_data in enumerate(chart_data_list):
+            st.write(f"**Chart: {chart_data.name}**")
+            length = len(chart_data.y_series.processed)
+            sample_range = None
+            if length > point_budget():
+                # Long series are decimated: zooming re-decimates the selected samples at full detail
+                sample_range = st.slider(
+                    "🔍 Samples",
+                    0,
+                    length,
+                    (0, length),
+                    key=f"zoom_{current_json_obj.name}_{chart_data.name}",
+                    help="Zoom on a range of samples (re-decimated server side).",
                 )
+                if tuple(sample_range) == (0, length):
+                    sample_range = None
+            fig = chart_figure(str(current_json_obj), mtime, idx, sample_range, chart_data)
+            st.plotly_chart(
+                fig,
+                use_container_width=True,
+            )
+            # Record series: every named field can be plotted and exported
+            records = record_frame(chart_data)
+            if records is not None:
+                with st.expander("🧾 Raw fields"):
+                    key = f"{current_json_obj.name}_{chart_data.name}"
+                    numeric = [c for c in records.columns if pd.api.types.is_numeric_dtype(records[c])]
+                    if numeric:
+                        field = st.selectbox("Field", numeric, key=f"field_{key}")
+                        st.plotly_chart(make_field_figure(records, field, title=field), use_container_width=True)
+                    st.dataframe(records, use_container_width=True)
+                    st.download_button(
+                        "⬇️ Download CSV",
+                        records.to_csv(index=False).encode("utf-8"),
+                        file_name=f"{current_json_obj.stem}_{chart_data.name}.csv",
+                        mime="text/csv",
+                        key=f"csv_{key}",
+                    )
@@ -3,11 +3,17 @@ from connections import Connections
 import pandas as pd
 from config import Config
 from easy_scpi import Instrument
-from typing import List
+from typing import List, Optional
 from instruments import Instrument_Entry
+from webapp import Job, JobRunner, JobState
 
 conn_obj = Connections()
 conf_obj = Config()
+runner = JobRunner()
+
+# Jobs touching the instruments list share a key, so they never overlap
+INSTRUMENTS_JOB = "instruments"
+TERMINAL_JOB = "terminal"
 
 
 def baud_or_usb(instr: Instrument_Entry) -> str:
@@ -18,21 +24,10 @@ def baud_or_usb(instr: Instrument_Entry) -> str:
         return f"USBMTC Resource: {instr.data.port}"
 
 
-def verify_instruments(mode: int = 0, clear_list: bool = True):
-    """Verify or fetch all instruments based on the mode."""
-    aliases = conf_obj.get("instr_aliases")
-    try:
-        if mode == 0:
-            conn_obj.verify_instruments()
-        elif clear_list:
-            conn_obj.fetch_all_instruments(curAliasesList=aliases)
-        else:
-            conn_obj.fetch_all_instruments(curAliasesList=aliases, clear_list=False)
-    except:
-        st.error("Error while fetching instruments")
-    # Update session state with the instruments data
-    instr_list: List[Instrument_Entry] = conn_obj.instruments_list
-    st.session_state["instr_table"] = pd.DataFrame(
+def instruments_table() -> pd.DataFrame:
+    """Table of the current instruments list (no bus I/O)."""
+    instr_list: List[Instrument_Entry] = list(conn_obj.instruments_list)
+    return pd.DataFrame(
         {
             "Instrument Name": [instr.data.name for instr in instr_list],
             "COM PORT": [instr.scpi_instrument.port for instr in instr_list],
@@ -40,81 +35,178 @@ def verify_instruments(mode: int = 0, clear_list: bool = True):
             "IDN": [instr.data.idn for instr in instr_list],
         }
     )
-    st.rerun()  # Hack to refresh the page
 
 
-def send_command(instr_selected: Instrument_Entry, command: str, uid: str) -> None:
-    try:
-        if "?" in command:  # This is a query, expect a response
-            result: str = instr_selected.query_wrapper(command)
-            st.session_state[
-                f"{uid}_buffer_output"
-            ] += f"{instr_selected.data.alias}: {command} --> {result}\n"
-            st.success("Command executed successfully!")
-        else:
-            instr_selected.write_wrapper(command)
-            st.session_state[
-                f"{uid}_buffer_output"
-            ] += f"{instr_selected.data.name}: {command}\n"
-            st.success("Command executed successfully")
-    except RuntimeError as exception:
-        st.error(f"An error occurred: {exception}")
+# Job bodies: run in a JobRunner thread, so no st.* calls in here
+
+
+def _verify_job(job: Job, mode: int = 0, clear_list: bool = True) -> str:
+    """Verify or fetch all instruments based on the mode."""
+    if mode == 0:
+        conn_obj.verify_instruments(progress=job.report, cancel=job.cancel_event)
+        return "Instruments refreshed successfully!"
+    conn_obj.fetch_all_instruments(
+        curAliasesList=conf_obj.get("instr_aliases"),
+        clear_list=clear_list,
+        progress=job.report,
+        cancel=job.cancel_event,
+    )
+    if clear_list:
+        return "All instruments fetched successfully!"
+    return "New instruments fetched successfully!"
 
 
-def save_config():
+def _save_job(job: Job) -> str:
+    job.report(0.0, "Saving configuration")
     conn_obj.save_config()
-    st.success("Configuration saved successfully!")
+    return "Configuration saved successfully!"
 
 
-def load_config():
+def _load_job(job: Job) -> str:
+    job.report(0.0, "Loading configuration")
     conn_obj.load_config()
-    verify_instruments()
-    st.success("Configuration loaded successfully!")
+    if not job.cancelled:
+        conn_obj.verify_instruments(
+            progress=lambda fraction, message: job.report(0.5 + fraction / 2, message),
+            cancel=job.cancel_event,
+        )
+    return "Configuration loaded successfully!"
+
+
+def _command_job(job: Job, instr_selected: Instrument_Entry, command: str) -> str:
+    job.report(0.0, f"{instr_selected.data.alias}: {command}")
+    if "?" in command:  # This is a query, expect a response
+        result: str = instr_selected.query_wrapper(command)
+        return f"{instr_selected.data.alias}: {command} --> {result}\n"
+    instr_selected.write_wrapper(command)
+    return f"{instr_selected.data.name}: {command}\n"
+
+
+def submit(key: str, name: str, function, *args) -> None:
+    """Button callback: start a job and remember it for this session."""
+    job = runner.submit(key, name, function, *args)
+    st.session_state[f"{key}_job"] = job.id
+
+
+def send_command(instr_selected: Instrument_Entry, uid: str) -> None:
+    # Read the input here: args bound at render time would hold the previous value
+    command: str = st.session_state.get(f"{uid}_input", "")
+    submit(TERMINAL_JOB, f"Command {command}", _command_job, instr_selected, command)
+    st.session_state["terminal_uid"] = uid
+
+
+def session_job(key: str) -> Optional[Job]:
+    return runner.get(st.session_state.get(f"{key}_job"))
+
+
+def job_status(job: Job, cancel_key: str) -> None:
+    """Progress bar and Cancel button of a running job."""
+    st.progress(job.progress, text=f"{job.name}: {job.message or 'starting'}")
+    st.button("✖️ Cancel", key=cancel_key, on_click=job.cancel, disabled=job.cancelled)
+
+
+@st.fragment(run_every=1)
+def jobs_panel() -> None:
+    """Poll the session's jobs; rerun the page once a job is over (never mid-operation)."""
+    finished = False
+    job = session_job(INSTRUMENTS_JOB)
+    if job is not None and job.active:
+        job_status(job, "cancel_instruments_job")
+    elif job is not None:
+        if job.state == JobState.DONE:
+            st.session_state["job_notice"] = ("success", job.result)
+        elif job.state == JobState.CANCELLED:
+            st.session_state["job_notice"] = ("warning", f"{job.name} cancelled.")
+        else:
+            st.session_state["job_notice"] = ("error", f"{job.name} failed: {job.error}")
+        del st.session_state[f"{INSTRUMENTS_JOB}_job"]
+        finished = True
+
+    command = session_job(TERMINAL_JOB)
+    if command is not None and command.active:
+        job_status(command, "cancel_terminal_job")
+    elif command is not None:
+        uid = st.session_state.get("terminal_uid")
+        if command.state == JobState.DONE:
+            st.session_state[f"{uid}_buffer_output"] = st.session_state.get(f"{uid}_buffer_output", "") + command.result
+            st.session_state["job_notice"] = ("success", "Command executed successfully!")
+        else:
+            st.session_state["job_notice"] = ("error", f"An error occurred: {command.error or 'cancelled'}")
+        del st.session_state[f"{TERMINAL_JOB}_job"]
+        finished = True
+
+    if finished:
+        st.session_state["instr_table"] = instruments_table()
+        st.rerun()
 
 
 # Set the main title of the page
 st.title("WASIC - Web Application for SCPI Instrument Control")
 
-# Initialize the instruments table in session state if not already present
+# Verify the instruments in the background on the first visit
 if "instr_table" not in st.session_state:
-    verify_instruments()
+    st.session_state["instr_table"] = instruments_table()
+    submit(INSTRUMENTS_JOB, "Verify instruments", _verify_job)
 
 # Application title
 st.subheader("📋 Connected Instruments")
 
+jobs_panel()
+if "job_notice" in st.session_state:
+    kind, text = st.session_state.pop("job_notice")
+    getattr(st, kind)(text)
+
 # Display the instruments table
 st.table(st.session_state["instr_table"])
 
 # Create columns for button alignment
 button_cols = st.columns([1, 1, 1, 1, 1])
+busy = runner.active(INSTRUMENTS_JOB) is not None
 
 # Button to refresh the data
 with button_cols[0]:
-    if st.button("🔄 Refresh"):
-        verify_instruments()
-        st.success("Instruments refreshed successfully!")
+    st.button(
+        "🔄 Refresh",
+        disabled=busy,
+        on_click=submit,
+        args=(INSTRUMENTS_JOB, "Verify instruments", _verify_job),
+    )
 
 # Button to full refresh the data
 with button_cols[1]:
-    if st.button("🔃 Full Refresh"):
-        verify_instruments(mode=1)
-        st.success("All instruments fetched successfully!")
+    st.button(
+        "🔃 Full Refresh",
+        disabled=busy,
+        on_click=submit,
+        args=(INSTRUMENTS_JOB, "Fetch all instruments", _verify_job, 1),
+    )
 
 # Button to fetch only newly connected instruments
 with button_cols[2]:
-    if st.button("🔃 Partial Refresh"):
-        verify_instruments(mode=1, clear_list=False)
-        st.success("New instruments fetched successfully!")
+    st.button(
+        "🔃 Partial Refresh",
+        disabled=busy,
+        on_click=submit,
+        args=(INSTRUMENTS_JOB, "Fetch new instruments", _verify_job, 1, False),
+    )
 
 # Button to save the configuration
 with button_cols[3]:
-    if st.button("💾 Save Configuration"):
-        save_config()
+    st.button(
+        "💾 Save Configuration",
+        disabled=busy,
+        on_click=submit,
+        args=(INSTRUMENTS_JOB, "Save configuration", _save_job),
+    )
 
 # Button to load the configuration
 with button_cols[4]:
-    if st.button("📂 Load Configuration"):
-        load_config()
+    st.button(
+        "📂 Load Configuration",
+        disabled=busy,
+        on_click=submit,
+        args=(INSTRUMENTS_JOB, "Load configuration", _load_job),
+    )
 
 # Separator
 st.markdown("---")
@@ -148,12 +240,16 @@ if curInstrSelected is not None:
 
     # Input for user command
     user_input: str = st.text_input(
-        "✏️ Input to Device:", value="", placeholder="Type a command"
+        "✏️ Input to Device:", value="", placeholder="Type a command", key=f"{curInstrSelected}_input"
     )
 
     # Button to send the command to the device
-    if st.button("➡️ Send Command"):
-        send_command(curinstrumentObject, user_input, curInstrSelected)
+    st.button(
+        "➡️ Send Command",
+        disabled=busy or runner.active(TERMINAL_JOB) is not None,
+        on_click=send_command,
+        args=(curinstrumentObject, curInstrSelected),
+    )
 
     # Text area to display the output from the device
     st.text_area(
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from typing import List
+from typing import Any, Dict, List
 from connections import Connections
 from config import Config
 from instruments.properties import property_info
@@ -11,36 +11,56 @@ connections_obj = Connections()
 conf_obj = Config()
 
 
+def property_snapshot(instrument: Instrument, alias: str, refresh: bool = False) -> Dict[str, Any]:
+    """Property values of the instrument cached in the session (one batched read when missing)."""
+    key = f"properties_snapshot_{alias}"
+    if refresh or key not in st.session_state:
+        st.session_state[key] = instrument.read_properties()
+    return st.session_state[key]
+
+
+def parse_property(prop: property_info, value: Any) -> Any:
+    """Parse an edited table value based on the property type."""
+    if prop.typecheck == bool:
+        return helper_methods.val_to_bool(str(value))
+    return prop.typecheck(value)
+
+
 def send_parameters(
-    instr_properties: List[property_info], edited_data: pd.DataFrame
+    instrument: Instrument,
+    instr_properties: List[property_info],
+    edited_data: pd.DataFrame,
+    snapshot: Dict[str, Any],
 ) -> None:
-    """Send the edited parameters to the instruments"""
+    """Send the edited parameters to the instrument in one batched write"""
+    changes: Dict[str, Any] = {}
     for i, prop in enumerate(instr_properties):
         try:
-            # Get the edited value from the dataframe
-            new_value = edited_data.iloc[i]["Current Value"]
-            supposed_type = prop.typecheck
-
-            # Parse the value based on type
-            if prop.typecheck == bool:
-                parsed_value = helper_methods.val_to_bool(str(new_value))
-            else:
-                parsed_value = supposed_type(new_value)
-
-            # Only update if the value has changed
-            current_value = prop.associated_getter()
-            if parsed_value != current_value:
-                prop.associated_setter(parsed_value)
-                st.success(f"Updated {prop.alias} to {parsed_value}")
+            # Only update if the value differs from the cached snapshot
+            parsed_value = parse_property(prop, edited_data.iloc[i]["Current Value"])
+            if parsed_value != snapshot.get(prop.alias):
+                changes[prop.alias] = parsed_value
         except Exception as e:
             st.error(f"Error updating {prop.alias}: {str(e)}")
-
-
-def create_properties_dataframe(instr_properties: List[property_info]) -> pd.DataFrame:
-    """Create a DataFrame from instrument properties for the data editor"""
+    if not changes:
+        return
+    try:
+        instrument.write_properties(changes)
+    except Exception as e:
+        st.error(f"Error updating {', '.join(changes)}: {str(e)}")
+        return
+    snapshot.update(changes)
+    for alias, value in changes.items():
+        st.success(f"Updated {alias} to {value}")
+
+
+def create_properties_dataframe(
+    instr_properties: List[property_info], snapshot: Dict[str, Any]
+) -> pd.DataFrame:
+    """Create a DataFrame from the cached property values for the data editor"""
     data = []
     for prop in instr_properties:
-        current_value = prop.associated_getter()
+        current_value = snapshot.get(prop.alias)
         # Format boolean values for better display
         if prop.typecheck == bool:
             display_value = "ON" if helper_methods.val_to_bool(current_value) else "OFF"
@@ -75,8 +95,15 @@ def instruments_page(alias: str) -> None:
         if has_properties:
             instr_properties: List[property_info] = cur_scpi_instrument.properties_list
 
+            refresh = st.button("🔄 Read from Instrument", key=f"read_params_{alias}")
+            try:
+                snapshot = property_snapshot(cur_scpi_instrument, alias, refresh)
+            except Exception as e:
+                st.error(f"Error reading properties: {str(e)}")
+                return
+
             # Create DataFrame for the data editor
-            properties_df = create_properties_dataframe(instr_properties)
+            properties_df = create_properties_dataframe(instr_properties, snapshot)
 
             st.markdown("### 📊 Instrument Properties")
             st.markdown(
@@ -121,7 +148,7 @@ def instruments_page(alias: str) -> None:
                     type="primary",
                     key=f"send_params_{alias}",
                 ):
-                    send_parameters(instr_properties, edited_df)
+                    send_parameters(cur_scpi_instrument, instr_properties, edited_df, snapshot)
 
             # Display current vs edited comparison if there are changes
             if not properties_df.equals(edited_df):
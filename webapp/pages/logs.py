@@ -1,34 +1,40 @@
 import streamlit as st
 from pathlib import Path
 import streamlit_scrollable_textbox as stx
+from config import Config
+from webapp import LEVELS, LogTail
 
 # Title for the Logs page
 st.title("📜 Live Logs Viewer")
 
 # Path to the log file
 log_file_path = Path("data\\wasic.log")
-# Initialize session state for log content if not already present
-if "log_content" not in st.session_state:
-    st.session_state["log_content"] = ""
+# Each session follows the log from its own byte offset and keeps a bounded ring of records
+if "log_tail" not in st.session_state:
+    st.session_state["log_tail"] = LogTail(str(log_file_path), Config().get("log_view_records", 2000))
+log_tail: LogTail = st.session_state["log_tail"]
 
-
-# Function to read the log file in a non-blocking way
-def read_log_file(file_path: Path) -> str:
-    try:
-        with file_path.open("r", encoding="utf-8") as log_file:
-            return log_file.read()
-    except FileNotFoundError:
-        return "Log file not found."
-    except Exception as e:
-        return f"Error reading log file: {e}"
+with st.container():
+    col_levels, col_logger, col_search = st.columns([2, 2, 2])
+    with col_levels:
+        levels = st.multiselect("Levels", LEVELS, default=LEVELS[1:], key="log_levels")
+    with col_logger:
+        logger_filter = st.text_input("Logger", placeholder="e.g. tasks.DataProcessor", key="log_logger")
+    with col_search:
+        search = st.text_input("Search", placeholder="Text contained in the record", key="log_search")
 
 
 # Fragment to update the log content periodically
 @st.fragment(run_every=2)  # Refresh every 2 seconds
 def update_log_buffer():
-    st.session_state["log_content"] = read_log_file(log_file_path)
+    # Only the bytes appended since the previous tick are read
+    log_tail.poll()
+    if not log_file_path.exists():
+        text = "Log file not found."
+    else:
+        text = "\n".join(log_tail.lines(levels, logger_filter, search))
     stx.scrollableTextbox(
-        text=st.session_state["log_content"],
+        text=text,
         height=1000,
         key="log_display",
     )
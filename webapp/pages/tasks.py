@@ -1,13 +1,23 @@
 from typing import List, Optional, cast
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
-from tasks import ChartData, Task, Tasks
+from tasks import ChartData, Task, Tasks, TaskState, SnapshotPublisher
 from webapp import (
-    make_plotly_figure,
+    LiveFigure,
+    SharedFigures,
 )
 
 tasks_obj = Tasks()
 
+# Chart types offered while a task runs; scatter/line switch to WebGL by themselves past chart_webgl_threshold
+CHART_TYPES = {
+    "scatter": "scatter",
+    "line": "line",
+    "histogram": "histogram",
+    "scatter_gl": "scatter (WebGL)",
+    "line_gl": "line (WebGL)",
+}
+
 
 def set_custom_alias() -> None:
     changedAlias: str = st.session_state["task_alias"]
@@ -15,6 +25,33 @@ def set_custom_alias() -> None:
         tasks_obj._is_running.custom_alias = changedAlias
 
 
+def live_figure(task: Task, idx: int, chart: ChartData):
+    """Figure of a running chart.
+
+    Built once per published snapshot and shared by all sessions; before the
+    first snapshot, extended with the new samples only (one LiveFigure per chart and session).
+    """
+    snapshot = SnapshotPublisher().latest(chart)
+    if snapshot is not None:
+        return SharedFigures().figure(snapshot)
+    live_figures = st.session_state.setdefault("live_figures", {})
+    key = f"{task.name}_{idx}"
+    if key not in live_figures:
+        live_figures[key] = LiveFigure()
+    return live_figures[key].update(chart)
+
+
+def point_counts(chart: ChartData) -> tuple:
+    """(raw, processed) point count labels, read from the latest snapshot when there is one."""
+    snapshot = SnapshotPublisher().latest(chart)
+    if snapshot is not None:
+        (x_raw, y_raw), (x_proc, y_proc) = snapshot.raw_lengths, snapshot.lengths
+    else:
+        x_raw, y_raw = len(chart.x_series.raw), len(chart.y_series.raw)
+        x_proc, y_proc = len(chart.x_series.processed), len(chart.y_series.processed)
+    return f"{x_raw} X, {y_raw} Y", f"{x_proc} X, {y_proc} Y"
+
+
 @st.fragment(run_every=2)
 def chart_update_frag(
     curDataList, paused, chart_placeholders, count_placeholders
@@ -30,23 +67,33 @@ def chart_update_frag(
                 with col1:
                     st.metric(
                         label="📊 Raw Data Points",
-                        value=f"{len(curChartData.x_series.raw)} X, {len(curChartData.y_series.raw)} Y",
+                        value=point_counts(curChartData)[0],
                     )
                 with col2:
                     st.metric(
                         label="⚡ Processed Data Points",
-                        value=f"{len(curChartData.x_series.processed)} X, {len(curChartData.y_series.processed)} Y",
+                        value=point_counts(curChartData)[1],
                     )
 
             # Update chart if not paused
             if not paused:
-                fig = make_plotly_figure(curChartData)
+                fig = live_figure(tasks_obj._is_running, idx, curChartData)
                 chart_placeholders[idx].plotly_chart(
                     fig,
                     use_container_width=True,
                 )
 
 
+@st.fragment(run_every=2)
+def finalise_status_frag() -> None:
+    """Shows the runs that are still being stopped or saved in the background."""
+    for tsk in tasks_obj.finalising_tasks():
+        if tsk.state == TaskState.STOPPING:
+            st.info(f"⏳ Stopping task {tsk.name}...")
+        else:
+            st.info(f"💾 Saving data of task {tsk.name}...")
+
+
 # Check if a task is currently running
 is_task_running: bool = tasks_obj._is_running is not None
 
@@ -57,6 +104,7 @@ with st.container():
         st.markdown("### 🎯 Select and Run a Task")
     else:
         st.success("✅ Task is currently running", icon="✨")
+    finalise_status_frag()
 
     col_task, col_params, col_run = st.columns([2, 2, 1])
 
@@ -125,6 +173,15 @@ with st.container():
                 help="Start the selected task.",
                 use_container_width=True,
             )
+            st.button(
+                "♻️ Resume Last Run",
+                on_click=tasks_obj.resume_task,
+                args=(task_selectbox,),
+                disabled=is_task_running,
+                key="resume_task_button",
+                help="Restart the selected task from its last backup checkpoint.",
+                use_container_width=True,
+            )
         with col_run:
             st.button(
                 "🔄 Match Instruments",
@@ -218,12 +275,13 @@ if is_task_running and tasks_obj._is_running is not None:
                 curChartData = cast(ChartData, chart)
                 curChartData.config.custom_type = st.selectbox(
                     "Select Chart Type",
-                    ["scatter", "line", "histogram"],
-                    index=["scatter", "line", "histogram"].index(
+                    list(CHART_TYPES),
+                    index=list(CHART_TYPES).index(
                         curChartData.config.custom_type
-                        if curChartData.config.custom_type in ["scatter", "line", "histogram"]
+                        if curChartData.config.custom_type in CHART_TYPES
                         else "scatter"
                     ),
+                    format_func=lambda chart_type: CHART_TYPES[chart_type],
                     key=f"chart_type_{running_task.name}_{i}",
                     help="Change the chart type for visualization.",
                 )
@@ -252,16 +310,16 @@ if is_task_running and tasks_obj._is_running is not None:
                     with col1:
                         st.metric(
                             label="📊 Raw Data Points",
-                            value=f"{len(curChartData.x_series.raw)} X, {len(curChartData.y_series.raw)} Y",
+                            value=point_counts(curChartData)[0],
                         )
                     with col2:
                         st.metric(
                             label="⚡ Processed Data Points",
-                            value=f"{len(curChartData.x_series.processed)} X, {len(curChartData.y_series.processed)} Y",
+                            value=point_counts(curChartData)[1],
                         )
 
                 # Show static chart
-                fig = make_plotly_figure(curChartData)
+                fig = live_figure(running_task, idx, curChartData)
                 chart_placeholders[idx].plotly_chart(
                     fig,
                     use_container_width=True,
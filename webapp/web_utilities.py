@@ -1,25 +1,134 @@
-from tasks import ChartData, Tasks, Task, ChartData_Config
+from tasks import ChartData, Tasks, Task, ChartData_Config, SpillColumn, ArrayColumn, ChartSnapshot, SnapshotPublisher
+from tasks.structures import record_fields
+from threading import RLock
+from typing import Optional, Tuple
+from config import Config
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+from .decimation import MinMaxStream, decimate_indices, float_array, histogram_bins
 
 
-def _to_list(value):
-    """Convert many possible container/array-like inputs to a plain Python list.
-    Safe for None, scalars, pandas Series, numpy arrays, lists, etc.
+def series_array(values) -> np.ndarray:
+    """1-D NumPy array of a series without going through Python lists.
+
+    Numeric series become float64 (a zero-copy view of float ArrayColumns), any
+    other series (labels, None gaps, ragged rows) an object array. None gives
+    an empty array.
+    """
+    if values is None:
+        return np.empty(0)
+    arr = float_array(values)
+    if arr is not None:
+        return arr
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def valid_mask(arr: np.ndarray) -> np.ndarray:
+    """Vectorised notna of a series array (NaN, None and NaT are invalid)."""
+    if arr.dtype.kind == "f":
+        return ~np.isnan(arr)
+    return np.asarray(pd.notna(arr), dtype=bool)
+
+
+def _live_window(x_values, y_values):
+    """Cut streamed series (SpillColumn) to the aligned window still held in memory.
+
+    Returns (x_values, y_values, start) where start is the index of the first sample kept.
+    """
+    window = min((v.in_memory for v in (x_values, y_values) if isinstance(v, SpillColumn) and len(v)), default=0)
+    lengths = [len(v) for v in (x_values, y_values) if v is not None and len(v)]
+    stop = min(lengths) if lengths else 0
+    start = max(stop - window, 0)
+
+    def cut(values):
+        return values[start:stop] if values is not None and len(values) else values
+
+    return cut(x_values), cut(y_values), start
+
+
+def record_frame(chart_data: ChartData):
+    """Return the record (structured) raw series of a chart as one DataFrame.
+
+    Columns are the named fields of the x and y records (prefixed "x." / "y."
+    when both axes carry records); None when neither raw series is a record series.
+    """
+    frames = {}
+    for axis, series in (("x", chart_data.x_series), ("y", chart_data.y_series)):
+        if series is not None and record_fields(series.raw):
+            frames[axis] = pd.DataFrame.from_records(np.asarray(series.raw))
+    if not frames:
+        return None
+    if len(frames) == 1:
+        return next(iter(frames.values()))
+    return pd.concat([frame.add_prefix(f"{axis}.") for axis, frame in frames.items()], axis=1)
+
+
+def make_field_figure(frame: pd.DataFrame, field: str, title: str = ""):
+    """Scatter plot of one record field against the sample index."""
+    return px.scatter(frame, x=frame.index, y=field, title=title, labels={"x": "Sample"})
+
+
+def point_budget(max_points: Optional[int] = None) -> int:
+    """Number of points drawn per trace: about two per horizontal pixel of chart_viewport_px."""
+    if max_points:
+        return int(max_points)
+    return 2 * int(Config().get("chart_viewport_px", 1200))
+
+
+def use_webgl(custom_type: str, points: int) -> bool:
+    """WebGL traces for the "*_gl" chart types, or automatically above chart_webgl_threshold points."""
+    if custom_type.endswith("_gl"):
+        return True
+    threshold = int(Config().get("chart_webgl_threshold", 2000))
+    return 0 < threshold < points
+
+
+def _decimate(chart_data: ChartData, x_values, y_values, index_offset: int, budget: int):
+    """Reduce x/y to about budget points (see webapp.decimation); returns arrays, x always explicit.
+
+    Index-based min/max plots read the chart's downsampling pyramid, so only
+    O(budget) samples are touched; other cases decimate the (vectorised) arrays.
     """
-    if value is None:
-        return []
-    try:
-        # pandas handles many types (numpy arrays, Series, lists, scalars)
-        return pd.Series(value).tolist()
-    except Exception:
+    method = Config().get("chart_decimation", "minmax")
+    has_x = x_values is not None and len(x_values)
+    length = min(len(x_values), len(y_values)) if has_x else len(y_values)
+    # Snapshots of streamed charts only hold a window, which the pyramid does not index
+    windowed = isinstance(chart_data, ChartSnapshot) and chart_data.index_offset
+    if not has_x and method != "lttb" and not windowed:
         try:
-            return list(value)
-        except Exception:
-            return [value]
+            env = chart_data.envelope(budget // 2, index_offset, index_offset + length)
+        except (TypeError, ValueError):
+            env = None
+        if env is not None:
+            filled = env["count"] > 0
+            x = np.repeat(env["index"][filled], 2)
+            y = np.column_stack([env["min"][filled], env["max"][filled]]).ravel()
+            return x, y
+    y = float_array(y_values[:length])
+    if y is None:
+        # Non-numeric samples: plain stride
+        keep = np.linspace(0, length - 1, budget).astype(np.int64)
+        y = np.asarray(y_values[:length], dtype=object)[keep]
+        x = np.asarray(x_values[:length], dtype=object)[keep] if has_x else keep + index_offset
+        return x, y
+    x = float_array(x_values[:length]) if has_x else None
+    keep = decimate_indices(x, y, budget, method if x is not None or method == "lttb" else "minmax")
+    if x is None:
+        x = np.asarray(x_values[:length], dtype=object)[keep] if has_x else keep + index_offset
+    else:
+        x = x[keep]
+    return x, y[keep]
 
 
-def make_plotly_figure(chart_data: ChartData):
+def make_plotly_figure(
+    chart_data: ChartData,
+    max_points: Optional[int] = None,
+    sample_range: Optional[Tuple[int, int]] = None,
+):
     """Create a Plotly figure from a ChartData object.
 
     Rules:
@@ -28,6 +137,16 @@ def make_plotly_figure(chart_data: ChartData):
       If y_series.processed exists, check for x_series.processed.
       If x_series.processed exists, slice both to the same length.
       If not, use an index for x.
+
+    Scatter and line traces switch to WebGL (Scattergl) when the chart holds
+    more samples than the chart_webgl_threshold config key, or always for the "scatter_gl" and
+    "line_gl" chart types.
+
+    Level of detail: series longer than the point budget (see point_budget)
+    are decimated server side (min/max per bucket or LTTB, chart_decimation
+    config key) and long histograms are binned with NumPy, so the browser never
+    receives more than about max_points points. sample_range (start, stop)
+    zooms on a range of samples, decimated again at full budget.
     """
     chart_data_config: ChartData_Config = chart_data.config
     custom_type = chart_data_config.custom_type
@@ -38,63 +157,197 @@ def make_plotly_figure(chart_data: ChartData):
     # Get processed data
     y_processed = chart_data.y_series.processed if chart_data.y_series else None
     x_processed = chart_data.x_series.processed if chart_data.x_series else None
+    # Streamed charts only keep a bounded tail in memory: plot that window
+    index_offset = chart_data.index_offset if isinstance(chart_data, ChartSnapshot) else 0
+    if isinstance(x_processed, SpillColumn) or isinstance(y_processed, SpillColumn):
+        x_processed, y_processed, index_offset = _live_window(x_processed, y_processed)
+    if sample_range is not None:
+        start, stop = max(int(sample_range[0]), 0), int(sample_range[1])
+        x_processed = x_processed[start:stop] if x_processed is not None else None
+        y_processed = y_processed[start:stop] if y_processed is not None else None
+        index_offset += start
+
+    budget = point_budget(max_points)
+    total_points = len(y_processed) if y_processed is not None else 0
+    if custom_type in ("histogram", "hist"):
+        data = y_processed if y_processed is not None and len(y_processed) else x_processed
+        values = float_array(data) if data is not None and len(data) > budget else None
+        if values is not None:
+            counts, edges = histogram_bins(values, Config().get("chart_histogram_bins", "auto"), budget // 2)
+            data_label = y_label if data is y_processed else x_label
+            fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+            fig.update_layout(title=title, xaxis_title=data_label, yaxis_title="count", bargap=0)
+            return fig
+    elif y_processed is not None and len(y_processed) > budget:
+        x_processed, y_processed = _decimate(chart_data, x_processed, y_processed, index_offset, budget)
 
-    # Convert to lists
-    y_list = _to_list(y_processed)
-    x_list = _to_list(x_processed)
-    # Filter out nan in couple (check if x is not null)
-    if x_list and y_list:
-        filtered_pairs = [(x, y) for x, y in zip(x_list, y_list) if pd.notna(x) and pd.notna(y)]
-        if filtered_pairs:
-            x_list, y_list = zip(*filtered_pairs)
-            x_list = list(x_list)
-            y_list = list(y_list)
-        else:
-            x_list = []
-            y_list = []
-    elif y_list:
-        y_list = [y for y in y_list if pd.notna(y)]
-    elif x_list:
-        x_list = [x for x in x_list if pd.notna(x)]
+    # Vectorised preparation: one mask drops NaN/None pairs, arrays go straight to plotly
+    x_arr, y_arr = series_array(x_processed), series_array(y_processed)
+    if len(x_arr) and len(y_arr):
+        length = min(len(x_arr), len(y_arr))
+        x_arr, y_arr = x_arr[:length], y_arr[:length]
+        keep = valid_mask(x_arr) & valid_mask(y_arr)
+        x_arr, y_arr = x_arr[keep], y_arr[keep]
+    elif len(y_arr):
+        keep = valid_mask(y_arr)
+        # No x: index of the sample (NaN samples leave a gap in the index)
+        x_arr, y_arr = np.flatnonzero(keep) + index_offset, y_arr[keep]
+    elif len(x_arr):
+        x_arr = x_arr[valid_mask(x_arr)]
 
     if custom_type in ("histogram", "hist"):
         # Histogram: prioritize y, then x if y is empty
-        if y_list:
-            # Use y if available (whether x is present or not)
-            data_list = y_list
-            data_label = y_label
-        elif x_list:
-            # Use x if y is empty but x is available
-            data_list = x_list
-            data_label = x_label
-        else:
-            # Both empty, empty histogram
-            data_list = []
-            data_label = y_label  # or x_label, doesn't matter
-        
-        fig = px.histogram(pd.DataFrame({"data": data_list}), x="data", title=title, labels={"data": data_label})
-    else:
-        # Other plots: scatter, line, etc.
-        if not y_list:
-            # No y data, return empty
-            fig = px.scatter(pd.DataFrame({"x": [], "y": []}), x="x", y="y", title=title, labels={"x": x_label, "y": y_label})
-        else:
-            if x_list:
-                # Both x and y, slice to min length
-                min_len = min(len(x_list), len(y_list))
-                x_trim = x_list[:min_len]
-                y_trim = y_list[:min_len]
-            else:
-                # No x, use index
-                x_trim = list(range(len(y_list)))
-                y_trim = y_list
-
-            df = pd.DataFrame({"x": x_trim, "y": y_trim})
-
-            if custom_type in ("", "scatter"):
-                fig = px.scatter(df, x="x", y="y", title=title, labels={"x": x_label, "y": y_label})
-            else:
-                # Default to line
-                fig = px.line(df, x="x", y="y", title=title, labels={"x": x_label, "y": y_label})
-
-    return fig
\ No newline at end of file
+        data, data_label = (y_arr, y_label) if len(y_arr) else (x_arr, x_label)
+        fig = go.Figure(go.Histogram(x=data))
+        fig.update_layout(title=title, xaxis_title=data_label, yaxis_title="count")
+        return fig
+    # Other plots: scatter, line, etc. (empty traces when there is no y data)
+    if not len(y_arr):
+        x_arr = y_arr
+    mode = "markers" if custom_type.removesuffix("_gl") in ("", "scatter") else "lines"
+    trace = go.Scattergl if use_webgl(custom_type, total_points) else go.Scatter
+    fig = go.Figure(trace(x=x_arr, y=y_arr, mode=mode))
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title=y_label)
+    return fig
+
+class LiveFigure:
+    """
+    Figure of a running chart that is extended instead of rebuilt.
+
+    The first ``update`` builds the figure with make_plotly_figure; later calls
+    only read the processed samples appended since the previous call (NaN pairs
+    masked on that block alone) and append them to the trace buffers, so the
+    per-tick cost depends on the new data, not on the length of the run. Past
+    the point budget, numeric scatter/line traces switch to an incremental
+    min/max decimation (webapp.decimation.MinMaxStream) seeded once from the
+    full series, so later ticks stay O(new samples + budget). The figure is
+    rebuilt when the chart type changes, a series shrank, the chart rewrites
+    its processed data (refresh_all, streamed windows) or a histogram outgrew
+    the point budget (binned figures are cheap to rebuild).
+    """
+
+    def __init__(self) -> None:
+        self.figure = None
+        self.cursor = 0  # processed samples already in the figure
+        self.signature = None
+        self._x = ArrayColumn(dtype=object)
+        self._y = ArrayColumn(dtype=object)
+        self._stream: Optional[MinMaxStream] = None  # decimated trace, past the point budget
+
+    def _length(self, chart_data: ChartData) -> int:
+        x, y = chart_data.x_series.processed, chart_data.y_series.processed
+        if chart_data.config.custom_type in ("histogram", "hist"):
+            return len(y) if len(y) else len(x)
+        return min(len(x), len(y)) if len(x) and len(y) else len(y)
+
+    def _decimated_block(self, chart_data: ChartData, start: int, stop: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(positions, x, y) of the finite samples in [start, stop), None if x or y is not numeric."""
+        x, y = chart_data.x_series.processed, chart_data.y_series.processed
+        y_arr = float_array(y[start:stop])
+        x_arr = float_array(x[start:stop]) if len(x) else np.arange(start, stop, dtype=np.float64)
+        if x_arr is None or y_arr is None:
+            return None
+        keep = np.isfinite(x_arr) & np.isfinite(y_arr)
+        return np.arange(start, stop)[keep], x_arr[keep], y_arr[keep]
+
+    def _rebuild(self, chart_data: ChartData, length: int) -> None:
+        self.figure = make_plotly_figure(chart_data)
+        trace = self.figure.data[0] if self.figure.data else None
+        self._x = ArrayColumn(trace.x if trace is not None and trace.x is not None else (), dtype=object)
+        self._y = ArrayColumn(trace.y if trace is not None and trace.y is not None else (), dtype=object)
+        self._stream = None
+        self.cursor = length
+        if length > point_budget() and chart_data.config.custom_type not in ("histogram", "hist"):
+            self._start_stream(chart_data, 0, length)
+
+    def _start_stream(self, chart_data: ChartData, start: int, stop: int) -> bool:
+        """Seed the incremental decimation with samples [start, stop) (one O(stop - start) pass)."""
+        block = self._decimated_block(chart_data, start, stop)
+        if block is None:
+            return False
+        self._stream = MinMaxStream(point_budget() // 2)
+        self._stream.extend(*block)
+        self.figure.data[0].x, self.figure.data[0].y = self._stream.points()
+        return True
+
+    def update(self, chart_data: ChartData):
+        """Return the figure with every processed sample appended so far."""
+        config = chart_data.config
+        x, y = chart_data.x_series.processed, chart_data.y_series.processed
+        length = self._length(chart_data)
+        source = chart_data.source_id if isinstance(chart_data, ChartSnapshot) else id(chart_data)
+        signature = (source, config.custom_type, bool(len(x)), bool(len(y)), use_webgl(config.custom_type, length))
+        histogram = config.custom_type in ("histogram", "hist")
+        windowed = isinstance(chart_data, ChartSnapshot) and chart_data.index_offset > 0
+        streamed = isinstance(x, SpillColumn) or isinstance(y, SpillColumn) or windowed
+        rewrites = config.refresh_all or streamed or (histogram and length > point_budget())
+        if self.figure is None or signature != self.signature or rewrites or length < self.cursor:
+            self.signature = signature
+            self._rebuild(chart_data, length)
+            return self.figure
+        if length == self.cursor:
+            return self.figure
+        start, self.cursor = self.cursor, length
+        if self._stream is not None:
+            block = self._decimated_block(chart_data, start, length)
+            if block is not None:
+                self._stream.extend(*block)
+                self.figure.data[0].x, self.figure.data[0].y = self._stream.points()
+                return self.figure
+        elif length > point_budget() and not histogram:
+            # Crossing the budget: the samples drawn so far are few, seed from the series
+            if self._start_stream(chart_data, 0, length):
+                return self.figure
+        if self._stream is not None or length > point_budget():
+            # Non-numeric samples past the budget: rebuild (plain stride decimation)
+            self._rebuild(chart_data, length)
+            return self.figure
+        new_x = series_array(x[start:length]) if len(x) else None
+        new_y = series_array(y[start:length]) if len(y) else None
+        trace = self.figure.data[0]
+        if histogram:
+            block = new_y if new_y is not None else new_x
+            self._x.extend(block[valid_mask(block)])
+            trace.x = self._x.view()
+            return self.figure
+        if new_x is None:
+            new_x = np.arange(start, length)
+        keep = valid_mask(new_x) & valid_mask(new_y)
+        self._x.extend(new_x[keep])
+        self._y.extend(new_y[keep])
+        trace.x, trace.y = self._x.view(), self._y.view()
+        return self.figure
+
+
+class SharedFigures:
+    """
+    Figures of the running charts shared by every Streamlit session.
+
+    Each chart has one LiveFigure fed with the chart's snapshots (see
+    tasks.SnapshotPublisher); a snapshot version is turned into a figure once
+    and the same frozen copy is handed to every viewer until the next version.
+    """
+
+    _lock = RLock()
+    _instance = None
+
+    def __new__(cls) -> "SharedFigures":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._entries = {}
+        return cls._instance
+
+    def figure(self, snapshot: ChartSnapshot):
+        """Figure of a snapshot version (built at most once per version for all sessions)."""
+        with self._lock:
+            live, version, figure = self._entries.get(snapshot.source_id, (None, 0, None))
+            if figure is None or version != snapshot.version:
+                live = live or LiveFigure()
+                figure = go.Figure(live.update(snapshot))
+                self._entries[snapshot.source_id] = (live, snapshot.version, figure)
+                # Drop the figures of charts that are no longer published
+                live_sources = SnapshotPublisher().sources()
+                for source_id in [k for k in self._entries if k not in live_sources]:
+                    del self._entries[source_id]
+            return figure